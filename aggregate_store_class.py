@@ -0,0 +1,286 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: aggregate_store_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the aggregate store, which combines the results of many sessions (for example years
+# of sessions for a lab-wide meta-analysis) into one folder that is read through a memory map. The folder
+# holds trials.bin, the trials of all sessions as fixed-size binary records, and index.json, the
+# participants and sessions with the range of records of each one. The records are sorted by participant
+# and session, so the trials of a participant or of a session are one contiguous slice of the memory map.
+# Reading a slice only loads the pages of the file it touches, so the data review page, the statistics
+# and the graphs work on views of the file without loading the whole dataset into memory.
+#
+# Sessions are found below a root folder as <participant>/<session ...>/Results/Results_File.txt; a
+# session folder directly below the root is its own participant.
+#
+# Usage:
+# python aggregate_store_class.py build ROOT OUTPUT [--chunk-size N]
+# python aggregate_store_class.py info AGGREGATE
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+import numpy as np
+from file_manger_class import FileManager
+
+# Record of one trial in trials.bin
+AGGREGATE_DTYPE = np.dtype([
+    ("participant", np.int32),  # Index of the participant in the index
+    ("session", np.int32),      # Index of the session in the index
+    ("trial", np.int64),        # Index of the image trial in its session
+    ("zaxis", np.float64),      # Axis values of the trial
+    ("yaxis", np.float64),
+    ("xaxis", np.float64),
+])
+RECORDS_FILE_NAME = "trials.bin"
+INDEX_FILE_NAME = "index.json"
+RESULTS_FOLDER_NAME = "Results"
+RESULTS_FILE_NAME = "Results_File.txt"
+
+# Column names of the fields in the DataFrame, matching the columns of the data review page
+COLUMN_NAMES = {"trial": "Image Trial", "zaxis": "Z-Axis", "yaxis": "Y-Axis", "xaxis": "X-Axis"}
+
+# Class: AggregateStore
+# Description:
+# This class provides methods to build an aggregate folder from session folders and to read the trials
+# of a participant or a session as views of the memory-mapped records.
+
+class AggregateStore:
+    def __init__(self, folder_path):
+        self.folder_path = folder_path  # Folder with trials.bin and index.json
+        with open(os.path.join(folder_path, INDEX_FILE_NAME), "r") as file:
+            index = json.load(file)
+        self.participants = index["participants"]  # Participant names, in record order
+        self.sessions = index["sessions"]  # Sessions with participant, name, results_file, start and stop
+        self.session_starts = np.array([session["start"] for session in self.sessions], dtype=np.int64)
+        self.size = index["trial_count"]  # Number of trials of all sessions
+        if self.size:
+            self.records = np.memmap(os.path.join(folder_path, RECORDS_FILE_NAME), dtype=AGGREGATE_DTYPE,
+                                     mode="r", shape=(self.size,))
+        else:
+            self.records = np.empty(0, dtype=AGGREGATE_DTYPE)  # An empty file cannot be memory-mapped
+
+    def __len__(self):
+        return self.size
+
+    # Method: find_sessions
+    # Description:
+    # Find the session folders with a results file below a root folder.
+    # Input: root_path - folder with one folder per participant (or session folders)
+    # Output: list of (participant, session, results_file) sorted by participant and session
+    @staticmethod
+    def find_sessions(root_path):
+        sessions = []
+        for folder_path, folder_names, _ in os.walk(root_path):
+            folder_names.sort()
+            results_file = os.path.join(folder_path, RESULTS_FOLDER_NAME, RESULTS_FILE_NAME)
+            if folder_path == root_path or not os.path.isfile(results_file):
+                continue
+            session = os.path.relpath(folder_path, root_path).replace(os.sep, "/")
+            sessions.append((session.split("/")[0], session, results_file))
+        return sorted(sessions)
+
+    # Method: build
+    # Description:
+    # Write the trials of sessions to an aggregate folder. The results files are read in chunks and the
+    # records are appended to the file, so building does not hold the trials of all sessions in memory.
+    # Both files are written to temporary files first and replace the old aggregate at the end.
+    # Input: sessions - list of (participant, session, results_file), grouped by participant
+    #        output_path - aggregate folder to write
+    #        chunk_size - number of rows read at a time (default: 100000)
+    #        progress - function called with (sessions done, session count), or None
+    # Output: AggregateStore of the new folder
+    @classmethod
+    def build(cls, sessions, output_path, chunk_size=100000, progress=None):
+        os.makedirs(output_path, exist_ok=True)
+        file_manager = FileManager()
+        participants = []
+        session_entries = []
+        trial_count = 0
+        records_path = os.path.join(output_path, RECORDS_FILE_NAME)
+        with open(records_path + ".tmp", "wb") as records_file:
+            for session_index, (participant, session, results_file) in enumerate(sessions):
+                if not participants or participants[-1] != participant:
+                    participants.append(participant)
+                start = trial_count
+                for rows, _ in file_manager.iter_axis_data(results_file, chunk_size):
+                    if not rows:
+                        continue
+                    values = np.asarray(rows, dtype=np.float64)
+                    chunk = np.empty(len(rows), dtype=AGGREGATE_DTYPE)
+                    chunk["participant"] = len(participants) - 1
+                    chunk["session"] = session_index
+                    chunk["trial"] = values[:, 0]
+                    chunk["zaxis"], chunk["yaxis"], chunk["xaxis"] = values[:, 1], values[:, 2], values[:, 3]
+                    records_file.write(chunk.tobytes())
+                    trial_count += len(rows)
+                session_entries.append({
+                    "participant": len(participants) - 1,
+                    "name": session,
+                    "results_file": os.path.abspath(results_file),
+                    "start": start,
+                    "stop": trial_count,
+                })
+                if progress is not None:
+                    progress(session_index + 1, len(sessions))
+
+        index_path = os.path.join(output_path, INDEX_FILE_NAME)
+        with open(index_path + ".tmp", "w") as file:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "trial_count": trial_count,
+                "participants": participants,
+                "sessions": session_entries,
+            }, file, indent=2)
+        os.replace(records_path + ".tmp", records_path)
+        os.replace(index_path + ".tmp", index_path)
+        return cls(output_path)
+
+    # Method: select
+    # Description:
+    # Get the range of records of a participant or a session.
+    # Input: participant - participant name, or None for all participants
+    #        session - session name, or None for all sessions of the participant
+    # Output: (start, stop) - range of records
+    def select(self, participant=None, session=None):
+        if session is not None:
+            entry = next((entry for entry in self.sessions if entry["name"] == session), None)
+            if entry is None:
+                raise KeyError(f"Session not found: {session}")
+            return entry["start"], entry["stop"]
+        if participant is not None:
+            if participant not in self.participants:
+                raise KeyError(f"Participant not found: {participant}")
+            participant_index = self.participants.index(participant)
+            entries = [entry for entry in self.sessions if entry["participant"] == participant_index]
+            return entries[0]["start"], entries[-1]["stop"]
+        return 0, self.size
+
+    # Method: view
+    # Description:
+    # Get the records of a participant or a session as a view of the memory map (nothing is read yet).
+    # Input: participant - participant name, or None for all participants
+    #        session - session name, or None for all sessions of the participant
+    # Output: structured array of the records
+    def view(self, participant=None, session=None):
+        start, stop = self.select(participant, session)
+        return self.records[start:stop]
+
+    # Method: to_dataframe
+    # Description:
+    # Get the trials of a participant or a session as a DataFrame whose columns are views of the memory map.
+    # Input: participant - participant name, or None for all participants
+    #        session - session name, or None for all sessions of the participant
+    # Output: DataFrame with the Image Trial, Z-Axis, Y-Axis and X-Axis columns
+    def to_dataframe(self, participant=None, session=None):
+        import pandas as pd
+
+        records = self.view(participant, session)
+        return pd.DataFrame({COLUMN_NAMES[name]: records[name] for name in ("trial", "zaxis", "yaxis", "xaxis")},
+                            copy=False)
+
+    # Method: participant_codes
+    # Description:
+    # Get the participant of every record of a range as its index in participants (a view of the memory map).
+    # Input: start, stop - range of records
+    # Output: array of participant indexes
+    def participant_codes(self, start, stop):
+        return self.records["participant"][start:stop]
+
+    # Method: number_blocks
+    # Description:
+    # Number the blocks of a range so a block belongs to one session. Every session numbers its blocks from
+    # 1, so the blocks of the later sessions of a participant are shifted past the blocks of its earlier
+    # sessions: a participant with two sessions of 3 blocks has blocks 1 to 6.
+    # Input: start, stop - range of records
+    #        blocks - block number (from 1) of every record of the range within its session
+    # Output: array of block numbers (from 1), unique per session of a participant
+    def number_blocks(self, start, stop, blocks):
+        blocks = np.asarray(blocks, dtype=np.int64)
+        if len(blocks) == 0:
+            return blocks
+        sessions = self.records["session"][start:stop]
+        participants = self.records["participant"][start:stop]
+        session_starts = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+        block_counts = np.maximum.reduceat(blocks, session_starts)
+        offsets = np.cumsum(block_counts) - block_counts
+        # Start the offsets again at the first session of every participant
+        first_sessions = np.r_[True, participants[session_starts][1:] != participants[session_starts][:-1]]
+        offsets -= offsets[np.flatnonzero(first_sessions)][np.cumsum(first_sessions) - 1]
+        return blocks + np.repeat(offsets, np.diff(np.r_[session_starts, len(blocks)]))
+
+    # Method: session_at
+    # Description:
+    # Get the session a record belongs to.
+    # Input: row - position of the record
+    # Output: session entry (participant, name, results_file, start, stop)
+    def session_at(self, row):
+        return self.sessions[int(np.searchsorted(self.session_starts, row, side="right")) - 1]
+
+    # Method: iter_rows
+    # Description:
+    # Read the records of a range in chunks as results file rows.
+    # Input: start, stop - range of records
+    #        chunk_size - number of rows per chunk (default: 10000)
+    # Output: generator of (rows, rows_read) - list of [image_index, zaxis, yaxis, xaxis] rows and the
+    #         number of rows of the range read so far
+    def iter_rows(self, start, stop, chunk_size=10000):
+        for chunk_start in range(start, stop, chunk_size):
+            records = self.records[chunk_start:min(chunk_start + chunk_size, stop)]
+            rows = list(zip(records["trial"].tolist(), records["zaxis"].tolist(),
+                            records["yaxis"].tolist(), records["xaxis"].tolist()))
+            yield rows, chunk_start - start + len(rows)
+
+# Function: main
+# Description:
+# Parse the command line arguments and build an aggregate folder or print what it holds.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code - 1 if no session was found, 0 otherwise
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Combine the results of many sessions into a memory-mapped aggregate.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Build an aggregate from the sessions below a folder")
+    build_parser.add_argument("root", help="Folder with one folder per participant")
+    build_parser.add_argument("output", help="Aggregate folder to write")
+    build_parser.add_argument("--chunk-size", type=int, default=100000, help="Rows read from a results file at a time")
+
+    info_parser = commands.add_parser("info", help="Print the participants and sessions of an aggregate")
+    info_parser.add_argument("aggregate", help="Aggregate folder")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        sessions = AggregateStore.find_sessions(args.root)
+        if not sessions:
+            print(f"No {RESULTS_FOLDER_NAME}/{RESULTS_FILE_NAME} found below {args.root}", file=sys.stderr)
+            return 1
+        store = AggregateStore.build(
+            sessions, args.output, args.chunk_size,
+            lambda done, total: print(f"\r{done}/{total} sessions", end="", flush=True))
+        print(f"\n{len(store)} trials of {len(store.sessions)} sessions and {len(store.participants)} "
+              f"participants written to {args.output}")
+        return 0
+
+    store = AggregateStore(args.aggregate)
+    for participant_index, participant in enumerate(store.participants):
+        entries = [entry for entry in store.sessions if entry["participant"] == participant_index]
+        print(f"{participant}: {entries[-1]['stop'] - entries[0]['start']} trials in {len(entries)} sessions")
+    print(f"Total: {len(store)} trials")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
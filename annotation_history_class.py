@@ -0,0 +1,165 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: annotation_history_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the annotation commands and the undo/redo history of the image editing page.
+# Every action that changes the session (selecting the center, saving a trial, skipping or flagging a
+# trial) is a command that knows how to apply and revert itself, so any number of actions can be undone
+# and redone. Saving or reverting a trial only rewrites the line of that trial in the results files.
+#
+############################################################################################
+
+# Import necessary libraries
+
+from abc import ABC, abstractmethod
+from trial_store_class import FLAG_SKIPPED, FLAG_FLAGGED
+
+# Class: AnnotationCommand
+# Description:
+# Base class of the annotation commands. Each command records the trial it changes and applies or
+# reverts its change on the image editing page.
+
+class AnnotationCommand(ABC):
+    def __init__(self, trial_index):
+        self.trial_index = trial_index  # Index of the trial the command changes
+
+    @abstractmethod
+    def execute(self, page):
+        pass
+
+    @abstractmethod
+    def undo(self, page):
+        pass
+
+# Class: SetCenterCommand
+# Description:
+# Select (or reselect) the center point used for all following trials.
+
+class SetCenterCommand(AnnotationCommand):
+    def __init__(self, trial_index, center_point, previous_center_point):
+        super().__init__(trial_index)
+        self.center_point = center_point  # New center point in calibration image coordinates
+        self.previous_center_point = previous_center_point  # Center point before the command
+
+    def execute(self, page):
+        page.center_point = self.center_point
+
+    def undo(self, page):
+        page.center_point = self.previous_center_point
+
+# Class: CommitTrialCommand
+# Description:
+# Save the result and clicked points of a trial in the results files and the trial store. Saving a skipped
+# trial unskips it. Undo puts back what was saved for the trial before (or removes the trial if it had no
+# result) and skips the trial again if it was skipped.
+
+class CommitTrialCommand(AnnotationCommand):
+    def __init__(self, trial_index, values, click, previous_values, previous_click):
+        super().__init__(trial_index)
+        self.values = values  # (zaxis, yaxis, xaxis) of the trial
+        self.click = click  # (image_name, center_point, puck_point) of the trial
+        self.previous_values = previous_values  # Values saved before the command, or None
+        self.previous_click = previous_click  # Clicked points saved before the command, or None
+        self.was_skipped = False  # Whether the trial was skipped before the command
+
+    def execute(self, page):
+        page.file_manager.replace_axis_data(page.result_file_path, self.trial_index, self.values)
+        page.file_manager.replace_click_data(page.click_file_path, self.trial_index, self.click)
+        self.store(page, self.values, self.click)
+        self.was_skipped = page.trial_store.has_flag(self.trial_index, FLAG_SKIPPED)
+        page.trial_store.set_flag(self.trial_index, FLAG_SKIPPED, False)
+
+    def undo(self, page):
+        page.file_manager.replace_axis_data(page.result_file_path, self.trial_index, self.previous_values)
+        page.file_manager.replace_click_data(page.click_file_path, self.trial_index, self.previous_click)
+        self.store(page, self.previous_values, self.previous_click)
+        page.trial_store.set_flag(self.trial_index, FLAG_SKIPPED, self.was_skipped)
+
+    def store(self, page, values, click):
+        page.trial_store.set_values(self.trial_index, values)
+        page.trial_store.set_click(self.trial_index, *(click[1:] if click is not None else (None, None)))
+
+# Class: SkipTrialCommand
+# Description:
+# Mark a trial as skipped (for example an image that does not show a valid throw).
+
+class SkipTrialCommand(AnnotationCommand):
+    def execute(self, page):
+        page.trial_store.set_flag(self.trial_index, FLAG_SKIPPED, True)
+
+    def undo(self, page):
+        page.trial_store.set_flag(self.trial_index, FLAG_SKIPPED, False)
+
+# Class: FlagTrialCommand
+# Description:
+# Flag or unflag a trial for later review.
+
+class FlagTrialCommand(AnnotationCommand):
+    def execute(self, page):
+        flagged = page.trial_store.has_flag(self.trial_index, FLAG_FLAGGED)
+        page.trial_store.set_flag(self.trial_index, FLAG_FLAGGED, not flagged)
+
+    def undo(self, page):
+        self.execute(page)
+
+# Class: AnnotationHistory
+# Description:
+# This class keeps the executed commands on an undo stack and the undone commands on a redo stack.
+# Executing a new command clears the redo stack.
+
+class AnnotationHistory:
+    def __init__(self):
+        self.undo_stack = []  # Commands that can be undone, most recent last
+        self.redo_stack = []  # Commands that can be redone, most recent last
+
+    # Method: execute
+    # Description:
+    # Apply a command and add it to the history.
+    # Input: command - command to apply
+    #        page - image editing page the command changes
+    # Output: None
+    def execute(self, command, page):
+        command.execute(page)
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+
+    # Method: undo
+    # Description:
+    # Revert the most recent command.
+    # Input: page - image editing page the command changes
+    # Output: the reverted command, or None if there is nothing to undo
+    def undo(self, page):
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        command.undo(page)
+        self.redo_stack.append(command)
+        return command
+
+    # Method: redo
+    # Description:
+    # Apply the most recently undone command again.
+    # Input: page - image editing page the command changes
+    # Output: the applied command, or None if there is nothing to redo
+    def redo(self, page):
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        command.execute(page)
+        self.undo_stack.append(command)
+        return command
+
+    # Method: clear
+    # Description:
+    # Forget all commands (when a new session starts).
+    # Input: None
+    # Output: None
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
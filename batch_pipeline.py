@@ -0,0 +1,138 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: batch_pipeline.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the headless batch pipeline, which reprocesses session folders from the command
+# line without the Qt pages (and without importing PyQt5), so folders can be processed on a server
+# with no display. Each folder is processed with a saved calibration profile and the clicked points
+# stored in its Results/Clicks_File.csv, and the folders are spread over a pool of worker processes.
+#
+# Usage:
+# python batch_pipeline.py FOLDER [FOLDER ...] --profile NAME [--workers N]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from calculation_class import CalculationsManager
+from calibration_profile_class import CalibrationProfileManager
+from file_manger_class import FileManager
+
+# Constants for results folder and files
+RESULTS_FOLDER_NAME = "Results"
+RESULTS_FILE_NAME = "Results_File.txt"
+CLICKS_FILE_NAME = "Clicks_File.csv"
+
+# Function: process_folder
+# Description:
+# Recalculate the results of one session folder from its stored clicks and write a new results file.
+# Trials without a stored center point use the center point of the calibration profile.
+# Input: folder_path - path to the session folder
+#        profile - calibration profile dictionary (scaling_factor, axis, vertical_axis, center_point)
+#        clicks_file_name - name of the clicks file in the Results folder (default: "Clicks_File.csv")
+#        results_file_name - name of the results file to write (default: "Results_File.txt")
+# Output: (folder_path, trial_count) - the processed folder and the number of trials written
+
+def process_folder(folder_path, profile, clicks_file_name=CLICKS_FILE_NAME, results_file_name=RESULTS_FILE_NAME):
+    file_manager = FileManager()
+    calculations_manager = CalculationsManager()
+
+    results_folder_path = file_manager.create_folder(folder_path, folder_name=RESULTS_FOLDER_NAME)
+    clicks_file_path = os.path.join(results_folder_path, clicks_file_name)
+    if not os.path.exists(clicks_file_path):
+        raise FileNotFoundError(f"No stored clicks found: {clicks_file_path}")
+
+    clicks = file_manager.read_click_data(clicks_file_path)
+    if not clicks:
+        return folder_path, 0
+
+    profile_center = profile.get("center_point")
+    center_points = []
+    for click in clicks:
+        center_point = click["center_point"] or profile_center
+        if center_point is None:
+            raise ValueError(f"Trial {click['trial']} has no center point and the profile has none.")
+        center_points.append(center_point)
+
+    # Calculate every trial of the folder in one vectorized pass
+    zaxis, yaxis, xaxis = calculations_manager.calculate_axis_values_batch(
+        np.array(center_points), np.array([click["puck_point"] for click in clicks]),
+        profile["axis"], profile["vertical_axis"], profile["scaling_factor"]
+    )
+
+    trials = [click["trial"] for click in clicks]
+    file_manager.write_axis_data(
+        os.path.join(results_folder_path, results_file_name),
+        zip(trials, zaxis.tolist(), yaxis.tolist(), xaxis.tolist())
+    )
+    return folder_path, len(trials)
+
+# Function: process_folders
+# Description:
+# Process several session folders in parallel, one folder per worker process.
+# Input: folder_paths - paths to the session folders
+#        profile - calibration profile dictionary
+#        workers - number of worker processes (default: number of CPU cores)
+#        clicks_file_name, results_file_name - file names passed to process_folder
+# Output: results - list of (folder_path, trial_count or error message, succeeded) tuples in input order
+
+def process_folders(folder_paths, profile, workers=None, clicks_file_name=CLICKS_FILE_NAME,
+                    results_file_name=RESULTS_FILE_NAME):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_folder, folder_path, profile, clicks_file_name, results_file_name)
+            for folder_path in folder_paths
+        ]
+        for folder_path, future in zip(folder_paths, futures):
+            try:
+                results.append((folder_path, future.result()[1], True))
+            except Exception as e:
+                results.append((folder_path, str(e), False))
+    return results
+
+# Function: main
+# Description:
+# Parse the command line arguments and process the given folders.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code - 0 if every folder was processed, 1 otherwise
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprocess session folders without the GUI.")
+    parser.add_argument("folders", nargs="+", help="Session folders to process")
+    parser.add_argument("--profile", required=True, help="Name of the saved calibration profile")
+    parser.add_argument("--profile-file", help="Calibration profile file (default: the application's profile file)")
+    parser.add_argument("--clicks", default=CLICKS_FILE_NAME, help="Name of the clicks file in each Results folder")
+    parser.add_argument("--output", default=RESULTS_FILE_NAME, help="Name of the results file to write")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    try:
+        profile = CalibrationProfileManager(args.profile_file).get_profile(args.profile)
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+
+    failed = False
+    for folder_path, outcome, succeeded in process_folders(args.folders, profile, args.workers, args.clicks, args.output):
+        if succeeded:
+            print(f"{folder_path}: {outcome} trials written")
+        else:
+            print(f"{folder_path}: failed: {outcome}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
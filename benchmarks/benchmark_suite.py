@@ -0,0 +1,249 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: benchmark_suite.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the benchmark suite of the calculations, the results file I/O, the trial store, the
+# parsing done by the data review page, its statistics and its bootstrap confidence intervals. Every case
+# runs on synthetic trials (seeded, so every run uses the same data) at several scales, by default 1k, 100k
+# and 1M trials. The results are written to a JSON file; passing the JSON file of an earlier version with
+# --baseline prints the change of every case and fails if a case got slower than the tolerance.
+#
+# Cases that make one call per trial (scalar calculations, append_axis_data, store_set_values) only run up to
+# --per-call-limit trials, since at 1M trials they measure the same per-trial cost for minutes.
+#
+# Usage:
+# python benchmarks/benchmark_suite.py [--scales 1000 100000 1000000] [--repeat 3] [--output FILE]
+#                                      [--baseline FILE] [--tolerance 0.2] [--bootstrap-replicates 10000]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_FOLDER)
+
+import numpy as np
+import pandas as pd
+from calculation_class import CalculationsManager
+from file_manger_class import FileManager
+from statistics_class import StatisticsManager
+from trial_store_class import TrialStore
+
+AXIS, VERTICAL_AXIS, SCALING_FACTOR = 0, 3, 0.05  # Calibration used for all synthetic trials
+
+# Function: synthetic_trials
+# Description:
+# Build synthetic clicked points and their axis values.
+# Input: count - number of trials
+#        seed - seed of the random generator (default: 0)
+# Output: (center_points, puck_points, rows) - arrays of shape (count, 2) and a list of
+#         (image_index, zaxis, yaxis, xaxis) rows
+def synthetic_trials(count, seed=0):
+    generator = np.random.default_rng(seed)
+    center_points = np.tile([800.0, 600.0], (count, 1)) + generator.normal(0, 2, (count, 2))
+    puck_points = center_points + generator.normal(0, 120, (count, 2))
+    zaxis, yaxis, xaxis = CalculationsManager().calculate_axis_values_batch(
+        center_points, puck_points, AXIS, VERTICAL_AXIS, SCALING_FACTOR)
+    rows = list(zip(range(1, count + 1), zaxis.tolist(), yaxis.tolist(), xaxis.tolist()))
+    return center_points, puck_points, rows
+
+# Function: time_case
+# Description:
+# Run a case several times and measure it.
+# Input: run - function that runs the case once; setup - function called before every run, or None
+#        repeat - number of runs
+#        items - number of trials the case processes, for the per-trial time
+# Output: dictionary with the median and minimum time in seconds and the median time per trial in microseconds
+def time_case(run, repeat, items, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    median_time = statistics.median(times)
+    return {"median_s": median_time, "min_s": min(times), "per_item_us": 1e6 * median_time / max(items, 1)}
+
+# Function: run_scale
+# Description:
+# Run every case at one scale.
+# Input: count - number of trials; repeat - number of runs per case
+#        per_call_limit - largest number of trials for cases that make one call per trial
+#        folder_path - folder for the temporary results files
+#        bootstrap_replicates - bootstrap replicates of the confidence interval case (default: 10000)
+# Output: dictionary case name -> measurement (or {"skipped": reason})
+def run_scale(count, repeat, per_call_limit, folder_path, bootstrap_replicates=10000):
+    calculations_manager = CalculationsManager()
+    file_manager = FileManager()
+    statistics_manager = StatisticsManager()
+    center_points, puck_points, rows = synthetic_trials(count)
+    results = {}
+    skipped = {"skipped": f"more than {per_call_limit} trials"}
+
+    # Calculations: one call per trial against one call for all trials
+    if count <= per_call_limit:
+        center_list, puck_list = center_points.tolist(), puck_points.tolist()
+        results["calculations_scalar"] = time_case(
+            lambda: [calculations_manager.calculate_axis_values(center, puck, AXIS, VERTICAL_AXIS, SCALING_FACTOR)
+                     for center, puck in zip(center_list, puck_list)], repeat, count)
+    else:
+        results["calculations_scalar"] = skipped
+    results["calculations_batch"] = time_case(
+        lambda: calculations_manager.calculate_axis_values_batch(center_points, puck_points, AXIS, VERTICAL_AXIS,
+                                                                 SCALING_FACTOR), repeat, count)
+
+    # Results file writes: appending trial by trial (as the image editing page does) and writing in one pass
+    append_path = os.path.join(folder_path, f"append_{count}.txt")
+    if count <= per_call_limit:
+        results["append_axis_data"] = time_case(
+            lambda: [file_manager.append_axis_data(append_path, *row) for row in rows], repeat, count,
+            setup=lambda: os.path.exists(append_path) and os.remove(append_path))
+    else:
+        results["append_axis_data"] = skipped
+    results_path = os.path.join(folder_path, f"results_{count}.txt")
+    results["write_axis_data"] = time_case(lambda: file_manager.write_axis_data(results_path, rows), repeat, count)
+
+    # Removing the last trial rewrites the whole file; measured on a file of count trials
+    results["remove_last_line"] = time_case(
+        lambda: file_manager.remove_last_line(results_path), repeat, count,
+        setup=lambda: file_manager.write_axis_data(results_path, rows))
+    file_manager.write_axis_data(results_path, rows)
+
+    # Data review page: reading the results file like read_and_display_data, into the trial store and its
+    # DataFrame (without filling the Qt table)
+    columns = ["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"]
+    review_store = TrialStore()
+
+    def review_parse():
+        data, _ = file_manager.read_new_axis_data(results_path)
+        review_store.load_results(data)
+        return review_store.to_dataframe()
+
+    results["review_parse"] = time_case(review_parse, repeat, count, setup=review_store.clear)
+
+    # Trial store: loading parsed rows at once, saving trials one at a time and the DataFrame view
+    store = TrialStore()
+    results["store_load_results"] = time_case(lambda: store.load_results(rows), repeat, count, setup=store.clear)
+    if count <= per_call_limit:
+        results["store_set_values"] = time_case(
+            lambda: [store.set_values(row[0], row[1:]) for row in rows], repeat, count, setup=store.clear)
+    else:
+        results["store_set_values"] = skipped
+    store.load_results(rows)
+    results["store_to_dataframe"] = time_case(store.to_dataframe, repeat, count)
+
+    # Data review page: the statistics shown by Show Statistics
+    data = pd.DataFrame(file_manager.read_axis_data(results_path), columns=columns)
+    results["review_statistics"] = time_case(lambda: statistics_manager.summarize(data), repeat, count)
+
+    # Data review page: bootstrap confidence intervals per participant and block, with the trials split
+    # over 60 participants; resamples every trial (replicates x 2) times, so it runs once and only up to
+    # --per-call-limit trials
+    if count <= per_call_limit:
+        participants = np.arange(count) % 60
+        blocks = (data["Image Trial"].to_numpy() - 1) // 10 + 1
+        results["review_bootstrap"] = time_case(
+            lambda: statistics_manager.bootstrap(data["Z-Axis"].to_numpy(), data["Y-Axis"].to_numpy(),
+                                                 data["X-Axis"].to_numpy(), participants, blocks,
+                                                 [f"P{index:02d}" for index in range(60)], bootstrap_replicates),
+            1, count)
+    else:
+        results["review_bootstrap"] = skipped
+    return results
+
+# Function: compare_results
+# Description:
+# Print the change of every case against a baseline run.
+# Input: results - results of this run; baseline - results of the baseline run
+#        tolerance - largest accepted slowdown (0.2 = 20% slower)
+# Output: list of (case, scale) that got slower than the tolerance
+def compare_results(results, baseline, tolerance):
+    regressions = []
+    print(f"{'Case':<24}{'Trials':>10}{'Baseline s':>14}{'Current s':>14}{'Change':>10}")
+    for scale, cases in results.items():
+        for case, measurement in cases.items():
+            previous = baseline.get(scale, {}).get(case)
+            if "median_s" not in measurement or not previous or "median_s" not in previous:
+                continue
+            change = measurement["median_s"] / previous["median_s"] - 1 if previous["median_s"] else 0.0
+            flag = "  SLOWER" if change > tolerance else ""
+            print(f"{case:<24}{scale:>10}{previous['median_s']:>14.4f}{measurement['median_s']:>14.4f}"
+                  f"{change:>+10.1%}{flag}")
+            if change > tolerance:
+                regressions.append((case, scale))
+    return regressions
+
+# Function: main
+# Description:
+# Parse the command line arguments, run the benchmarks, write the JSON results and compare them to a baseline.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code - 1 if a case is slower than the baseline by more than the tolerance, 0 otherwise
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark calculations, results I/O, parsing and statistics.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 100000, 1000000],
+                        help="Numbers of trials to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (the median is reported)")
+    parser.add_argument("--per-call-limit", type=int, default=100000,
+                        help="Largest number of trials for cases that make one call per trial")
+    parser.add_argument("--bootstrap-replicates", type=int, default=10000,
+                        help="Bootstrap replicates of the confidence interval case")
+    parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/<date>.json)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Largest accepted slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder_path:
+        for count in args.scales:
+            print(f"Benchmarking {count} trials...")
+            results[str(count)] = run_scale(count, args.repeat, args.per_call_limit, folder_path,
+                                            args.bootstrap_replicates)
+            for case, measurement in results[str(count)].items():
+                if "median_s" in measurement:
+                    print(f"  {case:<24}{measurement['median_s']:>10.4f} s{measurement['per_item_us']:>10.3f} us/trial")
+                else:
+                    print(f"  {case:<24}skipped ({measurement['skipped']})")
+
+    output_path = args.output or os.path.join(REPOSITORY_FOLDER, "benchmarks", "results",
+                                              datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as file:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+            "results": results,
+        }, file, indent=2)
+    print(f"Results written to {output_path}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        if compare_results(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
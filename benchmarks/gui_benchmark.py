@@ -0,0 +1,259 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: gui_benchmark.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the GUI latency benchmark of the image editing page. For every image count and
+# resolution it generates a session folder, starts the application on the offscreen Qt platform,
+# calibrates the session and clicks the center and the puck of every trial on the ImageView. It measures
+# the latency from the puck click to the next image, of going to the previous image and of loading an
+# image, the number of items in the scene and the peak memory (RSS). Every configuration runs in its own
+# process with its own home folder, so the peak memory is per configuration and the user's settings and
+# calibration profiles are not touched. Dialogs that pop up (such as the duplicate image warning) are closed.
+#
+# Usage:
+# python benchmarks/gui_benchmark.py [--counts 50 500 5000] [--resolutions 1600x1200 4000x3000] [--output FILE]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Function: latency_summary
+# Description:
+# Summarize latencies in milliseconds.
+# Input: samples - list of durations in seconds
+# Output: dictionary with count, mean, p50, p90 and max in milliseconds, or None without samples
+def latency_summary(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": 1000 * statistics.mean(ordered),
+        "p50_ms": 1000 * ordered[len(ordered) // 2],
+        "p90_ms": 1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        "max_ms": 1000 * ordered[-1],
+    }
+
+# Function: format_latency
+# Description:
+# Format one latency of a summary for printing.
+# Input: summary - dictionary from latency_summary, or None without samples; key - latency to format
+# Output: latency in milliseconds, or "n/a" without samples
+def format_latency(summary, key):
+    if summary is None:
+        return "n/a"
+    return f"{summary[key]:.1f} ms"
+
+# Function: peak_rss_mb
+# Description:
+# Get the peak resident memory of this process.
+# Input: None
+# Output: peak RSS in MB, or None where the resource module is not available (Windows)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+# Function: generate_folder
+# Description:
+# Write a session folder: a calibration image and trial images with the puck at random positions.
+# Input: folder_path - folder to write to; count - number of trial images; width, height - image size
+# Output: path of the calibration image
+def generate_folder(folder_path, count, width, height):
+    from PyQt5.QtGui import QImage, QPainter, QColor, QPen
+    from PyQt5.QtCore import Qt
+
+    generator = random.Random(count)
+    square = min(width, height) / 12  # Size of a grid square in pixels
+    paths = []
+    for index in range(count + 1):
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(200, 200, 190))
+        painter = QPainter(image)
+        painter.setPen(QPen(QColor(60, 60, 60), max(1, int(square / 30))))
+        for line in range(10):
+            offset = (line - 4.5) * square
+            painter.drawLine(int(width / 2 + offset), int(height / 2 - 4.5 * square),
+                             int(width / 2 + offset), int(height / 2 + 4.5 * square))
+            painter.drawLine(int(width / 2 - 4.5 * square), int(height / 2 + offset),
+                             int(width / 2 + 4.5 * square), int(height / 2 + offset))
+        if index > 0:
+            painter.setBrush(QColor(200, 30, 30))
+            painter.setPen(Qt.NoPen)
+            puck_x = width / 2 + generator.uniform(-4, 4) * square
+            puck_y = height / 2 + generator.uniform(-4, 4) * square
+            radius = square / 3
+            painter.drawEllipse(int(puck_x - radius), int(puck_y - radius), int(2 * radius), int(2 * radius))
+        painter.end()
+        path = os.path.join(folder_path, f"image_{index:05d}.jpg")
+        image.save(path, "JPG", 90)
+        paths.append(path)
+    return paths[0]
+
+# Function: run_configuration
+# Description:
+# Annotate a generated session through the GUI and measure it (runs in the benchmark's child process).
+# Input: count - number of trial images; width, height - image size; trials - number of trials to annotate
+# Output: dictionary with the measurements
+def run_configuration(count, width, height, trials):
+    sys.path.insert(0, REPOSITORY_FOLDER)
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt, QPointF, QTimer
+    from PyQt5.QtTest import QTest
+    from instrumentation_class import monitor
+    from main_page import MainWindow
+
+    app = QApplication(sys.argv)
+    monitor.enable()
+
+    # Close any dialog that pops up, so modal dialogs do not block the benchmark
+    dialog_closer = QTimer()
+    dialog_closer.timeout.connect(lambda: QApplication.activeModalWidget() and QApplication.activeModalWidget().close())
+    dialog_closer.start(20)
+
+    folder_path = tempfile.mkdtemp(prefix="gui_benchmark_")
+    # The generated session (images, results and session state) is removed however the run ends
+    try:
+        start = time.perf_counter()
+        calibration_path = generate_folder(folder_path, count, width, height)
+        generate_seconds = time.perf_counter() - start
+
+        window = MainWindow()
+        window.settings_manager.settings.update(fast_mode=True, fast_mode_delay=0)  # Advance right away, not saved
+        edit_page = window.edit_page
+        window.stack.setCurrentWidget(edit_page)
+        window.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        edit_page.set_data(0.05, folder_path, calibration_path, 0, 3)
+        app.processEvents()
+        session_start_seconds = time.perf_counter() - start
+
+        view = edit_page.image_viewer
+        generator = random.Random(0)
+        next_latencies = []
+        scene_items = []
+
+        # Click the scene point of the current image like a user would
+        def click(x, y):
+            QTest.mouseClick(view.viewport(), Qt.LeftButton, Qt.NoModifier, view.mapFromScene(QPointF(x, y)))
+
+        trials = min(trials, edit_page.last_trial() - edit_page.first_trial())
+        for _ in range(trials):
+            pixmap = view.image_item.pixmap()
+            center_x, center_y = pixmap.width() / 2, pixmap.height() / 2
+            index = edit_page.image_index
+            start = time.perf_counter()
+            if edit_page.track_clicks == 2:
+                click(center_x, center_y)
+            click(center_x + generator.uniform(-0.3, 0.3) * pixmap.width(),
+                  center_y + generator.uniform(-0.3, 0.3) * pixmap.height())
+            deadline = start + 30
+            while edit_page.image_index == index and time.perf_counter() < deadline:
+                app.processEvents()
+            next_latencies.append(time.perf_counter() - start)
+            scene_items.append(len(view.scene.items()))
+
+        previous_latencies = []
+        for _ in range(min(trials, 50)):
+            start = time.perf_counter()
+            edit_page.previous_image("Loaded previous image please click on the puck")
+            app.processEvents()
+            previous_latencies.append(time.perf_counter() - start)
+
+        load_latencies = []
+        for index in generator.sample(range(1, count + 1), min(count, 50)):
+            start = time.perf_counter()
+            edit_page.load_image(index, "Please click on the puck")
+            app.processEvents()
+            load_latencies.append(time.perf_counter() - start)
+            scene_items.append(len(view.scene.items()))
+
+        edit_page.registration_manager.cancel()
+        return {
+            "images": count,
+            "resolution": f"{width}x{height}",
+            "trials_annotated": trials,
+            "generate_s": generate_seconds,
+            "session_start_s": session_start_seconds,
+            "next": latency_summary(next_latencies),
+            "previous": latency_summary(previous_latencies),
+            "load": latency_summary(load_latencies),
+            "scene_items_max": max(scene_items, default=0),
+            "scene_items_final": len(view.scene.items()),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": monitor.summary(),
+        }
+    finally:
+        shutil.rmtree(folder_path, ignore_errors=True)
+
+# Function: main
+# Description:
+# Parse the command line arguments and run every configuration in its own offscreen process, or run one
+# configuration when called as a child process.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure image navigation latency of the image editing page.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 500, 5000], help="Images per session")
+    parser.add_argument("--resolutions", nargs="+", default=["1600x1200", "4000x3000"], help="Image sizes (WxH)")
+    parser.add_argument("--trials", type=int, default=1000000, help="Largest number of trials to annotate")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--single", nargs=2, metavar=("COUNT", "WxH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        width, height = (int(value) for value in args.single[1].lower().split("x"))
+        print(json.dumps(run_configuration(int(args.single[0]), width, height, args.trials)))
+        return 0
+
+    results = []
+    for resolution in args.resolutions:
+        for count in args.counts:
+            print(f"Benchmarking {count} images at {resolution}...")
+            with tempfile.TemporaryDirectory() as home_path:
+                environment = dict(os.environ, QT_QPA_PLATFORM="offscreen", HOME=home_path, USERPROFILE=home_path)
+                output = subprocess.run([sys.executable, os.path.abspath(__file__), "--single", str(count), resolution,
+                                         "--trials", str(args.trials)],
+                                        env=environment, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            print(f"  next p50 {format_latency(result['next'], 'p50_ms')}, "
+                  f"p90 {format_latency(result['next'], 'p90_ms')} | "
+                  f"previous p50 {format_latency(result['previous'], 'p50_ms')} | "
+                  f"load p50 {format_latency(result['load'], 'p50_ms')} | "
+                  f"scene items max {result['scene_items_max']} | peak RSS {result['peak_rss_mb'] or 0:.0f} MB")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
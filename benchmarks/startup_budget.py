@@ -0,0 +1,84 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: startup_budget.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file checks the startup time of the application against a time budget. Every run starts a fresh
+# Python process (so no module is already imported) that imports main_page, builds the MainWindow and
+# shows the main menu on the offscreen Qt platform. It also checks that the heavy libraries of the other
+# pages (pandas, matplotlib, numpy) are not imported before they are needed.
+#
+# Usage:
+# python benchmarks/startup_budget.py [--budget SECONDS] [--runs N]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "matplotlib", "numpy"]
+DEFAULT_BUDGET = 1.0  # Largest median startup time in seconds
+
+# Code run in the fresh process: time the startup and list the heavy modules it imported
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from main_page import MainWindow
+window = MainWindow()
+window.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "imported": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# Function: measure_startup
+# Description:
+# Start the application in a fresh process and measure the time until the main menu is shown.
+# Input: None
+# Output: dictionary with the startup time in seconds and the heavy modules imported
+def measure_startup():
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=REPOSITORY_FOLDER, env=environment,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+# Function: main
+# Description:
+# Parse the command line arguments, measure the startup several times and compare the median to the budget.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code - 1 if the startup is over budget or imports heavy modules, 0 otherwise
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the startup time of the application against a budget.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Largest median startup time in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="Number of startups to measure")
+    args = parser.parse_args(argv)
+
+    results = [measure_startup() for _ in range(args.runs)]
+    times = [result["seconds"] for result in results]
+    median_time = statistics.median(times)
+    imported = sorted({name for result in results for name in result["imported"]})
+
+    print(f"Startup time: median {median_time:.3f} s, min {min(times):.3f} s, max {max(times):.3f} s "
+          f"(budget {args.budget:.3f} s)")
+    if imported:
+        print(f"Heavy modules imported at startup: {', '.join(imported)}")
+    return 1 if median_time > args.budget or imported else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,16 @@
 
 import numpy as np
 
+# Mapping from the selected (horizontal axis, vertical axis) buttons to the image direction of each result axis.
+# Each value is (vertical source, vertical sign, horizontal source, horizontal sign), where source 0 is the
+# image x direction and source 1 is the image y direction relative to the center point.
+AXIS_MAPPINGS = {
+    (0, 3): (0, 1, 1, -1),   # Vertical: +y to -y, Horizontal: -x to +x
+    (1, 3): (0, -1, 1, -1),  # Vertical: +y to -y, Horizontal: +x to -x
+    (2, 1): (1, -1, 0, 1),   # Vertical: +x to -x, Horizontal: -y to +y
+    (3, 1): (1, -1, 0, -1),  # Vertical: +x to -x, Horizontal: +y to -y
+}
+
 # Class: CalculationsManager
 # Description:
 # This class provides methods to perform calculations related to pixel distances, scaling factors, errors, and real-world coordinates.
@@ -85,3 +95,74 @@ class CalculationsManager:
         delta_x = (x2 - x1) * scaling_factor
         delta_y = (y2 - y1) * scaling_factor
         return delta_x, delta_y
+
+    def get_axis_mapping(self, axis, vertical_axis):
+        """
+        Get the mapping from image directions to result axes for the selected axes.
+
+        Args:
+            axis (int): The selected horizontal axis.
+            vertical_axis (int): The selected vertical axis.
+
+        Returns:
+            tuple: (vertical source, vertical sign, horizontal source, horizontal sign).
+
+        Raises:
+            ValueError: If the axis combination is not supported.
+        """
+        if (axis, vertical_axis) not in AXIS_MAPPINGS:
+            raise ValueError(
+                f"Invalid axis combination: horizontal_axis={axis}, vertical_axis={vertical_axis}"
+            )
+        return AXIS_MAPPINGS[(axis, vertical_axis)]
+
+    def calculate_axis_values(self, center_point, puck_point, axis, vertical_axis, scaling_factor):
+        """
+        Calculate the z-axis, y-axis and x-axis values of a trial from the clicked points.
+
+        Args:
+            center_point: Coordinates (x, y) of the center point.
+            puck_point: Coordinates (x, y) of the puck.
+            axis (int): The selected horizontal axis.
+            vertical_axis (int): The selected vertical axis.
+            scaling_factor (float): The scaling factor.
+
+        Returns:
+            tuple (float, float, float): The z-axis, y-axis and x-axis values.
+        """
+        vertical_source, vertical_sign, horizontal_source, horizontal_sign = self.get_axis_mapping(axis, vertical_axis)
+        relative = (puck_point[0] - center_point[0], puck_point[1] - center_point[1])
+        vertical_value = vertical_sign * relative[vertical_source]
+        horizontal_value = horizontal_sign * relative[horizontal_source]
+
+        # Calculate the z-axis error using the adjusted vertical and horizontal values
+        zaxis = self.calculate_error(0, 0, vertical_value, horizontal_value, scaling_factor)
+
+        # If z-axis error is zero, set x and y to zero
+        if zaxis == 0:
+            return zaxis, 0, 0
+        xaxis, yaxis = self.calculate_real_world_coordinates(
+            0, 0, vertical_value, horizontal_value, scaling_factor
+        )
+        return zaxis, yaxis, xaxis
+
+    def calculate_axis_values_batch(self, center_points, puck_points, axis, vertical_axis, scaling_factor):
+        """
+        Calculate the z-axis, y-axis and x-axis values of many trials at once.
+
+        Args:
+            center_points: Array of shape (N, 2) with the center point of each trial.
+            puck_points: Array of shape (N, 2) with the puck position of each trial.
+            axis (int): The selected horizontal axis.
+            vertical_axis (int): The selected vertical axis.
+            scaling_factor (float): The scaling factor.
+
+        Returns:
+            tuple (ndarray, ndarray, ndarray): The z-axis, y-axis and x-axis values.
+        """
+        vertical_source, vertical_sign, horizontal_source, horizontal_sign = self.get_axis_mapping(axis, vertical_axis)
+        relative = np.asarray(puck_points, dtype=np.float64) - np.asarray(center_points, dtype=np.float64)
+        xaxis = vertical_sign * relative[:, vertical_source] * scaling_factor
+        yaxis = horizontal_sign * relative[:, horizontal_source] * scaling_factor
+        zaxis = np.hypot(xaxis, yaxis)
+        return zaxis, yaxis, xaxis
@@ -22,14 +22,17 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QGraphicsView, QGraphicsScene,
     QGraphicsPixmapItem, QVBoxLayout, QWidget, QPushButton, QFileDialog, QLabel
 )
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QLineEdit, QMessageBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QLineEdit, QMessageBox, QInputDialog
 from PyQt5.QtGui import QPixmap, QPen
 from PyQt5.QtCore import Qt, QLineF
 from file_manger_class import FileManager
 from calculation_class import CalculationsManager
+from calibration_profile_class import CalibrationProfileManager
+from manifest_class import ManifestManager
 from image_interface import ImageView
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QLabel
 from PyQt5.QtCore import QTimer
+import os
 
 
 # Class: CalibrationPage
@@ -53,6 +56,9 @@ class CalibrationPage(QWidget):
         # Initialize the calculations manager
         self.calculations_manager = CalculationsManager()
 
+        # Initialize the calibration profile manager
+        self.profile_manager = CalibrationProfileManager()
+
         # Set vertical layout for buttons
         self.layout = QVBoxLayout()
 
@@ -219,6 +225,18 @@ class CalibrationPage(QWidget):
         # Initially hide the distance input field
         self.distance_input.hide()
 
+        # Text input field for the optional calibration profile name
+        self.profile_name_input = QLineEdit()
+        # Set the placeholder text for the profile name input field
+        self.profile_name_input.setPlaceholderText("Optional: name to save this calibration as a profile")
+        # Set the font size for the profile name input field
+        self.profile_name_input.setStyleSheet("font-size: 20px")
+        # Pressing Enter in the profile name field also finishes the calibration
+        self.profile_name_input.returnPressed.connect(self.handle_enter_pressed)
+        self.layout.addWidget(self.profile_name_input)
+        # Initially hide the profile name input field
+        self.profile_name_input.hide()
+
         # Image viewer
         # Create an image viewer widget
         self.image_viewer = ImageView()
@@ -237,6 +255,7 @@ class CalibrationPage(QWidget):
         self.image_path = None  # Store the selected image path
         self.axis = None  # Store the selected axis
         self.vertical_axis = None  # Store the selected vertical axis
+        self.shard = None  # Part of a split session assigned to this annotator
 
         # Tracked Clicks
         self.clicked_points = []
@@ -289,8 +308,14 @@ class CalibrationPage(QWidget):
                 f"Scaling Factor: {scaling_factor:.6f}"
             )
 
-            # Transition to the next page after a delay
-            QTimer.singleShot(2000, lambda: self.next_page(scaling_factor))
+            # Save the calibration as a profile if the user entered a name
+            profile_name = self.profile_name_input.text().strip() or None
+            if profile_name:
+                self.profile_manager.save_profile(profile_name, scaling_factor, self.axis, self.vertical_axis)
+
+            # Transition to the next page after a delay (none in fast mode)
+            QTimer.singleShot(self.parent.settings_manager.advance_delay(),
+                              lambda: self.next_page(scaling_factor, profile_name=profile_name))
 
         except ValueError as e:
             # Display an error message box with the specific issue
@@ -299,15 +324,56 @@ class CalibrationPage(QWidget):
 
     # Method (next_page)
     # Description:
-    # This method switches to the next page after a delay of 2 seconds.
-    # Input: self
+    # This method switches to the next page after the advance delay (2 seconds unless fast mode is on).
+    # Input: self, scaling_factor, center_point (optional, from a saved profile),
+    #        profile_name (optional, profile that receives the center point once selected)
     # Output: None
-    def next_page(self, scaling_factor):
+    def next_page(self, scaling_factor, center_point=None, profile_name=None):
         # Transition to the next page (image editing page)
         # pass, scaling_factor, folder_path, image_path, axis
-        self.parent.edit_page.set_data(scaling_factor, self.folder_path, self.image_path,self.axis,self.vertical_axis)
+        self.parent.edit_page.set_data(scaling_factor, self.folder_path, self.image_path,self.axis,self.vertical_axis,
+                                       center_point=center_point, profile_name=profile_name, shard=self.shard)
         self.parent.stack.setCurrentWidget(self.parent.edit_page)
 
+    # Method (select_profile)
+    # Description:
+    # This method asks the user whether to use a saved calibration profile for the selected folder.
+    # If a profile is chosen, the first image of the folder is used as the calibration image and
+    # the page goes straight to the image editing page without manual calibration.
+    # Input: self
+    # Output: True if a profile was applied, False otherwise
+    def select_profile(self):
+        profile_names = self.profile_manager.list_profiles()
+        if not profile_names:
+            return False
+
+        manual_option = "None (calibrate manually)"
+        choice, ok = QInputDialog.getItem(
+            self, "Calibration Profile", "Use a saved calibration profile?",
+            [manual_option] + profile_names, 0, False
+        )
+        if not ok or choice == manual_option:
+            return False
+
+        # Use the first image of the folder (in natural file name order) as the calibration image
+        image_names = sorted(
+            (f for f in os.listdir(self.folder_path)
+             if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp"))),
+            key=ManifestManager.natural_sort_key
+        )
+        if not image_names:
+            QMessageBox.warning(self, "No Images", "The selected folder does not contain any images.")
+            return False
+
+        profile = self.profile_manager.get_profile(choice)
+        self.image_path = os.path.join(self.folder_path, image_names[0])
+        self.axis = profile["axis"]
+        self.vertical_axis = profile["vertical_axis"]
+        self.scaling_factor = profile["scaling_factor"]
+        center_point = tuple(profile["center_point"]) if profile.get("center_point") else None
+        self.next_page(self.scaling_factor, center_point=center_point, profile_name=choice)
+        return True
+
     #####################################################
     # Vertical Axis Selection Methods
     #####################################################
@@ -446,6 +512,7 @@ class CalibrationPage(QWidget):
     # Output: None
 
     def enable_vertical_axis_buttons(self):
+        self.profile_name_input.setVisible(True)
         self.vertical_axis_label.setVisible(True)
         self.horizontal_axis_label.setVisible(True)
         self.negative_to_positive_x_button.setEnabled(True)
@@ -476,6 +543,7 @@ class CalibrationPage(QWidget):
     def hide_vertical_axis_buttons(self):
         self.distance_input.setEnabled(False)
         self.distance_input.setVisible(False)
+        self.profile_name_input.setVisible(False)
         self.horizontal_axis_label.setVisible(False)
         self.vertical_axis_label.setVisible(False)
         self.negative_to_positive_x_button.setEnabled(False)
@@ -539,11 +607,16 @@ class CalibrationPage(QWidget):
         # Open a dialog to select a folder
         folder_path = QFileDialog.getExistingDirectory(self, "Select Folder")
         if folder_path:
+            # Ask which part of a split session the user annotates
+            ok, self.shard = self.parent.edit_page.choose_shard(folder_path)
+            if not ok:
+                return
             self.folder_path = folder_path # Store the selected folder path
             self.folder_label.setText(f"Selected Folder: {folder_path}")# Display the selected folder path
             self.select_image_button.setEnabled(True)# Enable the select image button
             self.select_image_button.setVisible(True)#  Show the select image button
-            self.select_image() # Call the select_image method
+            if not self.select_profile(): # Offer saved calibration profiles first
+                self.select_image() # Call the select_image method
 
     # Method (select_image)
     # Description:
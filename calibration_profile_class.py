@@ -0,0 +1,125 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: calibration_profile_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the calibration profile manager, which saves named calibrations
+# (scaling factor, axis orientation and center point) to disk so a fixed camera rig only has to be
+# calibrated once instead of at the start of every session.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import json
+import os
+from datetime import datetime
+from file_manger_class import FileManager
+
+# Class: CalibrationProfileManager
+# Description:
+# This class provides methods to list, load, save, update and delete calibration profiles.
+# All profiles are kept in a single JSON file in the application data folder.
+
+class CalibrationProfileManager:
+    def __init__(self, profile_file_path=None):
+        if profile_file_path is None:
+            app_data_folder = FileManager().create_app_data_folder()
+            profile_file_path = os.path.join(app_data_folder, "calibration_profiles.json")
+        self.profile_file_path = profile_file_path  # Path to the JSON file holding the profiles
+
+    # Method: load_profiles
+    # Description:
+    # Read all profiles from disk. A missing or unreadable file is treated as having no profiles.
+    # Input: None
+    # Output: profiles - dictionary of profiles keyed by profile name
+    def load_profiles(self):
+        if not os.path.exists(self.profile_file_path):
+            return {}
+        try:
+            with open(self.profile_file_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    # Method: write_profiles
+    # Description:
+    # Write all profiles to disk. The file is replaced atomically so a crash never leaves it half written.
+    # Input: profiles - dictionary of profiles keyed by profile name
+    # Output: None
+    def write_profiles(self, profiles):
+        temp_path = self.profile_file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(profiles, file, indent=2)
+        os.replace(temp_path, self.profile_file_path)
+
+    # Method: list_profiles
+    # Description:
+    # Get the names of all saved profiles in alphabetical order.
+    # Input: None
+    # Output: list of profile names
+    def list_profiles(self):
+        return sorted(self.load_profiles())
+
+    # Method: get_profile
+    # Description:
+    # Get a saved profile by name.
+    # Input: name - name of the profile
+    # Output: profile - dictionary with scaling_factor, axis, vertical_axis and center_point
+    # Raises: KeyError if no profile with that name exists
+    def get_profile(self, name):
+        profiles = self.load_profiles()
+        if name not in profiles:
+            raise KeyError(f"Calibration profile not found: {name}")
+        return profiles[name]
+
+    # Method: save_profile
+    # Description:
+    # Save a calibration under the given name, replacing any existing profile with the same name.
+    # Input: name - name of the profile
+    #        scaling_factor - real-world distance per pixel
+    #        axis - selected horizontal axis
+    #        vertical_axis - selected vertical axis
+    #        center_point - center point in calibration image coordinates (default: None)
+    # Output: None
+    def save_profile(self, name, scaling_factor, axis, vertical_axis, center_point=None):
+        if not name:
+            raise ValueError("Profile name cannot be empty.")
+        profiles = self.load_profiles()
+        profiles[name] = {
+            "scaling_factor": scaling_factor,
+            "axis": axis,
+            "vertical_axis": vertical_axis,
+            "center_point": list(center_point) if center_point else None,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.write_profiles(profiles)
+
+    # Method: update_center_point
+    # Description:
+    # Store the center point in an existing profile once the user has selected it.
+    # Input: name - name of the profile
+    #        center_point - center point in calibration image coordinates
+    # Output: None
+    def update_center_point(self, name, center_point):
+        profiles = self.load_profiles()
+        if name not in profiles:
+            raise KeyError(f"Calibration profile not found: {name}")
+        profiles[name]["center_point"] = list(center_point)
+        profiles[name]["updated"] = datetime.now().isoformat(timespec="seconds")
+        self.write_profiles(profiles)
+
+    # Method: delete_profile
+    # Description:
+    # Delete a saved profile if it exists.
+    # Input: name - name of the profile
+    # Output: None
+    def delete_profile(self, name):
+        profiles = self.load_profiles()
+        if profiles.pop(name, None) is not None:
+            self.write_profiles(profiles)
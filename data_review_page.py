@@ -11,6 +11,9 @@
 # File Description:
 # This file contains the code for the data review page, which loads data from a Results_File.txt file,
 # displays it in a table, and provides options to export the data, show statistics, and generate graphs.
+# Two or more results files of the same trials (coded by different raters) can also be compared.
+# Aggregates of many sessions (see aggregate_store_class.py) are reviewed per participant or session
+# through a memory map, without loading all trials into memory.
 #
 ###########################################################################################################
 
@@ -18,14 +21,27 @@
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QLabel,
-    QTableWidget, QTableWidgetItem, QHBoxLayout, QFileDialog, QDialog
+    QTableWidget, QTableWidgetItem, QHBoxLayout, QFileDialog, QDialog, QComboBox, QAbstractItemView, QProgressBar,
+    QPlainTextEdit
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QItemSelection, QItemSelectionModel
+from PyQt5.QtGui import QColor, QFontDatabase
 import pandas as pd
+import numpy as np
 import os
 import sys
-import matplotlib.pyplot as plt
 from PyQt5.QtWidgets import QMessageBox
+from job_queue_service import JobQueue
+from file_manger_class import FileManager
+from reliability_class import ReliabilityManager
+from statistics_class import StatisticsManager
+from landing_density_class import LandingDensityManager
+from spatial_index_class import SpatialIndex
+from export_class import ExportManager, ExportSource
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation_class import monitor
+from trial_store_class import TrialStore
+from aggregate_store_class import AggregateStore
 
 # Class: DataReviewPage
 # Description:
@@ -44,6 +60,27 @@ class DataReviewPage(QWidget):
         # Data storage
         self.data = None
         self.file_path = None
+        self.results_offset = None  # Byte offset up to which the results file was read, None when not following it
+        self.results_file_id = None  # Inode of the results file, to notice when it is rewritten
+        self.trial_store = TrialStore()  # Trials of the loaded results file; self.data shares its columns
+        self.aggregate = None  # Open aggregate of many sessions, or None when a results file is loaded
+        self.aggregate_range = (0, 0)  # Range of aggregate records shown; self.data is a view of them
+        self.table_limit = 100000  # Largest number of aggregate trials shown in the table
+        self.file_manager = FileManager()
+        self.reliability_manager = ReliabilityManager()
+        self.statistics_manager = StatisticsManager()
+        self.landing_density_manager = LandingDensityManager()
+        self.export_manager = ExportManager()
+        self.export_executor = ThreadPoolExecutor(max_workers=1)  # Worker thread that writes exported files
+        self.export_future = None  # Export in progress, or None
+        self.export_path = None  # Path of the file being exported
+        self.export_progress = 0.0  # Fraction of the export done, set by the worker thread
+        self.statistics_executor = ThreadPoolExecutor(max_workers=1)  # Worker thread that runs the bootstrap
+        self.bootstrap_future = None  # Bootstrap in progress, or None
+        self.scatter_limit = 5000  # Largest number of trials drawn as a scatter, larger datasets are drawn as a density
+        # Memory of the loaded data above which it is released when the page is left (reloaded from the file on return)
+        self.data_budget = (parent.settings_manager.get("review_data_mb") if parent else 256) * 1024 * 1024
+        self.data_released = False  # True when the data was released and has to be reloaded when the page is shown
 
         # Label for data review
         # This add text to the data review page
@@ -52,13 +89,76 @@ class DataReviewPage(QWidget):
         self.data_label.setStyleSheet("font-size: 20px")
         layout.addWidget(self.data_label)
 
+        # Selection of the participant or session shown from an aggregate, hidden until one is opened
+        self.aggregate_filter = QComboBox()
+        self.aggregate_filter.currentIndexChanged.connect(self.show_aggregate_selection)
+        self.aggregate_filter.hide()
+        layout.addWidget(self.aggregate_filter)
+
         # Table to display data
         # This creates a table to display the data
         self.data_table = QTableWidget()
         self.data_table.setColumnCount(4)
         self.data_table.setHorizontalHeaderLabels(["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"])
+        self.data_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.data_table.cellDoubleClicked.connect(self.open_trial)
+        self.data_table.itemSelectionChanged.connect(self.update_landing_selection)
         layout.addWidget(self.data_table)
 
+        # Plots of the axis values, created the first time graphs are shown
+        self.plot_canvas = None
+        self.plot_layout = QVBoxLayout()
+        layout.addLayout(self.plot_layout)
+
+        # Landing map with filters by participant and block, created the first time it is shown
+        self.landing_canvas = None
+        self.landing_index = None  # Spatial index of the landing positions shown on the map
+        self.landing_rows = None  # Table row of every point of the spatial index
+        self.landing_filter_layout = QHBoxLayout()
+        self.participant_filter = QComboBox()
+        self.participant_filter.currentIndexChanged.connect(self.update_landing_map)
+        self.participant_filter.hide()
+        self.landing_filter_layout.addWidget(self.participant_filter)
+        self.block_filter = QComboBox()
+        self.block_filter.currentIndexChanged.connect(self.update_landing_map)
+        self.block_filter.hide()
+        self.landing_filter_layout.addWidget(self.block_filter)
+        self.plot_layout.addLayout(self.landing_filter_layout)
+
+        # Timer that checks the results file for new trials every 2 seconds while the graphs are shown
+        self.plot_timer = QTimer(self)
+        self.plot_timer.setInterval(2000)
+        self.plot_timer.timeout.connect(self.refresh_plots)
+
+        # Progress bar of the export in progress
+        self.export_progress_bar = QProgressBar()
+        self.export_progress_bar.setRange(0, 100)
+        self.export_progress_bar.hide()
+        layout.addWidget(self.export_progress_bar)
+
+        # Timer that updates the export progress every 100 milliseconds while exporting
+        self.export_timer = QTimer(self)
+        self.export_timer.setInterval(100)
+        self.export_timer.timeout.connect(self.check_export)
+
+        # Timer that checks every 100 milliseconds whether the confidence intervals are ready
+        self.bootstrap_timer = QTimer(self)
+        self.bootstrap_timer.setInterval(100)
+        self.bootstrap_timer.timeout.connect(self.check_confidence_intervals)
+
+        # Label for the status of background processing jobs
+        # This shows the jobs of the local job queue service while polling is on
+        self.job_status_label = QLabel("")
+        self.job_status_label.setStyleSheet("font-size: 14px")
+        self.job_status_label.hide()
+        layout.addWidget(self.job_status_label)
+
+        # Timer that polls the job queue every 5 seconds while the job status is shown
+        self.job_queue = None
+        self.job_timer = QTimer(self)
+        self.job_timer.setInterval(5000)
+        self.job_timer.timeout.connect(self.refresh_job_status)
+
         # Buttons
         button_layout = QHBoxLayout()
 
@@ -69,6 +169,20 @@ class DataReviewPage(QWidget):
         self.load_folder_button.clicked.connect(self.load_folder)
         button_layout.addWidget(self.load_folder_button)
 
+        # Button to compare results files
+        # This button allows the user to compare the results of two or more raters
+        self.compare_button = QPushButton("Compare Files")
+        self.compare_button.setStyleSheet("font-size: 16px")
+        self.compare_button.clicked.connect(self.compare_files)
+        button_layout.addWidget(self.compare_button)
+
+        # Button to open an aggregate of many sessions
+        # This button allows the user to review years of sessions without loading them into memory
+        self.aggregate_button = QPushButton("Open Aggregate")
+        self.aggregate_button.setStyleSheet("font-size: 16px")
+        self.aggregate_button.clicked.connect(self.open_aggregate)
+        button_layout.addWidget(self.aggregate_button)
+
         # Button to export data
         # This button allows the user to export the data
         self.export_button = QPushButton("Export Data")
@@ -83,6 +197,13 @@ class DataReviewPage(QWidget):
         self.stats_button.clicked.connect(self.show_statistics)
         button_layout.addWidget(self.stats_button)
 
+        # Button to compute confidence intervals
+        # This button computes bootstrap confidence intervals of the error measures per participant and block
+        self.intervals_button = QPushButton("Confidence Intervals")
+        self.intervals_button.setStyleSheet("font-size: 16px")
+        self.intervals_button.clicked.connect(self.show_confidence_intervals)
+        button_layout.addWidget(self.intervals_button)
+
         # Button to display graphs
         # This button allows the user to display graphs
         self.graphs_button = QPushButton("Show Graphs")
@@ -90,6 +211,21 @@ class DataReviewPage(QWidget):
         self.graphs_button.clicked.connect(self.show_graphs)
         button_layout.addWidget(self.graphs_button)
 
+        # Button to display the landing map
+        # This button allows the user to display the landing positions over the grid
+        self.landing_button = QPushButton("Landing Map")
+        self.landing_button.setStyleSheet("font-size: 16px")
+        self.landing_button.clicked.connect(self.show_landing_map)
+        button_layout.addWidget(self.landing_button)
+
+        # Button to show the status of background processing jobs
+        # This button starts or stops polling the local job queue
+        self.jobs_button = QPushButton("Job Status")
+        self.jobs_button.setStyleSheet("font-size: 16px")
+        self.jobs_button.setCheckable(True)
+        self.jobs_button.toggled.connect(self.toggle_job_status)
+        button_layout.addWidget(self.jobs_button)
+
         # Button to go back to main menu
         # This button allows the user to go back to the main menu
         self.back_button = QPushButton("Back to Menu")
@@ -126,44 +262,298 @@ class DataReviewPage(QWidget):
     # Input: file_path - Path to the Results_File.txt
     # Output: None
 
+    @monitor.timed("review_load")
     def read_and_display_data(self, file_path):
         """Read data from Results_File.txt and display it in the table."""
         try:
-            data = []
-            with open(file_path, "r") as file:
-                for line in file:
-                    line = line.strip()  # Remove leading/trailing whitespace
-                    if not line or line.startswith("Image Index") or line.startswith("="):
-                        # Skip empty lines, headers, and separator lines
-                        continue
-
-                    # Extract the data from a well-structured line
-                    if line.startswith("Image Trial:"):
-                        try:
-                            trial = line.split("Image Trial:")[1].split()[0]
-                            z_axis = line.split("Z-Axis:")[1].split()[0]
-                            y_axis = line.split("Y-Axis:")[1].split()[0]
-                            x_axis = line.split("X-Axis:")[1].split()[0]
-                            data.append([int(trial), float(z_axis), float(y_axis), float(x_axis)])
-                        except (IndexError, ValueError):
-                            
-                            continue
-
-            # Save data for exporting
-            self.data = pd.DataFrame(data, columns=["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"])
+            # Skip empty lines, headers, separator lines and malformed lines
+            self.results_file_id = os.stat(file_path).st_ino
+            data, self.results_offset = self.file_manager.read_new_axis_data(file_path)
+
+            # Keep the trials in the trial store and save a DataFrame view of them for exporting
+            self.close_aggregate()
+            self.file_path = file_path  # Also set when the page is opened from the image editing page
+            self.trial_store.clear()
+            self.trial_store.load_results(data)
+            self.data = self.trial_store.to_dataframe()
+            self.data_released = False
 
             # Populate the table
-            self.data_table.setRowCount(len(data))
-            for row_idx, row_data in enumerate(data):
-                for col_idx, value in enumerate(row_data):
-                    self.data_table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
+            self.fill_table()
 
+            self.data_table.setHorizontalHeaderLabels(["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"])
             self.data_label.setText(f"Loaded data from: {file_path}")
+            if self.plot_canvas is not None:
+                self.plot_canvas.set_series(self.data["Image Trial"], self.data[["Z-Axis", "Y-Axis", "X-Axis"]])
+            if self.landing_canvas is not None and self.landing_canvas.isVisible():
+                self.update_landing_filters()
 
         except Exception as e:
             self.data_label.setText(f"Error reading file: {str(e)}")
 
 
+    # Method: fill_table
+    # Description:
+    # Show the rows of the loaded data in the table from a row on; the rows before it are kept.
+    # Input: first_row - first row to fill (default: 0)
+    #        limit - largest number of rows shown, or None for all rows (default: None)
+    # Output: None
+
+    def fill_table(self, first_row=0, limit=None):
+        row_count = len(self.data) if limit is None else min(len(self.data), limit)
+        self.data_table.setRowCount(row_count)
+        columns = [self.data[column].iloc[first_row:row_count].tolist() for column in self.data.columns]
+        for row_idx, row_data in enumerate(zip(*columns), start=first_row):
+            for col_idx, value in enumerate(row_data):
+                self.data_table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
+
+    # Method: release_data
+    # Description:
+    # Release the loaded data and the table rows when they use more memory than the data budget.
+    # Only data read from a results file is released, since it can be read again when the page is shown.
+    # Input: None
+    # Output: None
+
+    def release_data(self):
+        if self.data is None or self.results_offset is None:
+            return
+        if self.data.memory_usage(deep=True).sum() <= self.data_budget:
+            return
+        self.plot_timer.stop()
+        self.data = None
+        self.trial_store.clear()
+        self.landing_index = None
+        self.landing_rows = None
+        self.data_table.setRowCount(0)
+        self.data_released = True
+
+    # Method: hideEvent
+    # Description:
+    # Release large data when the user leaves the page (not when the window is minimized).
+    # Input: event - hide event
+    # Output: None
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if not event.spontaneous():
+            self.release_data()
+
+    # Method: showEvent
+    # Description:
+    # Read the results file again if its data was released when the page was left.
+    # Input: event - show event
+    # Output: None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.data_released and not event.spontaneous():
+            self.data_released = False
+            if self.file_path is None:
+                self.data_label.setText("The released data cannot be read again, load the results file.")
+                return
+            self.read_and_display_data(self.file_path)
+            self.update_plot_timer()
+
+    # Method: compare_files
+    # Description:
+    # Compare the results files of two or more raters. The table shows the per-trial disagreement
+    # (largest difference between raters) and the most disagreeing trials are highlighted.
+    # Double-clicking a trial opens its image on the image editing page.
+    # Input: None
+    # Output: None
+    def compare_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Results Files", os.path.expanduser("~"), "Results Files (*.txt)"
+        )
+        if not file_paths:
+            return
+        try:
+            datasets = [self.file_manager.read_axis_data(file_path) for file_path in file_paths]
+            report = self.reliability_manager.compare(datasets)
+        except (OSError, ValueError) as e:
+            self.data_label.setText(f"Error comparing files: {str(e)}")
+            return
+
+        # Show the disagreement of every trial; statistics, graphs and export then apply to the disagreement
+        self.file_path = file_paths[0]
+        self.results_offset = None
+        self.trial_store.clear()
+        self.close_aggregate()
+        if self.landing_canvas is not None and self.landing_canvas.isVisible():
+            self.show_landing_map()  # The landing map needs landing positions, not disagreements
+        self.data = pd.DataFrame(report["disagreement"], columns=["Z-Axis", "Y-Axis", "X-Axis"])
+        self.data.insert(0, "Image Trial", report["keys"])
+        self.data_table.setHorizontalHeaderLabels(["Image Trial", "Z Difference", "Y Difference", "X Difference"])
+        self.data_table.setRowCount(len(self.data))
+        worst = set(report["worst"])
+        for row_idx, row_data in enumerate(self.data.itertuples(index=False)):
+            for col_idx, value in enumerate(row_data):
+                item = QTableWidgetItem(f"{value:.2f}" if col_idx else str(value))
+                if row_data[0] in worst:
+                    item.setBackground(QColor(255, 200, 200))
+                self.data_table.setItem(row_idx, col_idx, item)
+
+        self.data_label.setText(f"Comparing {len(file_paths)} files, double-click a trial to open its image")
+        if self.plot_canvas is not None:
+            self.plot_canvas.set_series(self.data["Image Trial"], self.data[["Z-Axis", "Y-Axis", "X-Axis"]])
+        rater_names = [os.path.basename(os.path.dirname(os.path.dirname(file_path))) + "/" + os.path.basename(file_path)
+                       for file_path in file_paths]
+        QMessageBox.information(self, "Inter-Rater Reliability",
+                                self.reliability_manager.format_report(report, rater_names))
+
+    # Method: open_aggregate
+    # Description:
+    # Open an aggregate folder (built with aggregate_store_class.py) and show all of its trials.
+    # The participant and session selection then shows the trials of one participant or session.
+    # Input: None
+    # Output: None
+    def open_aggregate(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Aggregate Folder", os.path.expanduser("~"))
+        if not folder_path:
+            return
+        try:
+            aggregate = AggregateStore(folder_path)
+        except (OSError, ValueError, KeyError) as e:
+            self.data_label.setText(f"Error opening aggregate: {str(e)}")
+            return
+
+        self.plot_timer.stop()
+        self.file_path = None
+        self.results_offset = None
+        self.trial_store.clear()
+        self.aggregate = aggregate
+        self.aggregate_filter.blockSignals(True)
+        self.aggregate_filter.clear()
+        self.aggregate_filter.addItem("All participants", (None, None))
+        for participant_index, participant in enumerate(aggregate.participants):
+            self.aggregate_filter.addItem(participant, (participant, None))
+            for entry in aggregate.sessions:
+                if entry["participant"] == participant_index and entry["name"] != participant:
+                    self.aggregate_filter.addItem(f"    {entry['name']}", (participant, entry["name"]))
+        self.aggregate_filter.setCurrentIndex(0)
+        self.aggregate_filter.blockSignals(False)
+        self.aggregate_filter.show()
+        self.show_aggregate_selection()
+
+    # Method: show_aggregate_selection
+    # Description:
+    # Show the trials of the selected participant or session of the aggregate. The data is a view of the
+    # memory-mapped records; only the first table_limit trials are put in the table.
+    # Input: None
+    # Output: None
+    def show_aggregate_selection(self):
+        if self.aggregate is None:
+            return
+        participant, session = self.aggregate_filter.currentData() or (None, None)
+        self.aggregate_range = self.aggregate.select(participant, session)
+        self.data = self.aggregate.to_dataframe(participant, session)
+        self.data_table.setHorizontalHeaderLabels(["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"])
+        self.fill_table(limit=self.table_limit)
+        shown = f" (first {self.table_limit} in the table)" if len(self.data) > self.table_limit else ""
+        self.data_label.setText(f"Aggregate {os.path.basename(self.aggregate.folder_path)}: "
+                                f"{len(self.data)} trials{shown}")
+        if self.plot_canvas is not None and self.plot_canvas.isVisible():
+            self.plot_canvas.set_series(self.data["Image Trial"], self.data[["Z-Axis", "Y-Axis", "X-Axis"]])
+        if self.landing_canvas is not None and self.landing_canvas.isVisible():
+            self.update_landing_filters()
+
+    # Method: close_aggregate
+    # Description:
+    # Stop showing the aggregate (when a results file or a comparison is loaded).
+    # Input: None
+    # Output: None
+    def close_aggregate(self):
+        self.aggregate = None
+        self.aggregate_range = (0, 0)
+        self.aggregate_filter.hide()
+
+    # Method: open_trial
+    # Description:
+    # Open the image of the trial in a table row on the image editing page.
+    # The session of the loaded (or first compared) results file is restored first.
+    # Input: row - row of the table
+    #        column - column of the table (not used)
+    # Output: None
+    def open_trial(self, row, column):
+        if self.parent is None:
+            return
+        if (self.file_path is None and self.aggregate is None) or self.data is None:
+            self.data_label.setText("Load a results file to open the image of a trial.")
+            return
+        if not 0 <= row < len(self.data):
+            self.data_label.setText(f"Row {row + 1} has no trial to open.")
+            return
+        trial = int(self.data["Image Trial"].iloc[row])
+        file_path = self.file_path
+        if self.aggregate is not None:
+            file_path = self.aggregate.session_at(self.aggregate_range[0] + row)["results_file"]
+        folder_path = os.path.dirname(os.path.dirname(file_path))
+        edit_page = self.parent.edit_page
+        if edit_page.folder_path != folder_path:
+            ok, shard = edit_page.choose_shard(folder_path)
+            if not ok:
+                return  # The user cancelled the shard selection
+            if not edit_page.restore_session(folder_path, shard):
+                self.data_label.setText(f"Could not open the session of trial {trial}: {folder_path}")
+                return
+        edit_page.show_trial(trial, f"Trial {trial} opened from the data review")
+        self.parent.stack.setCurrentWidget(edit_page)
+
+    # Method: handle_landing_selection
+    # Description:
+    # Select the trials clicked or surrounded by a lasso on the landing map in the table.
+    # A click opens the image of the nearest trial on the image editing page.
+    # Input: vertices - list of (x, y) points of the click or lasso in cm
+    # Output: None
+    def handle_landing_selection(self, vertices):
+        if self.landing_index is None or not vertices:
+            return
+        points = np.asarray(vertices, dtype=np.float64)
+        click_radius = 0.02 * 2 * self.landing_density_manager.extent  # 2% of the map width
+        if np.ptp(points[:, 0]) < click_radius and np.ptp(points[:, 1]) < click_radius:
+            nearest = self.landing_index.nearest(points[-1, 0], points[-1, 1], click_radius)
+            if nearest is None:
+                self.data_label.setText("No trial landed near the clicked point.")
+                return
+            row = int(self.landing_rows[nearest])
+            self.select_table_rows([row])
+            self.open_trial(row, 0)
+            return
+        self.select_table_rows(self.landing_rows[self.landing_index.query_polygon(points)])
+
+    # Method: select_table_rows
+    # Description:
+    # Select rows of the table and scroll to the first one. Consecutive rows are selected as one range.
+    # Input: rows - sorted sequence of row numbers
+    # Output: None
+    def select_table_rows(self, rows):
+        selection = QItemSelection()
+        last_column = self.data_table.columnCount() - 1
+        run_start = previous = None
+        for row in list(rows) + [None]:
+            if row is not None and previous is not None and row == previous + 1:
+                previous = row
+                continue
+            if run_start is not None:
+                selection.select(self.data_table.model().index(run_start, 0),
+                                 self.data_table.model().index(previous, last_column))
+            run_start = previous = row
+        self.data_table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        if len(rows):
+            self.data_table.scrollToItem(self.data_table.item(int(rows[0]), 0))
+
+    # Method: update_landing_selection
+    # Description:
+    # Highlight the trials selected in the table on the landing map.
+    # Input: None
+    # Output: None
+    def update_landing_selection(self):
+        if self.landing_canvas is None or not self.landing_canvas.isVisible() or self.data is None:
+            return
+        rows = sorted({index.row() for index in self.data_table.selectionModel().selectedRows()})
+        rows = [row for row in rows if row < len(self.data)]
+        self.landing_canvas.show_selection(self.data["Y-Axis"].to_numpy()[rows], self.data["X-Axis"].to_numpy()[rows])
+
     # Method: show_statistics
     # Description:
     # Display enhanced statistics such as mean, median, standard deviation, and variability metrics.
@@ -171,44 +561,8 @@ class DataReviewPage(QWidget):
     # Output: None
     def show_statistics(self):
         if self.data is not None:
-            stats_summary = "Statistics:\n"
-
-            for column in self.data.columns[1:]:
-                column_data = self.data[column]
-                
-                # Basic numerical measures
-                # Mean, median, and mode
-                mean_value = column_data.mean()
-                median_value = column_data.median()
-                mode_value = column_data.mode().iloc[0] if not column_data.mode().empty else "No mode"
-                
-                # Spread and variability measures
-                # Standard deviation, variance, range, and interquartile range
-                std_dev = column_data.std()
-                variance = column_data.var()
-                data_range = column_data.max() - column_data.min()
-                iqr = column_data.quantile(0.75) - column_data.quantile(0.25)
-                
-                # Additional measure: max difference percentage
-                # Calculate the maximum difference percentage from the mean
-                absolute_difference = (column_data - mean_value).abs()
-                max_difference = absolute_difference.max()
-                max_difference_percentage = (max_difference / mean_value) * 100 if mean_value != 0 else 0
-
-                # Append statistics for this column to the summary
-                # Format the statistics with two decimal places
-                stats_summary += (
-                    f"Column: {column}\n"
-                    f"  Mean (Average): {mean_value:.2f}\n"
-                    f"  Median (Midpoint): {median_value:.2f}\n"
-                    f"  Mode (Most Frequent): {mode_value}\n"
-                    f"  Standard Deviation (Spread): {std_dev:.2f}\n"
-                    f"  Variance: {variance:.2f}\n"
-                    f"  Range (Max - Min): {data_range:.2f}\n"
-                    f"  Interquartile Range (IQR): {iqr:.2f}\n"
-                    f"  Max Difference (%): {max_difference_percentage:.2f}%\n"
-                    "\n"
-                )
+            with monitor.timer("review_statistics"):
+                stats_summary = self.statistics_manager.summarize(self.data)
 
             # Display the statistics in a dialog
             # Create a message box to show the statistics summary
@@ -219,68 +573,387 @@ class DataReviewPage(QWidget):
         else:
             self.data_label.setText("No data ")
 
+    # Method: show_confidence_intervals
+    # Description:
+    # Compute bootstrap confidence intervals of the mean radial error, VE and BVE of every participant
+    # and block of the loaded trials in the background.
+    # Input: None
+    # Output: None
+    def show_confidence_intervals(self):
+        groups = self.landing_groups() if self.results_offset is not None or self.aggregate is not None else None
+        if groups is None:
+            self.data_label.setText("Load a results file to compute confidence intervals.")
+            return
+        if self.bootstrap_future is not None:
+            return
+        participants, participant_names, blocks = groups
+        replicates = self.parent.settings_manager.get("bootstrap_replicates") if self.parent else 10000
+        self.bootstrap_future = self.statistics_executor.submit(
+            self.statistics_manager.bootstrap, self.data["Z-Axis"].to_numpy(), self.data["Y-Axis"].to_numpy(),
+            self.data["X-Axis"].to_numpy(), participants, blocks, participant_names, replicates
+        )
+        self.intervals_button.setEnabled(False)
+        self.data_label.setText(f"Computing confidence intervals ({replicates} bootstrap replicates)...")
+        self.bootstrap_timer.start()
+
+    # Method: check_confidence_intervals
+    # Description:
+    # Show the confidence intervals in a dialog once the bootstrap has finished.
+    # Input: None
+    # Output: None
+    def check_confidence_intervals(self):
+        if not self.bootstrap_future.done():
+            return
+        self.bootstrap_timer.stop()
+        self.intervals_button.setEnabled(True)
+        try:
+            text = self.statistics_manager.format_bootstrap(self.bootstrap_future.result())
+        except Exception as e:
+            # Any error of the worker (including a broken process pool) is reported instead of escaping the timer
+            self.data_label.setText(f"Error computing confidence intervals: {str(e)}")
+            return
+        finally:
+            self.bootstrap_future = None
+        self.data_label.setText("Confidence intervals computed.")
+
+        # Display the intervals in a dialog with a text box that can be copied from
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Confidence Intervals")
+        dialog.resize(1000, 600)
+        dialog_layout = QVBoxLayout(dialog)
+        text_box = QPlainTextEdit(text)
+        text_box.setReadOnly(True)
+        text_box.setLineWrapMode(QPlainTextEdit.NoWrap)
+        text_box.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        dialog_layout.addWidget(text_box)
+        dialog.exec_()
+
     # Method: show_graphs
     # Description:
-    # Generate and display graphs for the Z-Axis, Y-Axis, and X-Axis data.
+    # Show or hide the graphs of the Z-Axis, Y-Axis, and X-Axis data on the page.
+    # While they are shown, trials added to the results file are plotted as they arrive.
     # Input: None
     # Output: None
 
     def show_graphs(self):
-        if self.data is not None:
-            # Plot Z-Axis
-            plt.figure()
-            plt.plot(self.data["Image Trial"], self.data["Z-Axis"], marker="o", label="Z-Axis")
-            plt.xlabel("Image Trial")
-            plt.ylabel("Z-Axis")
-            plt.title("Z-Axis vs. Image Trial")
-            plt.legend()
-            plt.grid(True)
-
-            # Plot Y-Axis
-            plt.figure()
-            plt.plot(self.data["Image Trial"], self.data["Y-Axis"], marker="o", label="Y-Axis", color="green")
-            plt.xlabel("Image Trial")
-            plt.ylabel("Y-Axis")
-            plt.title("Y-Axis vs. Image Trial")
-            plt.legend()
-            plt.grid(True)
-
-            # Plot X-Axis
-            plt.figure()
-            plt.plot(self.data["Image Trial"], self.data["X-Axis"], marker="o", label="X-Axis", color="red")
-            plt.xlabel("Image Trial")
-            plt.ylabel("X-Axis")
-            plt.title("X-Axis vs. Image Trial")
-            plt.legend()
-            plt.grid(True)
-
-            plt.show()
+        if self.plot_canvas is not None and self.plot_canvas.isVisible():
+            self.plot_canvas.hide()
+            self.graphs_button.setText("Show Graphs")
+            self.update_plot_timer()
+        elif self.data is not None:
+            if self.plot_canvas is None:
+                from plot_interface import TrialPlotCanvas  # matplotlib is only loaded when graphs are shown
+                self.plot_canvas = TrialPlotCanvas(self)
+                self.plot_layout.addWidget(self.plot_canvas)
+            self.plot_canvas.set_series(self.data["Image Trial"], self.data[["Z-Axis", "Y-Axis", "X-Axis"]])
+            self.plot_canvas.show()
+            self.graphs_button.setText("Hide Graphs")
+            self.update_plot_timer()
         else:
             self.data_label.setText("No data loaded to generate graphs.")
 
+    # Method: refresh_plots
+    # Description:
+    # Add the trials appended to the results file since the last read to the table and the graphs.
+    # The whole file is read again if it was rewritten (for example after an undo).
+    # Input: None
+    # Output: None
+
+    def refresh_plots(self):
+        if self.results_offset is None or self.file_path is None:
+            return
+        try:
+            file_stat = os.stat(self.file_path)
+            if file_stat.st_ino != self.results_file_id or file_stat.st_size < self.results_offset:
+                self.read_and_display_data(self.file_path)
+                return
+            if file_stat.st_size == self.results_offset:
+                return
+            rows, self.results_offset = self.file_manager.read_new_axis_data(self.file_path, self.results_offset)
+        except OSError as e:
+            self.data_label.setText(f"Error reading file: {str(e)}")
+            return
+        if not rows:
+            return
+
+        # New trials after the last loaded trial are appended; repeated or earlier trials reorder the data
+        first_row = len(self.data)
+        last_trial = self.data["Image Trial"].iloc[-1] if first_row else None
+        self.trial_store.load_results(rows)
+        self.data = self.trial_store.to_dataframe()
+        if len(self.data) == first_row + len(rows) and (last_trial is None or rows[0][0] > last_trial):
+            self.fill_table(first_row)
+            new_data = self.data.iloc[first_row:]
+            if self.plot_canvas is not None:
+                self.plot_canvas.append(new_data["Image Trial"], new_data[["Z-Axis", "Y-Axis", "X-Axis"]])
+        else:
+            self.fill_table()
+            if self.plot_canvas is not None:
+                self.plot_canvas.set_series(self.data["Image Trial"], self.data[["Z-Axis", "Y-Axis", "X-Axis"]])
+        if self.landing_canvas is not None and self.landing_canvas.isVisible():
+            self.update_landing_filters()
+
+    # Method: update_plot_timer
+    # Description:
+    # Follow the results file while the graphs or the landing map are shown.
+    # Input: None
+    # Output: None
+
+    def update_plot_timer(self):
+        if any(canvas is not None and canvas.isVisible() for canvas in (self.plot_canvas, self.landing_canvas)):
+            self.plot_timer.start()
+        else:
+            self.plot_timer.stop()
+
+    # Method: show_landing_map
+    # Description:
+    # Show or hide the landing positions of the loaded trials over the 9x9 grid, with filters by
+    # participant and block.
+    # Input: None
+    # Output: None
+
+    def show_landing_map(self):
+        if self.landing_canvas is not None and self.landing_canvas.isVisible():
+            self.landing_canvas.hide()
+            self.participant_filter.hide()
+            self.block_filter.hide()
+            self.landing_button.setText("Landing Map")
+            self.update_plot_timer()
+        elif self.data is not None and (self.results_offset is not None or self.aggregate is not None):
+            if self.landing_canvas is None:
+                from plot_interface import LandingPlotCanvas  # matplotlib is only loaded when the map is shown
+                self.landing_canvas = LandingPlotCanvas(self, self.landing_density_manager.extent)
+                self.landing_canvas.region_selected.connect(self.handle_landing_selection)
+                self.plot_layout.addWidget(self.landing_canvas)
+            self.landing_canvas.show()
+            self.participant_filter.show()
+            self.block_filter.show()
+            self.landing_button.setText("Hide Landing Map")
+            self.update_landing_filters()
+            self.update_plot_timer()
+        else:
+            self.data_label.setText("Load a results file to show the landing map.")
+
+    # Method: landing_groups
+    # Description:
+    # Get the participant and block of every loaded trial. The participant is the session folder name
+    # (or the participant of the aggregate record) and blocks are consecutive runs of trials of the length set in the settings.
+    # In an aggregate the blocks of a participant are numbered across its sessions, so no block pools sessions.
+    # Input: None
+    # Output: (participants, participant_names, blocks) - array with the participant of every trial as an
+    #         index in participant_names, the participant names and an array of block numbers (from 1),
+    #         or None when no results file or aggregate is loaded
+
+    def landing_groups(self):
+        if self.data is None or (self.aggregate is None and self.file_path is None):
+            return None
+        trials_per_block = self.parent.settings_manager.get("trials_per_block") if self.parent else 10
+        blocks = (self.data["Image Trial"].to_numpy() - 1) // max(1, int(trials_per_block)) + 1
+        if self.aggregate is not None:
+            return (self.aggregate.participant_codes(*self.aggregate_range), self.aggregate.participants,
+                    self.aggregate.number_blocks(*self.aggregate_range, blocks))
+        participant = os.path.basename(os.path.dirname(os.path.dirname(self.file_path)))
+        return np.zeros(len(self.data), dtype=np.int32), [participant], blocks
+
+    # Method: update_landing_filters
+    # Description:
+    # Fill the participant and block filters with the groups of the loaded trials, keeping the
+    # current selection when it still exists, and redraw the landing map.
+    # Input: None
+    # Output: None
+
+    def update_landing_filters(self):
+        groups = self.landing_groups()
+        if groups is None:
+            self.data_label.setText("Load a results file to show the landing map.")
+            return
+        participants, participant_names, blocks = groups
+        for combo, all_text, options in (
+            (self.participant_filter, "All participants",
+             sorted(participant_names[code] for code in np.unique(participants).tolist())),
+            (self.block_filter, "All blocks", [f"Block {block}" for block in np.unique(blocks).tolist()]),
+        ):
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems([all_text] + options)
+            combo.setCurrentIndex(max(0, combo.findText(current)))
+            combo.blockSignals(False)
+        self.update_landing_map()
+
+    # Method: update_landing_map
+    # Description:
+    # Draw the landing positions of the selected participant and block. Small selections are drawn as a
+    # scatter; large ones as a density built from the cached bins, so changing the filter does not bin
+    # the trials again.
+    # Input: None
+    # Output: None
+
+    def update_landing_map(self):
+        if self.landing_canvas is None or not self.landing_canvas.isVisible():
+            return
+        groups = self.landing_groups()
+        if groups is None:
+            return
+        participants, participant_names, blocks = groups
+        participant = None
+        if self.participant_filter.currentIndex() > 0 and self.participant_filter.currentText() in participant_names:
+            participant = participant_names.index(self.participant_filter.currentText())
+        block = int(self.block_filter.currentText().split()[-1]) if self.block_filter.currentIndex() > 0 else None
+
+        horizontal = self.data["Y-Axis"].to_numpy()
+        vertical = self.data["X-Axis"].to_numpy()
+        mask = np.ones(len(self.data), dtype=bool)
+        if participant is not None:
+            mask &= participants == participant
+        if block is not None:
+            mask &= blocks == block
+
+        # Index the shown positions so clicks and lassos on the map find their trials quickly
+        self.landing_rows = np.flatnonzero(mask)
+        self.landing_index = SpatialIndex(horizontal[mask], vertical[mask])
+        self.update_landing_selection()
+
+        # Draw the shown trials as points when there are few of them, even if the whole dataset is large
+        if len(self.landing_rows) <= self.scatter_limit:
+            self.landing_canvas.show_positions(horizontal[mask], vertical[mask])
+            return
+
+        source_key = (self.file_path, self.results_file_id, self.results_offset,
+                      self.parent.settings_manager.get("trials_per_block") if self.parent else 10)
+        if self.aggregate is not None:
+            source_key = (self.aggregate.folder_path, self.aggregate_range) + source_key[3:]
+        groups, counts = self.landing_density_manager.get_bins(source_key, horizontal, vertical, participants, blocks)
+
+        def is_selected(key):
+            return (participant is None or key[0] == participant) and (block is None or key[1] == block)
+
+        density = self.landing_density_manager.density(groups, counts, is_selected)
+        trial_count = int(counts[np.array([is_selected(key) for key in groups], dtype=bool)].sum())
+        self.landing_canvas.show_density(density, self.landing_density_manager.image_extent(), trial_count)
+
     # Method: export_data
     # Description:
-    # Export the data to Excel or CSV.
+    # Export the data to Excel, CSV or Parquet in the background.
+    # Rows are streamed from the results file (or from the comparison table) and written chunk by chunk.
     # Input: None
     # Output: None
 
     def export_data(self):
-        """Export the data to Excel or CSV."""
-        if self.data is not None:
-            save_path, _ = QFileDialog.getSaveFileName(
-                self, "Save File", os.path.expanduser("~"),
-                "Excel Files (*.xlsx);;CSV Files (*.csv)"
-            )
-            if save_path:
-                if save_path.endswith(".xlsx"):
-                    self.data.to_excel(save_path, index=False)
-                elif save_path.endswith(".csv"):
-                    self.data.to_csv(save_path, index=False)
-                else:
-                    self.data_label.setText("Invalid file format selected.")
-                self.data_label.setText(f"Data exported to: {save_path}")
-        else:
+        """Export the data to Excel, CSV or Parquet."""
+        if self.data is None:
             self.data_label.setText("No data to export.")
+            return
+        if self.export_future is not None:
+            self.data_label.setText("An export is already running.")
+            return
+        save_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save File", os.path.expanduser("~"),
+            "Excel Files (*.xlsx);;CSV Files (*.csv);;Parquet Files (*.parquet)"
+        )
+        if not save_path:
+            return
+        # Add the extension of the selected format if the dialog did not
+        if not os.path.splitext(save_path)[1] and "(*." in selected_filter:
+            save_path += selected_filter.split("(*")[1].rstrip(")")
+        if not save_path.lower().endswith((".xlsx", ".csv", ".parquet")):
+            self.data_label.setText("Invalid file format selected.")
+            return
+
+        if self.aggregate is not None:
+            # Stream the records of the shown range of the aggregate, one source per participant
+            sources = []
+            start, stop = self.aggregate_range
+            for participant_index, participant in enumerate(self.aggregate.participants):
+                entries = [entry for entry in self.aggregate.sessions if entry["participant"] == participant_index]
+                first, last = max(start, entries[0]["start"]), min(stop, entries[-1]["stop"])
+                if first < last:
+                    sources.append(ExportSource(participant, self.aggregate.iter_rows(first, last), last - first))
+        elif self.results_offset is not None:
+            # Stream the rows of the loaded results file; the participant is the session folder
+            participant = os.path.basename(os.path.dirname(os.path.dirname(self.file_path)))
+            sources = [ExportSource(participant, self.file_manager.iter_axis_data(self.file_path),
+                                    os.path.getsize(self.file_path))]
+        else:
+            # Comparison results only exist in the table
+            chunk_size = 10000
+            data = self.data
+            chunks = ((list(data.iloc[start:start + chunk_size].itertuples(index=False, name=None)),
+                       min(start + chunk_size, len(data)))
+                      for start in range(0, len(data), chunk_size))
+            sources = [ExportSource("Comparison", chunks, len(data))]
+
+        self.export_progress = 0.0
+        self.export_path = save_path
+        self.export_future = self.export_executor.submit(
+            self.export_manager.export, sources, save_path, self.set_export_progress
+        )
+        self.export_progress_bar.setValue(0)
+        self.export_progress_bar.show()
+        self.export_button.setEnabled(False)
+        self.data_label.setText(f"Exporting data to: {save_path}")
+        self.export_timer.start()
+
+    # Method: set_export_progress
+    # Description:
+    # Record the export progress (called from the worker thread).
+    # Input: fraction - fraction of the export done
+    # Output: None
+
+    def set_export_progress(self, fraction):
+        self.export_progress = fraction
+
+    # Method: check_export
+    # Description:
+    # Update the export progress bar and report the result when the export is finished.
+    # Input: None
+    # Output: None
+
+    def check_export(self):
+        self.export_progress_bar.setValue(int(self.export_progress * 100))
+        if not self.export_future.done():
+            return
+        self.export_timer.stop()
+        self.export_progress_bar.hide()
+        self.export_button.setEnabled(True)
+        try:
+            row_count = self.export_future.result()
+            self.data_label.setText(f"Exported {row_count} rows to: {self.export_path}")
+        except ImportError as e:
+            self.data_label.setText(f"Export needs an optional package that is not installed: {e.name}")
+        except Exception as e:
+            # Writer errors (e.g. xlsxwriter's FileCreateError when the file is open in Excel) are not
+            # OSErrors; none may escape this timer slot
+            self.data_label.setText(f"Error exporting data: {str(e)}")
+        finally:
+            self.export_future = None
+
+    # Method: toggle_job_status
+    # Description:
+    # Show the job queue status and poll it periodically, or stop polling and hide it.
+    # Input: checked - True to show the job status
+    # Output: None
+    def toggle_job_status(self, checked):
+        if checked:
+            if self.job_queue is None:
+                self.job_queue = JobQueue()
+            self.refresh_job_status()
+            self.job_status_label.show()
+            self.job_timer.start()
+        else:
+            self.job_timer.stop()
+            self.job_status_label.hide()
+
+    # Method: refresh_job_status
+    # Description:
+    # Read the job queue and display a summary of the jobs.
+    # Input: None
+    # Output: None
+    def refresh_job_status(self):
+        try:
+            self.job_status_label.setText(self.job_queue.status_summary(limit=5))
+        except OSError as e:
+            self.job_status_label.setText(f"Error reading job queue: {str(e)}")
 
     def go_to_main_menu(self):
         """Go back to the main menu."""
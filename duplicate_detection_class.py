@@ -0,0 +1,141 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: duplicate_detection_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the duplicate detector, which finds images that were taken twice
+# (for example when the camera double-fires) before they shift the trial numbering. The camera does not
+# move between trials, so perceptual hashes of whole images barely change when only the puck moves.
+# Instead each image is reduced to a 64x48 grayscale thumbnail, which is fine enough to show the 2 cm
+# puck, and compared pixel by pixel with the image before it. The difference to the previous image is
+# cached in the folder manifest together with the content hash of that image.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt
+from manifest_class import ManifestManager
+
+THUMBNAIL_WIDTH = 64  # Size of the thumbnails that are compared, in pixels
+THUMBNAIL_HEIGHT = 48
+
+# Class: DuplicateDetector
+# Description:
+# This class provides methods to compare the images of a folder with the image before them, cache the
+# differences in the manifest and find near-duplicate images.
+
+class DuplicateDetector:
+    def __init__(self, threshold=16, max_workers=None):
+        self.threshold = threshold  # Largest thumbnail difference (0-255) for two images to count as duplicates
+        self.max_workers = max_workers or os.cpu_count() or 1  # Threads used to load thumbnails
+        self.manifest_manager = ManifestManager()
+
+    # Method: load_thumbnail
+    # Description:
+    # Load an image as a small grayscale thumbnail. Every thumbnail pixel averages many image pixels,
+    # so sensor noise cancels out while the puck still covers whole thumbnail pixels.
+    # Input: image_path - path to the image file
+    # Output: thumbnail - THUMBNAIL_HEIGHT x THUMBNAIL_WIDTH uint8 NumPy array, or None if the image could not be loaded
+    def load_thumbnail(self, image_path):
+        image = QImage(image_path)
+        if image.isNull():
+            return None
+        image = image.scaled(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format_Grayscale8)
+        pointer = image.constBits()
+        pointer.setsize(THUMBNAIL_HEIGHT * image.bytesPerLine())
+        rows = np.frombuffer(pointer, dtype=np.uint8).reshape(THUMBNAIL_HEIGHT, image.bytesPerLine())
+        return rows[:, :THUMBNAIL_WIDTH].copy()
+
+    # Method: compute_differences
+    # Description:
+    # Compare many pairs of thumbnails at once. The difference of a pair is the largest change of a
+    # thumbnail pixel, after removing the typical change so a brightness change of the whole image
+    # (e.g. the exposure of the camera) does not hide a duplicate.
+    # Input: first, second - arrays of shape (N, THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH)
+    # Output: differences - int array of length N
+    def compute_differences(self, first, second):
+        change = first.astype(np.int16) - second.astype(np.int16)
+        change = change.reshape(len(change), -1)
+        change -= np.median(change, axis=1).astype(np.int16)[:, None]
+        return np.abs(change).max(axis=1)
+
+    # Method: update_differences
+    # Description:
+    # Compute the difference between every image and the image before it, for the images whose cached
+    # difference is missing or was computed against another (or a changed) previous image, and save them
+    # in the manifest. Thumbnails are loaded in parallel and all new differences are computed in one
+    # vectorized pass.
+    # Input: folder_path - path to the folder containing images
+    #        results_folder_path - path to the Results folder holding the manifest
+    #        file_names - names of the images, in order
+    #        entries - dictionary of manifest entries keyed by file name
+    # Output: entries - the manifest entries with a "difference" value for every image after the first
+    def update_differences(self, folder_path, results_folder_path, file_names, entries):
+        missing = [index for index in range(1, len(file_names))
+                   if not self.has_difference(file_names, index, entries)]
+        if not missing:
+            return entries
+
+        names = sorted({file_names[index - offset] for index in missing for offset in (0, 1)})
+        paths = [os.path.join(folder_path, name) for name in names]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            thumbnails = dict(zip(names, executor.map(self.load_thumbnail, paths)))
+
+        # Images that could not be loaded are never duplicates
+        loaded = [index for index in missing
+                  if thumbnails[file_names[index]] is not None and thumbnails[file_names[index - 1]] is not None]
+        differences = self.compute_differences(
+            np.stack([thumbnails[file_names[index]] for index in loaded]),
+            np.stack([thumbnails[file_names[index - 1]] for index in loaded])) if loaded else []
+        values = dict(zip(loaded, (int(difference) for difference in differences)))
+        for index in missing:
+            previous_name = file_names[index - 1]
+            entries[file_names[index]]["difference"] = {
+                "previous": previous_name,
+                "previous_hash": entries[previous_name].get("hash"),
+                "value": values.get(index),
+            }
+
+        self.manifest_manager.save_manifest(results_folder_path, entries)
+        return entries
+
+    # Method: has_difference
+    # Description:
+    # Check whether the cached difference of an image was computed against the image now before it.
+    # Input: file_names - names of the images, in order
+    #        index - index of the image in file_names (at least 1)
+    #        entries - dictionary of manifest entries keyed by file name
+    # Output: True if the cached difference can be used
+    def has_difference(self, file_names, index, entries):
+        cached = entries.get(file_names[index], {}).get("difference")
+        previous_name = file_names[index - 1]
+        return (cached is not None and cached.get("previous") == previous_name
+                and cached.get("previous_hash") == entries.get(previous_name, {}).get("hash"))
+
+    # Method: find_consecutive_duplicates
+    # Description:
+    # Find images that are near-duplicates of the image right before them, using the differences
+    # cached by update_differences.
+    # Input: file_names - names of the images, in order
+    #        entries - dictionary of manifest entries keyed by file name
+    # Output: list of indexes i where image i is a near-duplicate of image i - 1
+    def find_consecutive_duplicates(self, file_names, entries):
+        duplicates = []
+        for index in range(1, len(file_names)):
+            if not self.has_difference(file_names, index, entries):
+                continue
+            value = entries[file_names[index]]["difference"]["value"]
+            if value is not None and value <= self.threshold:
+                duplicates.append(index)
+        return duplicates
@@ -0,0 +1,161 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: export_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the export manager, which writes trial data to Excel, CSV or Parquet
+# files chunk by chunk. Rows are streamed from their source (such as a results file) and written right
+# away, so exporting a large study never holds all rows in memory. Excel files get one sheet per
+# participant and are written in xlsxwriter's constant memory mode; CSV and Parquet files get a
+# Participant column. The xlsxwriter and pyarrow packages are only needed for their formats.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import csv
+import os
+import re
+
+EXPORT_COLUMNS = ["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"]
+EXPORT_FORMATS = (".xlsx", ".csv", ".parquet")
+
+# Class: ExportSource
+# Description:
+# One participant's data to export: a name and an iterable of (rows, progress) chunks, where progress is
+# the amount of work done so far in the same unit as total (for example bytes of a results file read).
+
+class ExportSource:
+    def __init__(self, name, chunks, total):
+        self.name = name  # Participant (or dataset) name, used as the sheet name in Excel files
+        self.chunks = chunks  # Iterable of (rows, progress) with rows of [image_index, zaxis, yaxis, xaxis]
+        self.total = total  # Progress value when all chunks are read
+
+# Class: ExportManager
+# Description:
+# This class provides methods to export sources to Excel, CSV or Parquet files.
+
+class ExportManager:
+
+    # Method: export
+    # Description:
+    # Export sources to a file whose format is chosen by its extension.
+    # Input: sources - list of ExportSource
+    #        save_path - path of the file to write (.xlsx, .csv or .parquet)
+    #        progress - function called with the fraction done (0 to 1), or None (default: None)
+    # Output: number of rows exported
+    def export(self, sources, save_path, progress=None):
+        extension = os.path.splitext(save_path)[1].lower()
+        if extension not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid file format selected: {extension or 'no extension'}")
+        writer = {".xlsx": self.write_excel, ".csv": self.write_csv, ".parquet": self.write_parquet}[extension]
+        return writer(sources, save_path, self.progress_tracker(sources, progress))
+
+    # Method: progress_tracker
+    # Description:
+    # Build a function that turns the progress of one source into the fraction done of all sources.
+    # Input: sources - list of ExportSource
+    #        progress - function called with the fraction done, or None
+    # Output: function(source_index, source_progress)
+    def progress_tracker(self, sources, progress):
+        totals = [max(source.total, 1) for source in sources]
+        grand_total = sum(totals)
+
+        def report(source_index, source_progress):
+            if progress is not None:
+                progress((sum(totals[:source_index]) + min(source_progress, totals[source_index])) / grand_total)
+        return report
+
+    # Method: write_excel
+    # Description:
+    # Write one sheet per source with xlsxwriter in constant memory mode (each row is flushed to disk
+    # as soon as the next row is started).
+    # Input: sources - list of ExportSource
+    #        save_path - path of the .xlsx file
+    #        report - function returned by progress_tracker
+    # Output: number of rows exported
+    def write_excel(self, sources, save_path, report):
+        import xlsxwriter
+
+        row_count = 0
+        used_names = set()
+        workbook = xlsxwriter.Workbook(save_path, {"constant_memory": True})
+        try:
+            for source_index, source in enumerate(sources):
+                worksheet = workbook.add_worksheet(self.sheet_name(source.name, used_names))
+                worksheet.write_row(0, 0, EXPORT_COLUMNS)
+                sheet_row = 1
+                for rows, done in source.chunks:
+                    for row in rows:
+                        worksheet.write_row(sheet_row, 0, row)
+                        sheet_row += 1
+                    row_count += len(rows)
+                    report(source_index, done)
+        finally:
+            workbook.close()
+        return row_count
+
+    # Method: write_csv
+    # Description:
+    # Write all sources to one CSV file, chunk by chunk, with a Participant column.
+    # Input: sources - list of ExportSource
+    #        save_path - path of the .csv file
+    #        report - function returned by progress_tracker
+    # Output: number of rows exported
+    def write_csv(self, sources, save_path, report):
+        row_count = 0
+        with open(save_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Participant"] + EXPORT_COLUMNS)
+            for source_index, source in enumerate(sources):
+                for rows, done in source.chunks:
+                    writer.writerows([source.name] + list(row) for row in rows)
+                    row_count += len(rows)
+                    report(source_index, done)
+        return row_count
+
+    # Method: write_parquet
+    # Description:
+    # Write all sources to one Parquet file, one row group per chunk, with a Participant column.
+    # Input: sources - list of ExportSource
+    #        save_path - path of the .parquet file
+    #        report - function returned by progress_tracker
+    # Output: number of rows exported
+    def write_parquet(self, sources, save_path, report):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([("Participant", pa.string()), ("Image Trial", pa.int64()), ("Z-Axis", pa.float64()),
+                            ("Y-Axis", pa.float64()), ("X-Axis", pa.float64())])
+        row_count = 0
+        with pq.ParquetWriter(save_path, schema) as writer:
+            for source_index, source in enumerate(sources):
+                for rows, done in source.chunks:
+                    if rows:
+                        columns = list(zip(*rows))
+                        writer.write_table(pa.table([[source.name] * len(rows)] + [list(column) for column in columns],
+                                                    schema=schema))
+                    row_count += len(rows)
+                    report(source_index, done)
+        return row_count
+
+    # Method: sheet_name
+    # Description:
+    # Make a valid, unique Excel sheet name (at most 31 characters, without []:*?/\).
+    # Input: name - wanted sheet name
+    #        used_names - set of the lower-case names already used, updated with the new name
+    # Output: sheet name
+    def sheet_name(self, name, used_names):
+        base_name = re.sub(r"[\[\]:*?/\\]", "_", str(name)).strip("'")[:31] or "Sheet"
+        sheet_name = base_name
+        suffix = 2
+        while sheet_name.lower() in used_names:
+            sheet_name = f"{base_name[:31 - len(str(suffix)) - 1]}_{suffix}"
+            suffix += 1
+        used_names.add(sheet_name.lower())
+        return sheet_name
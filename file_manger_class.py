@@ -17,6 +17,8 @@
 
 # Import necessary libraries
 import os
+import csv
+from instrumentation_class import monitor
 
 # Class: FileManager
 # Description:
@@ -39,6 +41,16 @@ class FileManager:
             os.makedirs(target_path, exist_ok=True)
             self.created_folders.add(target_path)
         return target_path
+
+    # Method: create_app_data_folder
+    # Description:
+    # Create the application data folder in the user's home directory if it doesn't exist and return the path.
+    # This folder holds data shared between sessions, such as saved calibration profiles.
+    # Input: folder_name - Name of the application data folder (default: ".sfsu_image_editor")
+    # Output: target_path - Path to the application data folder
+
+    def create_app_data_folder(self, folder_name=".sfsu_image_editor"):
+        return self.create_folder(os.path.expanduser("~"), folder_name=folder_name)
     
     # Method: create_text_file
     # Description:
@@ -68,16 +80,272 @@ class FileManager:
     #        xaxis - X-axis value
     # Output: None
     
+    @monitor.timed("results_io.append_axis_data")
     def append_axis_data(self, file_path, image_index, zaxis, yaxis, xaxis):
         if not os.path.exists(file_path):
             with open(file_path, "w") as file:
                 # Header with column names
-                file.write(f"{'Image Index':<15}{'Z-Axis':<15}{'Y-Axis':<15}{'X-Axis':<15}\n")
-                file.write("=" * 60 + "\n")  # Separator line
+                file.write(self.format_axis_header())
 
         with open(file_path, "a") as file:
             # Append the data with labels
-            file.write(f"Image Trial: {image_index:<10} Z-Axis: {zaxis:<10.2f} Y-Axis: {yaxis:<10.2f} X-Axis: {xaxis:<10.2f}\n")
+            file.write(self.format_axis_line(image_index, zaxis, yaxis, xaxis))
+
+    # Method: write_axis_data
+    # Description:
+    # Write a complete results file (header and all rows) in one pass, replacing any existing file.
+    # Input: file_path - Path to the text file
+    #        rows - Iterable of (image_index, zaxis, yaxis, xaxis) tuples
+    # Output: None
+
+    @monitor.timed("results_io.write_axis_data")
+    def write_axis_data(self, file_path, rows):
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            file.write(self.format_axis_header())
+            file.writelines(self.format_axis_line(*row) for row in rows)
+        os.replace(temp_path, file_path)
+
+    # Method: format_axis_header
+    # Description:
+    # Build the header of a results file.
+    # Input: None
+    # Output: header - Column names and separator line
+
+    def format_axis_header(self):
+        return f"{'Image Index':<15}{'Z-Axis':<15}{'Y-Axis':<15}{'X-Axis':<15}\n" + "=" * 60 + "\n"
+
+    # Method: format_axis_line
+    # Description:
+    # Build the results file line of one trial.
+    # Input: image_index - Index of the image trial
+    #        zaxis, yaxis, xaxis - Axis values
+    # Output: line - Formatted line ending with a newline
+
+    def format_axis_line(self, image_index, zaxis, yaxis, xaxis):
+        return f"Image Trial: {image_index:<10} Z-Axis: {zaxis:<10.2f} Y-Axis: {yaxis:<10.2f} X-Axis: {xaxis:<10.2f}\n"
+
+    # Method: replace_axis_data
+    # Description:
+    # Replace, insert or remove the line of a single trial in a results file.
+    # Lines of other trials are kept as they are, and a new line is inserted in trial order.
+    # Input: file_path - Path to the text file
+    #        image_index - Index of the image trial
+    #        values - (zaxis, yaxis, xaxis) to write, or None to remove the trial
+    # Output: None
+
+    @monitor.timed("results_io.replace_axis_data")
+    def replace_axis_data(self, file_path, image_index, values):
+        lines = []
+        if os.path.exists(file_path):
+            with open(file_path, "r") as file:
+                lines = file.readlines()
+        if not lines:
+            lines = self.format_axis_header().splitlines(keepends=True)
+
+        new_line = self.format_axis_line(image_index, *values) if values is not None else None
+        insert_at = len(lines)
+        for line_index, line in enumerate(lines):
+            if not line.startswith("Image Trial:"):
+                continue
+            try:
+                trial = int(line.split()[2])
+            except (IndexError, ValueError):
+                continue
+            if trial == image_index:
+                lines[line_index:line_index + 1] = [new_line] if new_line else []
+                break
+            if trial > image_index and insert_at == len(lines):
+                insert_at = line_index
+        else:
+            if new_line:
+                lines.insert(insert_at, new_line)
+
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            file.writelines(lines)
+        os.replace(temp_path, file_path)
+
+    # Method: read_axis_data
+    # Description:
+    # Read the trial rows of a results file. Headers, separator lines and malformed lines are skipped.
+    # Input: file_path - Path to the text file
+    # Output: data - List of [image_index, zaxis, yaxis, xaxis] rows
+
+    @monitor.timed("results_io.read_axis_data")
+    def read_axis_data(self, file_path):
+        data = []
+        with open(file_path, "r") as file:
+            for line in file:
+                row = self.parse_axis_line(line)
+                if row is not None:
+                    data.append(row)
+        return data
+
+    # Method: read_new_axis_data
+    # Description:
+    # Read the trial rows appended to a results file since a byte offset, so a file that is still being
+    # written can be followed without reading it again. A last line without a newline is left for the next call.
+    # Input: file_path - Path to the text file
+    #        offset - Byte offset where the previous read stopped (default: 0)
+    # Output: (data, offset) - List of [image_index, zaxis, yaxis, xaxis] rows and the offset to continue from
+
+    @monitor.timed("results_io.read_new_axis_data")
+    def read_new_axis_data(self, file_path, offset=0):
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            chunk = file.read()
+        end = chunk.rfind(b"\n") + 1
+        data = []
+        for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            row = self.parse_axis_line(line)
+            if row is not None:
+                data.append(row)
+        return data, offset + end
+
+    # Method: iter_axis_data
+    # Description:
+    # Read the trial rows of a results file in chunks, so large files can be processed without holding
+    # all rows in memory.
+    # Input: file_path - Path to the text file
+    #        chunk_size - Number of rows per chunk (default: 10000)
+    # Output: generator of (rows, bytes_read) - List of [image_index, zaxis, yaxis, xaxis] rows and the
+    #         number of bytes of the file read so far
+
+    def iter_axis_data(self, file_path, chunk_size=10000):
+        rows = []
+        bytes_read = 0
+        with open(file_path, "rb") as file:
+            for line in file:
+                bytes_read += len(line)
+                row = self.parse_axis_line(line.decode("utf-8", errors="replace"))
+                if row is not None:
+                    rows.append(row)
+                    if len(rows) >= chunk_size:
+                        yield rows, bytes_read
+                        rows = []
+        yield rows, bytes_read
+
+    # Method: parse_axis_line
+    # Description:
+    # Parse one line of a results file.
+    # Input: line - Line of the text file
+    # Output: row - [image_index, zaxis, yaxis, xaxis], or None if the line is not a trial row
+
+    def parse_axis_line(self, line):
+        line = line.strip()  # Remove leading/trailing whitespace
+        # Extract the data from a well-structured line
+        if not line.startswith("Image Trial:"):
+            return None
+        try:
+            trial = line.split("Image Trial:")[1].split()[0]
+            z_axis = line.split("Z-Axis:")[1].split()[0]
+            y_axis = line.split("Y-Axis:")[1].split()[0]
+            x_axis = line.split("X-Axis:")[1].split()[0]
+            return [int(trial), float(z_axis), float(y_axis), float(x_axis)]
+        except (IndexError, ValueError):
+            return None
+
+    # Method: append_click_data
+    # Description:
+    # Append the points clicked for a trial to a CSV file, so the trial can be reprocessed later
+    # without clicking it again.
+    # Input: file_path - Path to the CSV file
+    #        image_index - Index of the image trial
+    #        image_name - File name of the image
+    #        center_point - (x, y) of the center point on the image
+    #        puck_point - (x, y) of the puck on the image
+    # Output: None
+
+    @monitor.timed("results_io.append_click_data")
+    def append_click_data(self, file_path, image_index, image_name, center_point, puck_point):
+        write_header = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        with open(file_path, "a", newline="") as file:
+            writer = csv.writer(file)
+            if write_header:
+                writer.writerow(["trial", "image", "center_x", "center_y", "puck_x", "puck_y"])
+            writer.writerow(self.format_click_row(image_index, image_name, center_point, puck_point))
+
+    # Method: write_click_data
+    # Description:
+    # Write a complete clicks CSV file (header and all rows) in one pass, replacing any existing file.
+    # Input: file_path - Path to the CSV file
+    #        rows - Iterable of (image_index, image_name, center_point, puck_point) tuples
+    # Output: None
+
+    @monitor.timed("results_io.write_click_data")
+    def write_click_data(self, file_path, rows):
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["trial", "image", "center_x", "center_y", "puck_x", "puck_y"])
+            writer.writerows(self.format_click_row(*row) for row in rows)
+        os.replace(temp_path, file_path)
+
+    # Method: format_click_row
+    # Description:
+    # Build the clicks CSV row of one trial. A missing center point is written as empty columns.
+    # Input: image_index - Index of the image trial
+    #        image_name - File name of the image
+    #        center_point - (x, y) of the center point, or None
+    #        puck_point - (x, y) of the puck
+    # Output: row - List of column values
+
+    def format_click_row(self, image_index, image_name, center_point, puck_point):
+        center_columns = [f"{center_point[0]:.3f}", f"{center_point[1]:.3f}"] if center_point else ["", ""]
+        return [str(image_index), image_name] + center_columns + [f"{puck_point[0]:.3f}", f"{puck_point[1]:.3f}"]
+
+    # Method: replace_click_data
+    # Description:
+    # Replace, insert or remove the clicked points of a single trial in a clicks CSV file.
+    # Rows of other trials are kept as they are, and a new row is inserted in trial order.
+    # Input: file_path - Path to the CSV file
+    #        image_index - Index of the image trial
+    #        click - (image_name, center_point, puck_point) to write, or None to remove the trial
+    # Output: None
+
+    @monitor.timed("results_io.replace_click_data")
+    def replace_click_data(self, file_path, image_index, click):
+        rows = []
+        if os.path.exists(file_path):
+            with open(file_path, "r", newline="") as file:
+                rows = list(csv.reader(file))
+        header = rows[0] if rows else ["trial", "image", "center_x", "center_y", "puck_x", "puck_y"]
+        rows = [row for row in rows[1:] if row and row[0] != str(image_index)]
+
+        if click is not None:
+            new_row = self.format_click_row(image_index, *click)
+            insert_at = next((row_index for row_index, row in enumerate(rows)
+                              if row[0].isdigit() and int(row[0]) > image_index), len(rows))
+            rows.insert(insert_at, new_row)
+
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w", newline="") as file:
+            csv.writer(file).writerows([header] + rows)
+        os.replace(temp_path, file_path)
+
+    # Method: read_click_data
+    # Description:
+    # Read the points clicked for each trial from a CSV file.
+    # The center columns may be empty, in which case the center point comes from the calibration profile.
+    # Input: file_path - Path to the CSV file
+    # Output: clicks - List of dictionaries with trial, image, center_point and puck_point
+
+    @monitor.timed("results_io.read_click_data")
+    def read_click_data(self, file_path):
+        clicks = []
+        with open(file_path, "r", newline="") as file:
+            for row in csv.DictReader(file):
+                center_point = None
+                if row.get("center_x") and row.get("center_y"):
+                    center_point = (float(row["center_x"]), float(row["center_y"]))
+                clicks.append({
+                    "trial": int(row["trial"]),
+                    "image": row.get("image", ""),
+                    "center_point": center_point,
+                    "puck_point": (float(row["puck_x"]), float(row["puck_y"])),
+                })
+        return clicks
     
     # Method: remove_last_line
     # Description:
@@ -85,6 +353,7 @@ class FileManager:
     # Input: file_path - Path to the file where the last line should be removed
     # Output: None
 
+    @monitor.timed("results_io.remove_last_line")
     def remove_last_line(self, file_path):
         with open(file_path, "r") as file:
             lines = file.readlines()
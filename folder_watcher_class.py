@@ -0,0 +1,121 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: folder_watcher_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the folder watcher, which watches a session folder while data is being
+# collected and reports new images as the camera writes them. Change notifications come from
+# QFileSystemWatcher (inotify on Linux), and the folder is also polled with os.scandir so folders on
+# network shares, where notifications are not delivered, are still picked up.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from manifest_class import ManifestManager
+
+# Class: FolderWatcher
+# Description:
+# This class watches a folder and emits the images_added signal with the paths of new image files.
+# A file is only reported once its size has stopped changing between two scans, so images that
+# the camera is still writing are not opened half finished.
+
+class FolderWatcher(QObject):
+    images_added = pyqtSignal(list)  # Signal emitted with the paths of new images
+
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    # Constructor
+    # Initializes the file system watcher and the polling timer.
+    # Input: poll_interval - milliseconds between folder scans (default: 1000)
+    def __init__(self, poll_interval=1000):
+        super().__init__()
+        self.folder_path = None  # Folder being watched
+        self.known_paths = set()  # Images already reported or already in the image list
+        self.pending_sizes = {}  # Size of new files seen in the last scan, keyed by path
+        self.sort_key = None  # Sort key of the paths of new images reported together
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.scan)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval)
+        self.poll_timer.timeout.connect(self.scan)
+
+    # Method: start
+    # Description:
+    # Start watching a folder. Images in known_paths are not reported again.
+    # Input: folder_path - path to the folder to watch
+    #        known_paths - paths of images already in the image list
+    #        sort_key - sort key of the paths of new images reported together, or None for natural
+    #                   file name order (default: None)
+    # Output: None
+    def start(self, folder_path, known_paths, sort_key=None):
+        self.stop()
+        self.folder_path = folder_path
+        self.sort_key = sort_key or (lambda path: ManifestManager.natural_sort_key(os.path.basename(path)))
+        self.known_paths = {os.path.normpath(path) for path in known_paths}
+        self.pending_sizes = {}
+        self.watcher.addPath(folder_path)
+        self.poll_timer.start()
+
+    # Method: stop
+    # Description:
+    # Stop watching the current folder.
+    # Input: None
+    # Output: None
+    def stop(self):
+        self.poll_timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.folder_path = None
+
+    # Method: is_active
+    # Description:
+    # Check whether a folder is being watched.
+    # Input: None
+    # Output: True if a folder is being watched
+    def is_active(self):
+        return self.folder_path is not None
+
+    # Method: scan
+    # Description:
+    # Scan the folder with os.scandir and emit images_added for new images whose size is stable.
+    # Input: None
+    # Output: None
+    def scan(self, *args):
+        if self.folder_path is None:
+            return
+
+        new_paths = []
+        current_sizes = {}
+        try:
+            with os.scandir(self.folder_path) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(self.IMAGE_EXTENSIONS):
+                        continue
+                    path = os.path.normpath(entry.path)
+                    if path in self.known_paths or not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                    # Report the file once it has the same non-zero size in two scans
+                    if size > 0 and self.pending_sizes.get(path) == size:
+                        new_paths.append(path)
+                    else:
+                        current_sizes[path] = size
+        except OSError:
+            return
+
+        self.pending_sizes = current_sizes
+
+        if new_paths:
+            new_paths.sort(key=self.sort_key)
+            self.known_paths.update(new_paths)
+            self.images_added.emit(new_paths)
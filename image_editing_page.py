@@ -21,16 +21,31 @@
 # Import necessary libraries
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtGui import QPixmap, QImage, QKeySequence
 from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSignal
 from calculation_class import CalculationsManager
 from file_manger_class import FileManager
 from image_interface import ImageView
+from registration_class import RegistrationManager
+from calibration_profile_class import CalibrationProfileManager
+from folder_watcher_class import FolderWatcher
+from manifest_class import ManifestManager
+from duplicate_detection_class import DuplicateDetector
+from session_state_class import SessionStateManager
+from shard_merge import ShardManager
+from annotation_history_class import (
+    AnnotationHistory, SetCenterCommand, CommitTrialCommand, SkipTrialCommand, FlagTrialCommand
+)
 import os
 import math
+import time
+from datetime import datetime
+from instrumentation_class import monitor
+from trial_store_class import TrialStore, FLAG_SAVED, FLAG_SKIPPED, FLAG_FLAGGED
 from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QLineEdit, QMessageBox
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem, QHBoxLayout, QFileDialog
+from PyQt5.QtWidgets import QCheckBox, QSpinBox, QShortcut, QInputDialog
 
 
 # Class: EditPage
@@ -49,6 +64,12 @@ class EditPage(QWidget):
         # Initialize the file manager and calculations manager objects
         self.file_manager = FileManager()
         self.calculations_manager = CalculationsManager()
+        self.registration_manager = RegistrationManager()
+        self.profile_manager = CalibrationProfileManager()
+        self.manifest_manager = ManifestManager()
+        self.duplicate_detector = DuplicateDetector()
+        self.session_state_manager = SessionStateManager()
+        self.shard_manager = ShardManager()
 
         # Initialize the class attributes
 
@@ -62,12 +83,26 @@ class EditPage(QWidget):
         self.clicked_points = []  # List to store the clicked points on the image
         self.result_file_path = None # Store the path to the result file
         self.result_folder_path = None # Store the path to the result folder
+        self.click_time = 0.0 # Time of the last click, for the click-to-commit latency
         self.information_file_path = None # Store the path to the information file
+        self.click_file_path = None # Store the path to the file with the clicked points of each trial
         self.track_clicks = 1  # Number of clicks to track
-        self.zaxis = None # Store the calculated z-axis value
-        self.yaxis = None # Store the calculated y-axis value
-        self.xaxis = None # Store the calculated x-axis value
         self.vertical_axis = None # Store the vertical axis
+        self.drift_threshold = 0.01 # Camera drift (fraction of the image size) that is flagged to the user
+        self.drifted_images = set() # Indexes of images flagged for large camera drift
+        self.profile_name = None # Calibration profile that receives the center point once selected
+        self.prefetch_count = 2 # Number of upcoming images decoded in the background
+        self.file_order = "natural" # Image order: "natural" (file name) or "capture" (capture time)
+        self.manifest = {} # Cached details of the images in the folder, keyed by file name
+        self.duplicate_images = [] # Indexes of images that look like a repeat of the previous image
+        self.history = AnnotationHistory() # Undo/redo history of the annotation actions
+        self.trial_store = TrialStore() # Results, clicked points and skipped/flagged state of the trials of the session
+        self.shard = None # Trial range assigned to this annotator when the session is split, or None
+        self.waiting_for_images = False # True when live mode reached the end of the list and waits for the camera
+
+        # Watch the session folder for new images in live mode
+        self.folder_watcher = FolderWatcher()
+        self.folder_watcher.images_added.connect(self.handle_new_images)
 
         self.layout = QVBoxLayout() # Create a vertical layout for the page
 
@@ -100,13 +135,40 @@ class EditPage(QWidget):
         self.previous_button.clicked.connect(self.previous_image)
         axis_button_layout.addWidget(self.previous_button)
 
+        # Button to toggle live mode
+        # Description: This button watches the folder for new images while data is being collected.
+        self.live_button = QPushButton("Live Mode")
+        self.live_button.setCheckable(True)
+        self.live_button.toggled.connect(self.toggle_live_mode)
+        axis_button_layout.addWidget(self.live_button)
+
+        # Fast mode controls
+        # Description: Fast mode advances to the next image right after the puck is clicked
+        # (or after a short configurable delay) and shows the result as a toast over the image.
+        self.fast_mode_checkbox = QCheckBox("Fast Mode")
+        self.fast_mode_checkbox.setChecked(self.parent.settings_manager.get("fast_mode"))
+        self.fast_mode_checkbox.toggled.connect(
+            lambda checked: self.parent.settings_manager.set("fast_mode", checked)
+        )
+        axis_button_layout.addWidget(self.fast_mode_checkbox)
+
+        self.fast_mode_delay_input = QSpinBox()
+        self.fast_mode_delay_input.setRange(0, 5000)
+        self.fast_mode_delay_input.setSingleStep(100)
+        self.fast_mode_delay_input.setSuffix(" ms")
+        self.fast_mode_delay_input.setValue(self.parent.settings_manager.get("fast_mode_delay"))
+        self.fast_mode_delay_input.valueChanged.connect(
+            lambda value: self.parent.settings_manager.set("fast_mode_delay", value)
+        )
+        axis_button_layout.addWidget(self.fast_mode_delay_input)
+
         # Add the horizontal layout to the main vertical layout
         self.layout.addLayout(axis_button_layout)
 
         # Info Label
 
         # Create text on top of image to display the information
-        self.info_label = QLabel(f"Image Number [{self.image_index}] | z axis: {self.zaxis} | y axis: {self.yaxis} | x axis: {self.xaxis}")
+        self.info_label = QLabel(f"Image Number [{self.image_index}] | z axis: None | y axis: None | x axis: None")
         # Set the alignment of the text to center
         self.info_label.setAlignment(Qt.AlignCenter)
         # Set the font size, weight, and margin for the text
@@ -119,13 +181,43 @@ class EditPage(QWidget):
         self.image_viewer = ImageView()
         # Set the image viewer to track two clicks
         self.image_viewer.track_clicks = self.track_clicks
+        # Limit the memory of the decoded images kept by the image viewer
+        self.image_viewer.cache_budget = self.parent.settings_manager.get("image_cache_mb") * 1024 * 1024
         # Add the image viewer to the layout
         self.layout.addWidget(self.image_viewer)
         self.setLayout(self.layout)
 
+        # Completion widgets shown at the end of the images (created once and hidden until then)
+        self.completion_widgets = self.create_completion_widgets()
+
         # Connect the point_clicked signal from the ImageView to the point_clicked method
         self.image_viewer.point_clicked.connect(self.handle_point_clicked)
 
+        # Keyboard shortcuts for annotating without the mouse buttons
+        self.setup_shortcuts()
+
+    # Method: setup_shortcuts
+    # Description:
+    # Bind the navigation and annotation actions to keyboard shortcuts.
+    # Input: None
+    # Output: None
+    def setup_shortcuts(self):
+        shortcuts = [
+            (["Right", "N"], self.go_to_next_image),
+            (["Left", "P"], lambda: self.previous_image("")),
+            (["S"], self.skip_trial),
+            (["F"], self.flag_trial),
+            (["Return", "Enter"], self.accept_suggestion),
+            ([QKeySequence.Undo], self.undo_action),
+            ([QKeySequence.Redo, "Ctrl+Y"], self.redo_action),
+        ]
+        self.shortcuts = []
+        for keys, action in shortcuts:
+            for key in keys:
+                shortcut = QShortcut(QKeySequence(key), self)
+                shortcut.activated.connect(action)
+                self.shortcuts.append(shortcut)
+
     # Method: handle_point_clicked
     # Description:
     # Handle the event when a point is clicked on the image.
@@ -139,20 +231,22 @@ class EditPage(QWidget):
     # Output: None
 
     def handle_point_clicked(self, x, y):
+        self.click_time = time.perf_counter()  # Start of the click-to-commit latency
 
         # check if the track_clicks is 1 which means that center point is selected
         if self.track_clicks == 1:
-            # Append the center point if not already in the list
-            if self.center_point and self.center_point not in self.clicked_points:
-                self.clicked_points.append(self.center_point)
-                self.image_viewer.draw_point_circle(self.center_point[0], self.center_point[1])
+            # Append the center point (shifted for camera drift) if not already in the list
+            center_point = self.image_center_point(self.image_index)
+            if center_point and center_point not in self.clicked_points:
+                self.clicked_points.append(center_point)
+                self.image_viewer.draw_point_circle(center_point[0], center_point[1])
             
             # Append the clicked point to the list of clicked points
             self.clicked_points.append((x, y)) 
             # Check if the number of clicked points is 2 to calculate the values
             if len(self.clicked_points) == 2:
                 # update the direction label
-                self.direction_label.setText("Next image will be displayed in 2 seconds.")
+                self.direction_label.setText(self.advance_message())
                 self.image_viewer.track_clicks = self.track_clicks
                 self.calulate_and_display() # Calculate the z-axis, y-axis, and x-axis values
 
@@ -167,9 +261,16 @@ class EditPage(QWidget):
             # Check if the number of clicked points is 2 to go to the next step to calculate the values
             if len(self.clicked_points) == 2:
                 # give update to the user
-                self.direction_label.setText("Next image will be displayed in 2 seconds.")
-                # Set the center point to the first clicked point
-                self.center_point = self.clicked_points[0]
+                self.direction_label.setText(self.advance_message())
+                # Set the center point to the first clicked point, stored relative to the calibration image
+                self.history.execute(SetCenterCommand(
+                    self.image_index,
+                    self.reference_center_point(self.clicked_points[0], self.image_index),
+                    self.center_point
+                ), self)
+                # Save the center point in the calibration profile so the next session can skip it
+                if self.profile_name:
+                    self.profile_manager.update_center_point(self.profile_name, self.center_point)
                 # Set the track_clicks to 1 to and update the next time to only need to click on the puck
                 self.track_clicks = 1
                 # update the image viewer to track the clicks
@@ -189,71 +290,49 @@ class EditPage(QWidget):
     # Output: None
 
     def calulate_and_display(self):
-        # Calculate the offset to make clicked_points[0] the origin
-        # Relative x and y values based on the origin point
-        origin_x, origin_y = self.clicked_points[0]
-        relative_x = self.clicked_points[1][0] - origin_x
-        relative_y = self.clicked_points[1][1] - origin_y
-
-        # Determine vertical and horizontal values based on the selected axes
-        if  self.axis == 0 and self.vertical_axis == 3:
-            # Vertical: +y to -y (top to bottom)
-            # Horizontal: -x to +x (right to left)
-            vertical_value = relative_x
-            horizontal_value = -relative_y
-
-        elif self.axis == 1 and self.vertical_axis == 3:
-            # Vertical: +y to -y (bottom to top)
-            # Horizontal: +x to -x (right to left)
-            vertical_value = -relative_x
-            horizontal_value = -relative_y
-
-        elif self.axis == 2 and self.vertical_axis == 1:
-            # Vertical +x to -x (top to bottom)
-            # Horizontal: -y to +y (left to right)
-            vertical_value = -relative_y
-            horizontal_value = relative_x
-      
-        elif self.axis == 3 and self.vertical_axis == 1:
-            # Vertical +x to -x (top to bottom)
-            # Horizontal: +y to  (left to right)
-            vertical_value = -relative_y
-            horizontal_value = -relative_x
-     
-        else:
-            # Handle invalid combinations
-            raise ValueError(
-                f"Invalid axis combination: horizontal_axis={self.axis}, vertical_axis={self.vertical_axis}"
-            )
-
-
-        # Calculate the z-axis error using the adjusted vertical and horizontal values
-        self.zaxis = self.calculations_manager.calculate_error(
-            0, 0, vertical_value, horizontal_value, self.scaling_factor
+        # Calculate the z-axis, y-axis, and x-axis values relative to the center point (clicked_points[0])
+        # based on the selected axes
+        zaxis, yaxis, xaxis = self.calculations_manager.calculate_axis_values(
+            self.clicked_points[0], self.clicked_points[1], self.axis, self.vertical_axis, self.scaling_factor
         )
 
-        # If z-axis error is zero, set x and y to zero
-        if self.zaxis == 0:
-            self.xaxis = 0
-            self.yaxis = 0
-        else:
-            # Calculate real-world coordinates using the adjusted vertical and horizontal values
-            self.xaxis, self.yaxis = self.calculations_manager.calculate_real_world_coordinates(
-                0, 0, vertical_value, horizontal_value, self.scaling_factor
-            )
-
-        # Append the calculated data to the results file
-        self.file_manager.append_axis_data(
-            self.result_file_path, self.image_index, self.zaxis, self.yaxis, self.xaxis
-        )
+        # Save the calculated data and the clicked points (so the trial can be reprocessed without the GUI).
+        # Only the line of this trial is written, replacing an earlier result of the same trial.
+        previous_values, previous_click = self.read_trial_record(self.image_index)
+        self.history.execute(CommitTrialCommand(
+            self.image_index,
+            (zaxis, yaxis, xaxis),
+            (os.path.basename(self.image_path), self.clicked_points[0], self.clicked_points[1]),
+            previous_values, previous_click
+        ), self)
+        # Checkpoint the session so it can be resumed after the program is closed
+        self.save_session_state()
+        monitor.record("click_to_commit", time.perf_counter() - self.click_time)
 
         # Update the info label with the calculated data
         self.info_label.setText(
-            f"Image Number [{self.image_index}] | z axis: {self.zaxis} | y axis: {self.yaxis} | x axis: {self.xaxis}"
+            f"Image Number [{self.image_index}] | z axis: {zaxis} | y axis: {yaxis} | x axis: {xaxis}"
         )
 
-        # Display the next image after a delay
-        QTimer.singleShot(2000, lambda: self.next_image("Please click on the puck"))
+        # Display the next image after a delay, or right away in fast mode
+        delay = self.parent.settings_manager.advance_delay()
+        if self.parent.settings_manager.get("fast_mode"):
+            self.image_viewer.show_toast(
+                f"Trial {self.image_index}: z {zaxis:.2f} | y {yaxis:.2f} | x {xaxis:.2f}"
+            )
+        # A zero delay still goes through the event loop so the click that triggered this is finished first
+        QTimer.singleShot(delay, lambda: self.next_image("Please click on the puck"))
+
+    # Method: advance_message
+    # Description:
+    # Build the message shown while waiting for the next image.
+    # Input: None
+    # Output: message text
+    def advance_message(self):
+        delay = self.parent.settings_manager.advance_delay()
+        if delay == 0:
+            return "Loading next image."
+        return f"Next image will be displayed in {delay / 1000:g} seconds."
 
     # Method: reselect_center
     # Description:
@@ -267,6 +346,155 @@ class EditPage(QWidget):
         self.image_viewer.track_clicks = self.track_clicks
         self.load_image(self.image_index, "Please click on the center again to reselect")
     
+    # Method: read_trial_record
+    # Description:
+    # Get what is currently saved for a trial in the results and clicks files from the trial store.
+    # Input: index - index of the trial
+    # Output: (values, click) - (zaxis, yaxis, xaxis) and (image_name, center_point, puck_point), or None if not saved
+    def read_trial_record(self, index):
+        values = self.trial_store.get_values(index)
+        click = self.trial_store.get_click(index)
+        if click is not None:
+            click = (os.path.basename(self.image_list[index]),) + click
+        return values, click
+
+    # Method: load_trial_store
+    # Description:
+    # Fill the trial store with the results and clicked points saved in the results files of the session.
+    # Input: skipped - trials the user skipped (default: none)
+    #        flagged - trials the user flagged (default: none)
+    # Output: None
+    def load_trial_store(self, skipped=(), flagged=()):
+        self.trial_store.clear()
+        if os.path.exists(self.result_file_path):
+            self.trial_store.load_results(self.file_manager.read_axis_data(self.result_file_path))
+        if os.path.exists(self.click_file_path):
+            self.trial_store.load_clicks(self.file_manager.read_click_data(self.click_file_path))
+        self.trial_store.set_flag(list(skipped), FLAG_SKIPPED)
+        self.trial_store.set_flag(list(flagged), FLAG_FLAGGED)
+
+    # Method: go_to_trial
+    # Description:
+    # Show the image of a trial, asking for the center first if no center point is selected.
+    # Input: index - index of the trial
+    #        text - text to display in the direction label
+    # Output: None
+    def go_to_trial(self, index, text):
+        self.image_index = min(max(index, self.first_trial()), self.last_trial())
+        self.track_clicks = 1 if self.center_point is not None else 2
+        self.image_viewer.track_clicks = self.track_clicks
+        self.info_label.setText(f" Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | z axis: None | y axis: None | x axis: None")
+        self.load_image(self.image_index, text)
+
+    # Method: show_trial
+    # Description:
+    # Show the image of a trial with the points and values saved for it (for example a trial picked on
+    # the data review page). Clicking the puck again replaces the saved result.
+    # Input: index - index of the trial
+    #        text - text to display in the direction label
+    # Output: None
+    def show_trial(self, index, text):
+        self.go_to_trial(index, text)
+        values, click = self.read_trial_record(self.image_index)
+        if values is not None:
+            self.info_label.setText(f" Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | "
+                                    f"z axis: {values[0]:.2f} | y axis: {values[1]:.2f} | x axis: {values[2]:.2f}")
+        if click is not None:
+            _, saved_center, saved_puck = click
+            if saved_center is not None:
+                self.image_viewer.draw_point_circle(saved_center[0], saved_center[1])
+            self.image_viewer.draw_cross(saved_puck[0], saved_puck[1])
+
+    # Method: go_to_next_image
+    # Description:
+    # Move to the next image without changing the current trial.
+    # Input: None
+    # Output: None
+    def go_to_next_image(self):
+        if self.image_list:
+            self.next_image("Please click on the puck")
+
+    # Method: skip_trial
+    # Description:
+    # Mark the current trial as skipped and move to the next image.
+    # Input: None
+    # Output: None
+    def skip_trial(self):
+        if not self.image_list:
+            return
+        self.history.execute(SkipTrialCommand(self.image_index), self)
+        self.save_session_state()
+        self.next_image("Trial skipped, please click on the puck")
+
+    # Method: flag_trial
+    # Description:
+    # Flag or unflag the current trial for later review.
+    # Input: None
+    # Output: None
+    def flag_trial(self):
+        if not self.image_list:
+            return
+        self.history.execute(FlagTrialCommand(self.image_index), self)
+        self.save_session_state()
+        state = "flagged" if self.trial_store.has_flag(self.image_index, FLAG_FLAGGED) else "unflagged"
+        self.direction_label.setText(f"Trial {self.image_index} {state}, please click on the puck")
+
+    # Method: accept_suggestion
+    # Description:
+    # Keep the result already saved for the current trial (e.g. after going back) and move on.
+    # Input: None
+    # Output: None
+    def accept_suggestion(self):
+        if not self.image_list:
+            return
+        values, _ = self.read_trial_record(self.image_index)
+        if values is None:
+            self.direction_label.setText("No saved result for this trial, please click on the puck")
+            return
+        self.next_image("Please click on the puck")
+
+    # Method: undo_action
+    # Description:
+    # Undo the most recent action and show the trial it changed.
+    # Input: None
+    # Output: None
+    def undo_action(self):
+        command = self.history.undo(self)
+        if command is None:
+            self.direction_label.setText("Nothing to undo")
+            return
+        self.save_session_state()
+        self.go_to_trial(command.trial_index, f"Undid {self.describe_command(command)} of trial {command.trial_index}")
+
+    # Method: redo_action
+    # Description:
+    # Redo the most recently undone action. Saving or skipping a trial moves on to the next trial.
+    # Input: None
+    # Output: None
+    def redo_action(self):
+        command = self.history.redo(self)
+        if command is None:
+            self.direction_label.setText("Nothing to redo")
+            return
+        self.save_session_state()
+        index = command.trial_index
+        if isinstance(command, (CommitTrialCommand, SkipTrialCommand)):
+            index = min(index + 1, len(self.image_list) - 1)
+        self.go_to_trial(index, f"Redid {self.describe_command(command)} of trial {command.trial_index}")
+
+    # Method: describe_command
+    # Description:
+    # Get a short name of an action for the direction label.
+    # Input: command - annotation command
+    # Output: name of the action
+    def describe_command(self, command):
+        return {
+            SetCenterCommand: "center selection",
+            CommitTrialCommand: "result",
+            SkipTrialCommand: "skip",
+            FlagTrialCommand: "flag",
+        }[type(command)]
+
     # Method: load_image
     # Description:
     # Load the image at the specified index from the image list.
@@ -293,9 +521,59 @@ class EditPage(QWidget):
         self.direction_label.setText(text)
         # Load the image in the image viewer
         self.image_viewer.load_image(image_path)  
+        # Decode the next images in the background so they appear immediately
+        self.image_viewer.prefetch(self.image_list[index + 1:index + 1 + self.prefetch_count])
         # Draw the center point if center point is selected
         if self.track_clicks == 1:
-            self.image_viewer.draw_point_circle(self.center_point[0], self.center_point[1])
+            center_point = self.image_center_point(index)
+            self.image_viewer.draw_point_circle(center_point[0], center_point[1])
+        else:
+            self.get_image_drift(index)  # Check the drift of the image the center is clicked on too
+        # Show the state of the trial and warn the user if the camera moved noticeably since the calibration image
+        notes = []
+        if self.trial_store.has_flag(index, FLAG_FLAGGED):
+            notes.append("This trial is flagged")
+        if self.trial_store.has_flag(index, FLAG_SKIPPED):
+            notes.append("This trial was skipped")
+        if index in self.drifted_images:
+            notes.append("Warning: camera drift detected on this image")
+        if notes:
+            self.direction_label.setText("\n".join([text] + notes))
+
+    # Method: get_image_drift
+    # Description:
+    # Get the camera drift of an image relative to the calibration image in scene coordinates.
+    # Images whose drift is larger than drift_threshold are added to drifted_images.
+    # Input: index - index of the image in the image list
+    # Output: (dx, dy) - drift in scene coordinates
+    def get_image_drift(self, index):
+        shift_x, shift_y = self.registration_manager.get_shift(self.image_list[index])
+        if math.hypot(shift_x, shift_y) > self.drift_threshold:
+            self.drifted_images.add(index)
+        pixmap = self.image_viewer.image_item.pixmap()
+        return shift_x * pixmap.width(), shift_y * pixmap.height()
+
+    # Method: image_center_point
+    # Description:
+    # Get the center point for an image, shifted by the camera drift of that image.
+    # Input: index - index of the image in the image list
+    # Output: center point in scene coordinates, or None if the center is not selected
+    def image_center_point(self, index):
+        if self.center_point is None:
+            return None
+        drift_x, drift_y = self.get_image_drift(index)
+        return (self.center_point[0] + drift_x, self.center_point[1] + drift_y)
+
+    # Method: reference_center_point
+    # Description:
+    # Convert a point clicked on an image to the coordinates of the calibration image by removing
+    # the camera drift of that image.
+    # Input: point - clicked point in scene coordinates
+    #        index - index of the image the point was clicked on
+    # Output: point in calibration image coordinates
+    def reference_center_point(self, point, index):
+        drift_x, drift_y = self.get_image_drift(index)
+        return (point[0] - drift_x, point[1] - drift_y)
 
     # Method: next_image
     # Description:
@@ -308,40 +586,120 @@ class EditPage(QWidget):
 
     def next_image(self, text):
         # Check if the image index is less than the total number of images otherwise the user has reached the end of the images
-        if self.image_index < len(self.image_list) - 1: 
-            # Increment the image index and update information
-            self.image_index += 1 
-            self.info_label.setText(f" Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | z axis: None | y axis: None | x axis: None")
-            self.image_viewer.draw_point_circle(self.center_point[0], self.center_point[1]) 
-            self.load_image(self.image_index, text)
+        if self.image_index < self.last_trial(): 
+            # Show the next image; load_image draws the center shifted by the drift of the image, and
+            # asks for the center first when none is selected yet (e.g. skipping before clicking it)
+            if self.center_point is None:
+                text = "Please click on the center, then on the puck"
+            self.go_to_trial(self.image_index + 1, text)
+
+        elif self.folder_watcher.is_active():
+            # In live mode wait for the camera to write the next image
+            self.waiting_for_images = True
+            self.direction_label.setText("Waiting for the next image from the camera...")
 
         else:
-            # If at the end of the image list, remove image viewer and add options
+            # If at the end of the image list, show the options
             QMessageBox.information(self, "End of Images", "All images have been processed.")
+            self.set_completion_visible(True)
+
+    # Method: create_completion_widgets
+    # Description:
+    # Create the label and buttons shown when all images have been processed. They are created once
+    # and shown or hidden, so reaching the end of the images again does not add more widgets.
+    # Input: None
+    # Output: list of the completion widgets
+    def create_completion_widgets(self):
+        # Add a label to indicate completion
+        completion_label = QLabel("Processing complete! What would you like to do next?")
+        completion_label.setAlignment(Qt.AlignCenter)
+        completion_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+
+        # Add a button to navigate to the Data Review Page
+        data_review_button = QPushButton("Go to Data Review")
+        data_review_button.setStyleSheet("font-size: 16px; padding: 10px;")
+        data_review_button.clicked.connect(self.go_to_data_review)
+
+        # Add a button to return to the main menu
+        main_menu_button = QPushButton("Back to Main Menu")
+        main_menu_button.setStyleSheet("font-size: 16px; padding: 10px;")
+        main_menu_button.clicked.connect(self.go_to_main_menu)
+
+        # Add a button to exit the program
+        exit_button = QPushButton("Exit Program")
+        exit_button.setStyleSheet("font-size: 16px; padding: 10px;")
+        exit_button.clicked.connect(self.exit_program)
+
+        completion_widgets = [completion_label, data_review_button, main_menu_button, exit_button]
+        for widget in completion_widgets:
+            self.layout.addWidget(widget)
+            widget.hide()
+        return completion_widgets
+
+    # Method: set_completion_visible
+    # Description:
+    # Show or hide the completion label and buttons.
+    # Input: visible - True to show them, False to hide them
+    # Output: None
+    def set_completion_visible(self, visible):
+        for widget in self.completion_widgets:
+            widget.setVisible(visible)
 
-            # Add a label to indicate completion
-            completion_label = QLabel("Processing complete! What would you like to do next?")
-            completion_label.setAlignment(Qt.AlignCenter)
-            completion_label.setStyleSheet("font-size: 18px; font-weight: bold;")
-            self.layout.addWidget(completion_label)
-
-            # Add a button to navigate to the Data Review Page
-            data_review_button = QPushButton("Go to Data Review")
-            data_review_button.setStyleSheet("font-size: 16px; padding: 10px;")
-            data_review_button.clicked.connect(self.go_to_data_review)
-            self.layout.addWidget(data_review_button)
-
-            # Add a button to return to the main menu
-            main_menu_button = QPushButton("Back to Main Menu")
-            main_menu_button.setStyleSheet("font-size: 16px; padding: 10px;")
-            main_menu_button.clicked.connect(self.go_to_main_menu)
-            self.layout.addWidget(main_menu_button)
-
-            # Add a button to exit the program
-            exit_button = QPushButton("Exit Program")
-            exit_button.setStyleSheet("font-size: 16px; padding: 10px;")
-            exit_button.clicked.connect(self.exit_program)
-            self.layout.addWidget(exit_button)
+    # Method: image_sort_key
+    # Description:
+    # Sort key of new camera images in the order of the session (natural file name or capture time).
+    # Input: image_path - path to the image file
+    # Output: sort key
+    def image_sort_key(self, image_path):
+        name_key = self.manifest_manager.natural_sort_key(os.path.basename(image_path))
+        if self.file_order != "capture":
+            return name_key
+        try:
+            captured = self.manifest_manager.read_file_details(image_path)[1]
+        except OSError:
+            captured = None
+        if not captured:
+            captured = datetime.fromtimestamp(os.path.getmtime(image_path)).isoformat()
+        return captured, name_key
+
+    # Method: stop_live_mode
+    # Description:
+    # Stop watching the folder of the previous session when a session is started or resumed.
+    # Input: None
+    # Output: None
+    def stop_live_mode(self):
+        self.live_button.setChecked(False)  # Stops the watcher through toggle_live_mode when it was on
+        self.folder_watcher.stop()
+        self.waiting_for_images = False
+
+    # Method: toggle_live_mode
+    # Description:
+    # Start or stop watching the session folder for new images.
+    # Input: checked - True to start live mode, False to stop it
+    # Output: None
+    def toggle_live_mode(self, checked):
+        if checked and self.folder_path:
+            self.folder_watcher.start(self.folder_path, self.image_list, self.image_sort_key)
+            self.live_button.setText("Live Mode (On)")
+        else:
+            self.folder_watcher.stop()
+            self.waiting_for_images = False
+            self.live_button.setText("Live Mode")
+
+    # Method: handle_new_images
+    # Description:
+    # Append images written by the camera to the image list, prefetch them and start estimating
+    # their camera drift right away. If the user was waiting at the end of the list, show the next image.
+    # Input: image_paths - paths of the new images
+    # Output: None
+    def handle_new_images(self, image_paths):
+        self.image_list.extend(image_paths)
+        self.registration_manager.submit(image_paths)
+        self.image_viewer.prefetch(image_paths[:self.prefetch_count])
+        self.info_label.setText(f" Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | live mode")
+        if self.waiting_for_images:
+            self.waiting_for_images = False
+            self.next_image("Please click on the puck")
 
     # Method: go_to_data_review
     # Description:
@@ -350,6 +708,7 @@ class EditPage(QWidget):
     # Output: None
     def go_to_data_review(self):
         """Navigate to the DataReviewPage and load the result file."""
+        self.write_performance_report()
         if self.result_file_path:
             self.parent.data_review_page.read_and_display_data(self.result_file_path)
             self.parent.stack.setCurrentWidget(self.parent.data_review_page)
@@ -363,6 +722,7 @@ class EditPage(QWidget):
     # Output: None
     def go_to_main_menu(self):
         """Navigate back to the main menu."""
+        self.write_performance_report()
         self.parent.stack.setCurrentWidget(self.parent.main_menu)
 
     # Method: exit_program
@@ -372,6 +732,7 @@ class EditPage(QWidget):
     # Output: None
     def exit_program(self):
         """Exit the program."""
+        self.write_performance_report()
         QApplication.quit()
 
         
@@ -379,27 +740,163 @@ class EditPage(QWidget):
     # Description:
     # Load the previous image in the image list.
     # Decrement the image index and update the information label.
-    # Remove the last line from the results file.
+    # The saved result is kept; clicking the puck again replaces it, and undo removes it.
     # Load the previous image with a message to click on the puck.
     # Input: text - text to display in the direction label
     # Output: None
     def previous_image(self,text):
-        if self.image_index > 1:
+        if self.image_index > self.first_trial():
             self.image_index -= 1
             text = "Loaded previous image please click on the puck"
             self.info_label.setText(f"Previous:  Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | z axis: None | y axis: None | x axis: None")
-            self.file_manager.remove_last_line(self.result_file_path)
-            self.zaxis = None
-            self.xaxis = None
-            self.yaxis = None
             self.load_image( self.image_index, text)
+            self.save_session_state()
         else:
             QMessageBox.warning(self, "Start of Images", "This is the first image.")
 
+    # Method: save_session_state
+    # Description:
+    # Save the calibration, center point and current image of the session in the Results folder.
+    # Input: None
+    # Output: None
+    def save_session_state(self):
+        self.session_state_manager.save_state(self.result_folder_path, {
+            "calibration_image": os.path.basename(self.image_list[0]),
+            "image_index": self.image_index,
+            "scaling_factor": self.scaling_factor,
+            "axis": self.axis,
+            "vertical_axis": self.vertical_axis,
+            "center_point": list(self.center_point) if self.center_point else None,
+            "profile_name": self.profile_name,
+            "file_order": self.file_order,
+            "skipped": self.trial_store.trials_with(FLAG_SKIPPED).tolist(),
+            "flagged": self.trial_store.trials_with(FLAG_FLAGGED).tolist(),
+            "shard": self.shard,
+        }, shard_name=self.shard["name"] if self.shard else None)
+
+    # Method: write_performance_report
+    # Description:
+    # Write the stage timings of the session to Performance_Report.json in the Results folder
+    # when instrumentation is on.
+    # Input: None
+    # Output: None
+    def write_performance_report(self):
+        if monitor.enabled and self.result_folder_path:
+            try:
+                monitor.write_report(os.path.join(self.result_folder_path, "Performance_Report.json"))
+            except OSError as e:
+                QMessageBox.warning(self, "Performance Report", f"Could not write the performance report: {str(e)}")
+
+    # Method: end_performance_report
+    # Description:
+    # Write the performance report of the current session before another session replaces it, and
+    # forget its timings so the report of the new session only holds its own.
+    # Input: None
+    # Output: None
+    def end_performance_report(self):
+        self.write_performance_report()
+        monitor.clear()
+
+    # Method: first_trial
+    # Description:
+    # Get the first trial the user annotates (the start of the shard when the session is split).
+    # Input: None
+    # Output: index of the first trial
+    def first_trial(self):
+        if self.shard:
+            return max(1, self.shard["start"])
+        return 1
+
+    # Method: last_trial
+    # Description:
+    # Get the last trial the user annotates (the end of the shard when the session is split).
+    # Input: None
+    # Output: index of the last trial
+    def last_trial(self):
+        if self.shard:
+            return min(self.shard["end"], len(self.image_list) - 1)
+        return len(self.image_list) - 1
+
+    # Method: choose_shard
+    # Description:
+    # If the session folder is split between annotators, ask the user which shard to work on.
+    # The dialog names the calibration image the trials of the shards are numbered from.
+    # Input: folder_path - path to the session folder
+    # Output: (ok, shard) - ok is False if the user cancelled; shard is None for the whole session
+    def choose_shard(self, folder_path):
+        _, shards = self.shard_manager.load_shards(folder_path)
+        if not shards:
+            return True, None
+        whole_session = "Whole session"
+        options = [whole_session] + [f"{shard['name']} (trials {shard['start']}-{shard['end']})" for shard in shards]
+        text = "This session is split. Which part are you annotating?"
+        # The trials of the shards are numbered from the calibration image chosen when the session was split
+        calibration_image = self.shard_manager.load_calibration_image(folder_path)
+        if calibration_image:
+            text += f"\nUse {calibration_image} as the calibration image so the trial numbers match."
+        choice, ok = QInputDialog.getItem(self, "Shared Session", text, options, 0, False)
+        if not ok:
+            return False, None
+        if choice == whole_session:
+            return True, None
+        return True, shards[options.index(choice) - 1]
+
+    # Method: restore_session
+    # Description:
+    # Restore a saved session from a session folder and load the first image without results.
+    # Finished trials are not loaded again, and their camera drift is not re-estimated.
+    # Input: folder_path - path to the session folder
+    #        shard - shard of a split session, or None for the whole session (default: None)
+    # Output: True if the session was restored, False otherwise
+    def restore_session(self, folder_path, shard=None):
+        state = self.session_state_manager.load_state(folder_path, shard["name"] if shard else None)
+        if state is None:
+            QMessageBox.warning(self, "No Session", "No saved session was found in the selected folder.")
+            return False
+        self.end_performance_report()
+
+        # Restore the calibration
+        self.folder_path = folder_path
+        self.scaling_factor = state["scaling_factor"]
+        self.axis = state["axis"]
+        self.vertical_axis = state["vertical_axis"]
+        self.profile_name = state.get("profile_name")
+        self.file_order = state.get("file_order", "natural")
+        self.shard = state.get("shard")
+        self.stop_live_mode()
+        self.history.clear()
+        self.set_completion_visible(False)
+        self.create_files_list(folder_path, os.path.join(folder_path, state["calibration_image"]))
+        self.load_trial_store(state.get("skipped", []), state.get("flagged", []))
+
+        # Jump to the first trial that has no results yet and was not skipped
+        done = set(self.trial_store.trials_with(FLAG_SAVED | FLAG_SKIPPED).tolist())
+        pending = [index for index in range(self.first_trial(), self.last_trial() + 1) if index not in done]
+        self.image_index = pending[0] if pending else max(self.first_trial(), self.last_trial())
+
+        # Estimate the camera drift of the remaining images in the background
+        self.drifted_images = set()
+        self.registration_manager.start(self.image_list[0], self.image_list[self.image_index:self.last_trial() + 1])
+
+        if state.get("center_point"):
+            self.center_point = tuple(state["center_point"])
+            self.track_clicks = 1
+            self.center_button.show()
+            self.center_button.setEnabled(True)
+            text = "Session resumed, please click on the puck"
+        else:
+            self.track_clicks = 2
+            text = "Session resumed, please click on the center"
+        self.image_viewer.track_clicks = self.track_clicks
+        self.info_label.setText(f" Total Images [{len(self.image_list) - 1}] Image Trial [{self.image_index}] | z axis: None | y axis: None | x axis: None")
+        self.load_image(self.image_index, text)
+        return True
+
 
     # Method: create_files_list
     # Description:
     # Create the list of image files in the selected folder.
+    # The images are ordered using the cached folder manifest (natural or capture-time order).
     # Create the Results folder and Results file.
     # Input: folder_path - path to the folder containing images
     #        image_path - path to the selected image
@@ -410,30 +907,39 @@ class EditPage(QWidget):
         # Constants for results folder and file
         RESULTS_FOLDER_NAME = "Results"
         RESULTS_FILE_NAME = "Results_File.txt"
+        CLICKS_FILE_NAME = "Clicks_File.csv"
 
+        # Each shard of a split session writes its own partial results
+        if self.shard:
+            RESULTS_FILE_NAME = self.shard["results_file"]
+            CLICKS_FILE_NAME = self.shard["clicks_file"]
 
-        # Ensure image_path is the first in the image list
+        # Create Results folder
+        results_folder_path = os.path.join(folder_path, RESULTS_FOLDER_NAME)
+        if not os.path.exists(results_folder_path):
+            self.result_folder_path = self.file_manager.create_folder(folder_path, folder_name=RESULTS_FOLDER_NAME)
+        else:
+            self.result_folder_path = results_folder_path
+
+        # Update the folder manifest and build the ordered image list from it
+        self.manifest = self.manifest_manager.update_manifest(folder_path, self.result_folder_path)
         self.image_list = [
             os.path.normpath(os.path.join(folder_path, f))
-            for f in os.listdir(folder_path)
-            if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp"))
+            for f in self.manifest_manager.ordered_file_names(self.manifest, self.file_order)
         ]
 
         # Normalize image_path for comparison
         normalized_image_path = os.path.normpath(image_path)
 
+        # Ensure image_path is the first in the image list
         # Remove image_path if it exists and insert it at the beginning
 
         if normalized_image_path in self.image_list:
             self.image_list.remove(normalized_image_path)
         self.image_list.insert(0, normalized_image_path)
 
-        # Create Results folder
-        results_folder_path = os.path.join(folder_path, RESULTS_FOLDER_NAME)
-        if not os.path.exists(results_folder_path):
-            self.result_folder_path = self.file_manager.create_folder(folder_path, folder_name=RESULTS_FOLDER_NAME)
-        else:
-            self.result_folder_path = results_folder_path
+        # Look for images the camera took twice before they shift the trial numbering
+        self.check_duplicates()
 
         # Create Results file
         results_file_path = os.path.join(self.result_folder_path, RESULTS_FILE_NAME)
@@ -442,25 +948,82 @@ class EditPage(QWidget):
         else:
             self.result_file_path = results_file_path
 
+        # Path of the clicked points file, created on the first saved trial
+        self.click_file_path = os.path.join(self.result_folder_path, CLICKS_FILE_NAME)
+
+
+    # Method: check_duplicates
+    # Description:
+    # Find images that are near-duplicates of the image before them using thumbnail differences
+    # cached in the manifest, and warn the user before annotation starts.
+    # Input: None
+    # Output: None
+    def check_duplicates(self):
+        # The calibration image is not a trial, so only compare the trial images
+        file_names = [os.path.basename(path) for path in self.image_list]
+        self.manifest = self.duplicate_detector.update_differences(self.folder_path, self.result_folder_path,
+                                                                   file_names[1:], self.manifest)
+        self.duplicate_images = [index + 1 for index in
+                                 self.duplicate_detector.find_consecutive_duplicates(file_names[1:], self.manifest)]
+        if self.duplicate_images:
+            duplicate_names = "\n".join(
+                f"Trial {index}: {file_names[index]} (same as {file_names[index - 1]})"
+                for index in self.duplicate_images
+            )
+            QMessageBox.warning(self, "Possible Duplicate Images",
+                                "These images look like repeats of the image before them:\n" + duplicate_names)
 
     # Method: set_data
     # Description:
     # Set the data required for image editing.
+    # If a center point is given (from a saved calibration profile) the user only clicks the puck.
     # Input: scaling_factor - scaling factor for the image
     #        folder_path - path to the folder containing images
     #        image_path - path to the selected image
-    #        result_file_path - path to the result file
+    #        axis - selected horizontal axis
+    #        vertical_axis - selected vertical axis
+    #        center_point - center point in calibration image coordinates (default: None)
+    #        profile_name - calibration profile that receives the center point once selected (default: None)
+    #        shard - trial range of a split session to annotate, or None for the whole session (default: None)
     # Output: None
 
     # def load_image(self, image_path,index,text):
 
-    def set_data(self, scaling_factor, folder_path, image_path, axis, vertical_axis):
+    def set_data(self, scaling_factor, folder_path, image_path, axis, vertical_axis,
+                 center_point=None, profile_name=None, shard=None):
      
+        self.end_performance_report()
         self.scaling_factor = scaling_factor
         self.folder_path = folder_path
         self.axis = axis
+        self.profile_name = profile_name
+        self.shard = shard
+        self.stop_live_mode()
+        self.history.clear()
+        self.set_completion_visible(False)
+        # Forget the center, clicks and flagged images of the previous session
+        self.center_point = None
+        self.clicked_points = []
+        self.duplicate_images = []
+        self.drifted_images = set()
         self.create_files_list(folder_path, image_path)
-        self.track_clicks = 2
+        self.load_trial_store()
+        self.image_index = self.first_trial()
         self.vertical_axis = vertical_axis
+        # Estimate the camera drift of every image to annotate in the background
+        self.registration_manager.start(self.image_list[0], self.image_list[self.image_index:self.last_trial() + 1])
+
+        if center_point is not None:
+            # The center point is known from the profile, only the puck has to be clicked
+            self.center_point = center_point
+            self.track_clicks = 1
+            self.center_button.show()
+            self.center_button.setEnabled(True)
+            text = "Please click on the puck"
+        else:
+            self.track_clicks = 2
+            self.center_button.hide()
+            self.center_button.setEnabled(False)
+            text = "Please click on the center"
         self.image_viewer.track_clicks = self.track_clicks
-        self.load_image(self.image_index, "Please click on the center")
\ No newline at end of file
+        self.load_image(self.image_index, text)
\ No newline at end of file
@@ -15,9 +15,12 @@
 
 # Import necessary libraries
 
-from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
-from PyQt5.QtGui import QPixmap, QPen
-from PyQt5.QtCore import Qt, QLineF, pyqtSignal
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QLabel
+from PyQt5.QtGui import QPixmap, QPen, QImage
+from PyQt5.QtCore import Qt, QLineF, QTimer, pyqtSignal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation_class import monitor
 
 # Class: ImageView
 # Description:
@@ -43,6 +46,32 @@ class ImageView(QGraphicsView):
         self.track_clicks = None # Number of clicks to track
         self.click_list = [] # List to store clicked points
 
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=2) # Worker threads that decode upcoming images
+        self.prefetch_cache = OrderedDict() # Decoded images keyed by path, oldest first
+        self.prefetch_limit = 8 # Maximum number of decoded images kept in the cache
+        self.cache_budget = 64 * 1024 * 1024 # Maximum bytes of decoded images kept in the cache
+
+        # The image item and the marker items are created once and reused for every image,
+        # so the scene does not grow during a long session
+        self.image_item = QGraphicsPixmapItem() # Item showing the current image
+        self.image_item.setZValue(-1) # Keep the image below the markers
+        self.scene.addItem(self.image_item)
+        self.marker_limit = 16 # Maximum number of circles (and of crosses) in the scene
+        self.circle_items = [] # Reusable circle items
+        self.cross_items = [] # Reusable (horizontal, vertical) line items of the crosses
+        self.circles_used = 0 # Number of circles drawn on the current image
+        self.crosses_used = 0 # Number of crosses drawn on the current image
+
+        # Toast label shown over the image to report results without blocking the user
+        self.toast_label = QLabel(self.viewport())
+        self.toast_label.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: white; font-size: 16px; padding: 6px; border-radius: 4px;"
+        )
+        self.toast_label.hide()
+        self.toast_timer = QTimer(self)
+        self.toast_timer.setSingleShot(True)
+        self.toast_timer.timeout.connect(self.toast_label.hide)
+
     # Method: draw_point_circle
     # Description:
     # Draw a circle centered at the specified point on the image.
@@ -51,27 +80,124 @@ class ImageView(QGraphicsView):
     # Output: None
     def draw_point_circle(self, x, y):
         circle_radius = 6  # Set radius of the circle
-        # Add an ellipse item to the scene to represent the circle
-        ellipse_item =self.scene.addEllipse(
-            x - circle_radius, y - circle_radius, 2 * circle_radius, 2 * circle_radius, self.pen
-        )
-        ellipse_item.setBrush(Qt.green)  # Set the brush color to yellow
-
+        # Reuse a circle item, adding one to the scene only until the marker limit is reached
+        if len(self.circle_items) < self.marker_limit and self.circles_used == len(self.circle_items):
+            ellipse_item = self.scene.addEllipse(0, 0, 0, 0, self.pen)
+            ellipse_item.setBrush(Qt.green)  # Set the brush color to green
+            self.circle_items.append(ellipse_item)
+        ellipse_item = self.circle_items[self.circles_used % self.marker_limit]
+        self.circles_used += 1
+        ellipse_item.setRect(x - circle_radius, y - circle_radius, 2 * circle_radius, 2 * circle_radius)
+        ellipse_item.show()
+
+    # Method: draw_cross
+    # Description:
+    # Draw a cross centered at the specified point on the image.
+    # Input: x - x-coordinate of the point
+    #        y - y-coordinate of the point
+    # Output: None
+    def draw_cross(self, x, y):
+        cross_size = 10 # Size of the cross
+        # Reuse the two line items of a cross, adding them to the scene only until the marker limit is reached
+        if len(self.cross_items) < self.marker_limit and self.crosses_used == len(self.cross_items):
+            self.cross_items.append((self.scene.addLine(QLineF(), self.pen), self.scene.addLine(QLineF(), self.pen)))
+        horizontal_line, vertical_line = self.cross_items[self.crosses_used % self.marker_limit]
+        self.crosses_used += 1
+        # Draw horizontal and vertical lines for the cross
+        horizontal_line.setLine(QLineF(x - cross_size, y, x + cross_size, y))
+        vertical_line.setLine(QLineF(x, y - cross_size, x, y + cross_size))
+        horizontal_line.show()
+        vertical_line.show()
+
+    # Method: clear_markers
+    # Description:
+    # Hide all circles and crosses (they are reused for the next image).
+    # Input: None
+    # Output: None
+    def clear_markers(self):
+        for ellipse_item in self.circle_items:
+            ellipse_item.hide()
+        for horizontal_line, vertical_line in self.cross_items:
+            horizontal_line.hide()
+            vertical_line.hide()
+        self.circles_used = 0
+        self.crosses_used = 0
+
+    # Method: show_toast
+    # Description:
+    # Show a short message in the top-left corner of the view that hides itself after a while.
+    # The message stays visible while the next image is loaded.
+    # Input: text - message to show
+    #        duration - milliseconds before the message is hidden (default: 1500)
+    # Output: None
+    def show_toast(self, text, duration=1500):
+        self.toast_label.setText(text)
+        self.toast_label.adjustSize()
+        self.toast_label.move(10, 10)
+        self.toast_label.show()
+        self.toast_label.raise_()
+        self.toast_timer.start(duration)
 
     # Method: load_image
     # Description:
-    # Load and display the selected image by creating a QGraphicsPixmapItem with the image and adding it to the scene.
+    # Load and display the selected image in the image item and remove the markers of the previous image.
     # Input: image_path - path to the image file
     # Output: None
 
     def load_image(self, image_path):
         """Load and display the selected image."""
-        pixmap = QPixmap(image_path).scaled(1600, 1200, Qt.KeepAspectRatio) # Load the image and scale it
-        self.scene.clear() # Clear the scene
-        self.image_item = QGraphicsPixmapItem(pixmap) # Create a QGraphicsPixmapItem with the image
-        self.scene.addItem(self.image_item) # Add the image item to the scene
-        self.image_selected = True # Set the flag to indicate that an image is loaded
-        self.fitInView(self.image_item, Qt.KeepAspectRatio) # Fit the image to the view
+        with monitor.timer("image_decode"):
+            future = self.prefetch_cache.pop(image_path, None) # Use the prefetched image if there is one
+            image = future.result() if future is not None else None
+            if image is not None and not image.isNull():
+                pixmap = QPixmap.fromImage(image)
+            else:
+                pixmap = QPixmap(image_path).scaled(1600, 1200, Qt.KeepAspectRatio) # Load the image and scale it
+        with monitor.timer("scene_rebuild"):
+            self.clear_markers() # Remove the markers of the previous image
+            self.image_item.setPixmap(pixmap) # Show the image in the reused image item
+            self.scene.setSceneRect(self.image_item.boundingRect()) # Fit the scene to the new image
+            self.image_selected = True # Set the flag to indicate that an image is loaded
+            self.fitInView(self.image_item, Qt.KeepAspectRatio) # Fit the image to the view
+
+    # Method: prefetch
+    # Description:
+    # Decode and scale images in the background so they display immediately when loaded.
+    # Only the most recently requested images are kept, at most prefetch_limit images and cache_budget bytes.
+    # Input: image_paths - paths to the image files
+    # Output: None
+
+    def prefetch(self, image_paths):
+        for image_path in image_paths:
+            if image_path in self.prefetch_cache:
+                self.prefetch_cache.move_to_end(image_path)
+                continue
+            self.prefetch_cache[image_path] = self.prefetch_executor.submit(self._decode_image, image_path)
+        while len(self.prefetch_cache) > self.prefetch_limit or (
+                len(self.prefetch_cache) > 1 and self.cache_size() > self.cache_budget):
+            _, future = self.prefetch_cache.popitem(last=False)
+            future.cancel()
+
+    # Method: cache_size
+    # Description:
+    # Get the memory used by the decoded images in the cache. Images still being decoded count
+    # as the size of a full 1600x1200 image.
+    # Input: None
+    # Output: size in bytes
+    def cache_size(self):
+        size = 0
+        for future in self.prefetch_cache.values():
+            image = future.result() if future.done() and not future.cancelled() and future.exception() is None else None
+            size += image.sizeInBytes() if image is not None else 1600 * 1200 * 4
+        return size
+
+    # Method: _decode_image
+    # Description:
+    # Decode and scale an image off the GUI thread (QImage, unlike QPixmap, can be used from any thread).
+    # Input: image_path - path to the image file
+    # Output: scaled QImage
+    def _decode_image(self, image_path):
+        return QImage(image_path).scaled(1600, 1200, Qt.KeepAspectRatio)
 
     # Method: mousePressEvent
     # Description:
@@ -100,19 +226,7 @@ class ImageView(QGraphicsView):
          
 
             # Draw a cross centered at the clicked position
-            cross_size = 10 # Size of the cross
-            # Draw horizontal and vertical lines for the cross
-            self.scene.addLine(
-                QLineF(scene_pos.x() - cross_size, scene_pos.y(),
-                       scene_pos.x() + cross_size, scene_pos.y()),
-                self.pen
-            )
-            # Draw vertical line
-            self.scene.addLine(
-                QLineF(scene_pos.x(), scene_pos.y() - cross_size,
-                       scene_pos.x(), scene_pos.y() + cross_size),
-                self.pen
-            )
+            self.draw_cross(scene_pos.x(), scene_pos.y())
 
     # Method: wheelEvent
     # Description:
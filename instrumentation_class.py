@@ -0,0 +1,169 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: instrumentation_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the performance monitor, which records how long the stages of the annotation loop
+# take (image decode, scene rebuild, click to commit, results file I/O, data review parsing and statistics).
+# It is off by default; when it is on, the latest samples of every stage are kept in a ring buffer and
+# summarized as percentiles in a performance report. One monitor (monitor) is shared by the whole application.
+# It is turned on with the "instrumentation" setting or the SFSU_INSTRUMENTATION=1 environment variable.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import contextlib
+import functools
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+# Class: PerformanceMonitor
+# Description:
+# This class provides methods to time stages, keep their latest samples and report percentiles.
+
+class PerformanceMonitor:
+    def __init__(self, capacity=1000):
+        self.enabled = os.environ.get("SFSU_INSTRUMENTATION") == "1"  # Samples are only recorded when enabled
+        self.capacity = capacity  # Number of samples kept per stage
+        self.samples = {}  # Stage name -> deque of durations in seconds, oldest first
+        self.counts = {}  # Stage name -> number of samples recorded, including the ones dropped from the buffer
+
+    # Method: enable
+    # Description:
+    # Turn recording on or off.
+    # Input: enabled - True to record samples (default: True)
+    # Output: None
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    # Method: record
+    # Description:
+    # Add a sample to a stage, dropping the oldest sample when the ring buffer is full.
+    # Input: stage - name of the stage
+    #        seconds - duration of the stage
+    # Output: None
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.capacity)
+            self.counts[stage] = 0
+        self.samples[stage].append(seconds)
+        self.counts[stage] += 1
+
+    # Method: timer
+    # Description:
+    # Context manager that records the duration of its block. Does nothing when recording is off.
+    # Input: stage - name of the stage
+    # Output: context manager
+    def timer(self, stage):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timer(stage)
+
+    @contextlib.contextmanager
+    def _timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    # Method: timed
+    # Description:
+    # Decorator that records the duration of every call of a function.
+    # Input: stage - name of the stage
+    # Output: decorator
+    def timed(self, stage):
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    # Method: percentile
+    # Description:
+    # Compute a percentile of sorted samples with linear interpolation.
+    # Input: sorted_samples - list of samples in increasing order
+    #        percent - percentile between 0 and 100
+    # Output: value of the percentile
+    @staticmethod
+    def percentile(sorted_samples, percent):
+        position = (len(sorted_samples) - 1) * percent / 100
+        lower = int(position)
+        upper = min(lower + 1, len(sorted_samples) - 1)
+        return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+    # Method: summary
+    # Description:
+    # Summarize the samples kept for every stage.
+    # Input: None
+    # Output: dictionary stage -> {count, kept, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}
+    def summary(self):
+        report = {}
+        for stage, samples in sorted(self.samples.items()):
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            report[stage] = {
+                "count": self.counts[stage],
+                "kept": len(ordered),
+                "mean_ms": 1000 * sum(ordered) / len(ordered),
+                "p50_ms": 1000 * self.percentile(ordered, 50),
+                "p90_ms": 1000 * self.percentile(ordered, 90),
+                "p99_ms": 1000 * self.percentile(ordered, 99),
+                "max_ms": 1000 * ordered[-1],
+            }
+        return report
+
+    # Method: format_summary
+    # Description:
+    # Build a text table of the summary.
+    # Input: None
+    # Output: summary text
+    def format_summary(self):
+        lines = [f"{'Stage':<28}{'Count':>8}{'Mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'Max ms':>10}"]
+        for stage, values in self.summary().items():
+            lines.append(f"{stage:<28}{values['count']:>8}{values['mean_ms']:>10.2f}{values['p50_ms']:>10.2f}"
+                         f"{values['p90_ms']:>10.2f}{values['p99_ms']:>10.2f}{values['max_ms']:>10.2f}")
+        return "\n".join(lines)
+
+    # Method: write_report
+    # Description:
+    # Write the summary to a JSON performance report, replacing the old file atomically.
+    # Input: file_path - path of the report
+    # Output: None
+    def write_report(self, file_path):
+        report = {"created": datetime.now().isoformat(timespec="seconds"), "stages": self.summary()}
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(report, file, indent=2)
+        os.replace(temp_path, file_path)
+
+    # Method: clear
+    # Description:
+    # Forget all samples.
+    # Input: None
+    # Output: None
+    def clear(self):
+        self.samples.clear()
+        self.counts.clear()
+
+
+monitor = PerformanceMonitor()  # Performance monitor shared by the whole application
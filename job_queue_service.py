@@ -0,0 +1,230 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: job_queue_service.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the local job queue service. Acquisition PCs submit "process this folder with this
+# calibration profile" jobs as JSON files in the application data folder, and a long running service
+# processes them on a bounded pool of worker processes, highest priority first. Job state is stored in
+# the job files, so jobs interrupted by a restart are queued again, and the GUI can read the job status.
+# Folders are processed with the batch pipeline, so results land in the usual Results/Results_File.txt.
+#
+# Usage:
+# python job_queue_service.py submit FOLDER --profile NAME [--priority N]
+# python job_queue_service.py serve [--workers N]
+# python job_queue_service.py status
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from batch_pipeline import process_folder
+from calibration_profile_class import CalibrationProfileManager
+from file_manger_class import FileManager
+
+# Class: JobQueue
+# Description:
+# This class provides methods to submit, read and update jobs stored as JSON files, and to run the
+# service loop that processes them.
+
+class JobQueue:
+    def __init__(self, queue_folder_path=None):
+        if queue_folder_path is None:
+            file_manager = FileManager()
+            queue_folder_path = file_manager.create_folder(file_manager.create_app_data_folder(), folder_name="Jobs")
+        os.makedirs(queue_folder_path, exist_ok=True)
+        self.queue_folder_path = queue_folder_path  # Folder holding one JSON file per job
+
+    # Method: job_file_path
+    # Description:
+    # Get the path of the file of a job.
+    # Input: job_id - id of the job
+    # Output: path to the job file
+    def job_file_path(self, job_id):
+        return os.path.join(self.queue_folder_path, f"{job_id}.json")
+
+    # Method: write_job
+    # Description:
+    # Write a job to its file, replacing the old file atomically.
+    # Input: job - job dictionary
+    # Output: None
+    def write_job(self, job):
+        file_path = self.job_file_path(job["id"])
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(job, file, indent=2)
+        os.replace(temp_path, file_path)
+
+    # Method: submit
+    # Description:
+    # Add a job to the queue.
+    # Input: folder_path - session folder to process
+    #        profile_name - name of the calibration profile to use
+    #        priority - jobs with a higher priority run first (default: 0)
+    # Output: job - the new job dictionary
+    def submit(self, folder_path, profile_name, priority=0):
+        job = {
+            "id": f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}",
+            "folder": os.path.abspath(folder_path),
+            "profile": profile_name,
+            "priority": priority,
+            "status": "queued",
+            "submitted": datetime.now().isoformat(timespec="seconds"),
+            "started": None,
+            "finished": None,
+            "message": "",
+        }
+        self.write_job(job)
+        return job
+
+    # Method: list_jobs
+    # Description:
+    # Read all jobs, oldest first. Files that cannot be read (e.g. being written) are skipped.
+    # Input: None
+    # Output: list of job dictionaries
+    def list_jobs(self):
+        jobs = []
+        for file_name in os.listdir(self.queue_folder_path):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.queue_folder_path, file_name), "r") as file:
+                    jobs.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return sorted(jobs, key=lambda job: (job["submitted"], job["id"]))
+
+    # Method: update_job
+    # Description:
+    # Update fields of a job and write it back to its file.
+    # Input: job - job dictionary
+    #        fields - fields to update
+    # Output: None
+    def update_job(self, job, **fields):
+        job.update(fields)
+        self.write_job(job)
+
+    # Method: recover_jobs
+    # Description:
+    # Queue jobs again that were running when the service stopped.
+    # Input: None
+    # Output: None
+    def recover_jobs(self):
+        for job in self.list_jobs():
+            if job["status"] == "running":
+                self.update_job(job, status="queued", started=None, message="Requeued after restart")
+
+    # Method: serve
+    # Description:
+    # Process queued jobs until interrupted. At most `workers` jobs run at a time, and the queue
+    # folder is checked for new jobs every poll_interval seconds.
+    # Input: workers - number of worker processes (default: number of CPU cores)
+    #        poll_interval - seconds between checks of the queue folder (default: 1.0)
+    #        profile_manager - manager used to look up calibration profiles (default: the application's)
+    # Output: None
+    def serve(self, workers=None, poll_interval=1.0, profile_manager=None):
+        workers = workers or os.cpu_count() or 1
+        profile_manager = profile_manager or CalibrationProfileManager()
+        self.recover_jobs()
+        running = {}  # Futures of running jobs, keyed by job id
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    # Record finished jobs
+                    for job_id, (job, future) in list(running.items()):
+                        if not future.done():
+                            continue
+                        del running[job_id]
+                        finished = datetime.now().isoformat(timespec="seconds")
+                        try:
+                            trial_count = future.result()[1]
+                            self.update_job(job, status="done", finished=finished,
+                                            message=f"{trial_count} trials written")
+                        except Exception as e:
+                            self.update_job(job, status="failed", finished=finished, message=str(e))
+
+                    # Start the highest priority queued jobs while workers are free
+                    queue = [(-job["priority"], job["submitted"], job["id"], job)
+                             for job in self.list_jobs()
+                             if job["status"] == "queued" and job["id"] not in running]
+                    heapq.heapify(queue)
+                    while queue and len(running) < workers:
+                        job = heapq.heappop(queue)[3]
+                        try:
+                            profile = profile_manager.get_profile(job["profile"])
+                        except KeyError as e:
+                            self.update_job(job, status="failed", message=e.args[0],
+                                            finished=datetime.now().isoformat(timespec="seconds"))
+                            continue
+                        self.update_job(job, status="running", started=datetime.now().isoformat(timespec="seconds"))
+                        running[job["id"]] = (job, executor.submit(process_folder, job["folder"], profile))
+
+                    time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                pass
+
+    # Method: status_summary
+    # Description:
+    # Build a short text summary of the jobs for display.
+    # Input: limit - number of most recent jobs to list (default: 10)
+    # Output: summary text
+    def status_summary(self, limit=10):
+        jobs = self.list_jobs()
+        counts = {}
+        for job in jobs:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        lines = [", ".join(f"{status}: {count}" for status, count in sorted(counts.items())) or "No jobs"]
+        for job in jobs[-limit:]:
+            lines.append(f"[{job['status']}] {job['folder']} ({job['profile']}) {job['message']}".rstrip())
+        return "\n".join(lines)
+
+# Function: main
+# Description:
+# Parse the command line arguments and submit jobs, run the service or print the job status.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local job queue for processing session folders.")
+    parser.add_argument("--queue", help="Queue folder (default: Jobs in the application data folder)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = commands.add_parser("submit", help="Queue a folder for processing")
+    submit_parser.add_argument("folder", help="Session folder to process")
+    submit_parser.add_argument("--profile", required=True, help="Name of the saved calibration profile")
+    submit_parser.add_argument("--priority", type=int, default=0, help="Jobs with a higher priority run first")
+
+    serve_parser = commands.add_parser("serve", help="Process queued jobs until interrupted")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+
+    commands.add_parser("status", help="Show the status of the jobs")
+    args = parser.parse_args(argv)
+
+    job_queue = JobQueue(args.queue)
+    if args.command == "submit":
+        job = job_queue.submit(args.folder, args.profile, args.priority)
+        print(f"Submitted job {job['id']}")
+    elif args.command == "serve":
+        job_queue.serve(workers=args.workers)
+    else:
+        print(job_queue.status_summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
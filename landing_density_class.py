@@ -0,0 +1,115 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: landing_density_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the landing density manager, which bins the landing positions of the
+# puck on the 9x9 grid (3 cm squares) for the density heatmap of the data review page. The positions are
+# binned once per group (participant and block); filtering by participant or block only adds up the
+# counts of the selected groups, so the raw trials are never binned again.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import numpy as np
+from collections import OrderedDict
+
+GRID_SQUARES = 9  # Number of squares per side of the grid
+SQUARE_SIZE = 3.0  # Size of a grid square in cm
+GRID_HALF_SIZE = GRID_SQUARES * SQUARE_SIZE / 2  # Distance from the target to the edge of the grid in cm
+
+# Class: LandingDensityManager
+# Description:
+# This class provides methods to bin landing positions per group, cache the bins and build the density
+# of any selection of groups.
+
+class LandingDensityManager:
+    def __init__(self, bin_size=0.5, margin=4.5, cache_limit=8):
+        self.bin_size = bin_size  # Size of a bin in cm
+        self.extent = GRID_HALF_SIZE + margin  # Binned area goes from -extent to +extent on both axes
+        self.bin_count = int(round(2 * self.extent / bin_size))  # Number of bins per side
+        self.cache = OrderedDict()  # Bins keyed by data source, oldest first
+        self.cache_limit = cache_limit  # Maximum number of binned data sources kept in the cache
+
+    # Method: bin_positions
+    # Description:
+    # Count the landing positions of every group in a 2D histogram. Positions outside the binned area are dropped.
+    # The group of a position is its (participant, block) pair; the pairs are numbered with NumPy, so no
+    # Python object is built per position.
+    # Input: horizontal - array of horizontal positions in cm (Y-Axis values)
+    #        vertical - array of vertical positions in cm (X-Axis values)
+    #        participants - array with the participant number of every position
+    #        blocks - array with the block number (from 1) of every position
+    # Output: (groups, counts) - list of (participant, block) group keys and an array of shape
+    #         (groups, bins, bins), indexed [group, vertical bin, horizontal bin]
+    def bin_positions(self, horizontal, vertical, participants, blocks):
+        blocks = np.asarray(blocks, dtype=np.int64)
+        block_stride = int(blocks.max()) + 1 if len(blocks) else 1
+        keys = np.asarray(participants, dtype=np.int64) * block_stride + blocks
+        unique_keys, group_ids = np.unique(keys, return_inverse=True)
+        group_ids = group_ids.reshape(-1)
+        groups = [(int(key) // block_stride, int(key) % block_stride) for key in unique_keys.tolist()]
+
+        columns = np.floor((np.asarray(horizontal, dtype=np.float64) + self.extent) / self.bin_size).astype(np.int64)
+        rows = np.floor((np.asarray(vertical, dtype=np.float64) + self.extent) / self.bin_size).astype(np.int64)
+        inside = (columns >= 0) & (columns < self.bin_count) & (rows >= 0) & (rows < self.bin_count)
+
+        flat = (group_ids[inside] * self.bin_count + rows[inside]) * self.bin_count + columns[inside]
+        counts = np.bincount(flat, minlength=len(groups) * self.bin_count * self.bin_count)
+        return groups, counts.reshape(len(groups), self.bin_count, self.bin_count)
+
+    # Method: get_bins
+    # Description:
+    # Get the bins of a data source, binning its positions only if they are not cached yet.
+    # Input: source_key - key that changes when the data changes (e.g. file path and modification time)
+    #        horizontal, vertical, participants, blocks - same as bin_positions
+    # Output: (groups, counts) - same as bin_positions
+    def get_bins(self, source_key, horizontal, vertical, participants, blocks):
+        if source_key in self.cache:
+            self.cache.move_to_end(source_key)
+            return self.cache[source_key]
+        bins = self.bin_positions(horizontal, vertical, participants, blocks)
+        self.cache[source_key] = bins
+        while len(self.cache) > self.cache_limit:
+            self.cache.popitem(last=False)
+        return bins
+
+    # Method: density
+    # Description:
+    # Add up the counts of the selected groups and smooth them with a Gaussian kernel (a binned kernel
+    # density estimate).
+    # Input: groups - list of group keys returned by get_bins
+    #        counts - array of counts returned by get_bins
+    #        selected - function that returns True for the group keys to include, or None for all groups
+    #        bandwidth - standard deviation of the kernel in cm, or 0 for the raw histogram (default: 1.0)
+    # Output: density - array of shape (bins, bins) with the (smoothed) number of trials per bin
+    def density(self, groups, counts, selected=None, bandwidth=1.0):
+        if selected is not None:
+            mask = np.array([bool(selected(key)) for key in groups], dtype=bool)
+            counts = counts[mask]
+        total = counts.sum(axis=0).astype(np.float64)
+        if bandwidth <= 0:
+            return total
+
+        sigma = bandwidth / self.bin_size
+        radius = int(np.ceil(3 * sigma))
+        offsets = np.arange(-radius, radius + 1)
+        kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        kernel /= kernel.sum()
+        # The Gaussian kernel is separable: smooth the rows, then the columns
+        total = np.apply_along_axis(np.convolve, 1, total, kernel, mode="same")
+        return np.apply_along_axis(np.convolve, 0, total, kernel, mode="same")
+
+    # Method: image_extent
+    # Description:
+    # Get the extent of the density image for plotting.
+    # Input: None
+    # Output: (left, right, bottom, top) in cm
+    def image_extent(self):
+        return (-self.extent, self.extent, -self.extent, self.extent)
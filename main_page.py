@@ -16,18 +16,19 @@
 # File Description:
 # This file contains the code for the main window of the application and initializes 
 # the main menu, linking it to the calibration, data review, and image editing pages.
+# The pages (and the libraries they need, such as pandas and matplotlib) are only imported
+# and built the first time they are used, so the main menu appears quickly.
 #
 ############################################################################################
 
 # Importing necessary libraries
 import sys
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QLabel, QStackedWidget
+    QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QLabel, QStackedWidget, QFileDialog
 )
 from PyQt5.QtCore import Qt
-from calibration_page import CalibrationPage
-from data_review_page import DataReviewPage
-from image_editing_page import EditPage
+from settings_class import SettingsManager
+from instrumentation_class import monitor
 
 # Class: MainWindow
 # Description:
@@ -45,26 +46,70 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)  # Display the top widget on the stack
 
-        # Add pages to the stack
-        self.main_menu = MainMenu(self)
-        self.calibration_page = CalibrationPage(self)
-        self.edit_page = EditPage(self)
-        self.data_review_page = DataReviewPage(self)
+        # Settings shared by all pages
+        self.settings_manager = SettingsManager()
+        if self.settings_manager.get("instrumentation"):
+            monitor.enable()
 
+        # Add the main menu to the stack; the other pages are added when first used
+        self.main_menu = MainMenu(self)
         self.stack.addWidget(self.main_menu)          # Main menu page
-        self.stack.addWidget(self.calibration_page)   # Calibration page
-        self.stack.addWidget(self.edit_page)          # Image editing page
-        self.stack.addWidget(self.data_review_page)   # Data review page
+        self._calibration_page = None                 # Calibration page, built on first use
+        self._edit_page = None                        # Image editing page, built on first use
+        self._data_review_page = None                 # Data review page, built on first use
 
         # Connect main menu buttons to switch pages
         self.main_menu.select_button.clicked.connect(
             lambda: self.stack.setCurrentWidget(self.calibration_page)
         )
+        self.main_menu.resume_button.clicked.connect(self.resume_session)
         self.main_menu.review_button.clicked.connect(
             lambda: self.stack.setCurrentWidget(self.data_review_page)
         )
         self.main_menu.exit_button.clicked.connect(self.close)
 
+    def closeEvent(self, event):
+        """Write the performance report of the open session before the window closes."""
+        if self._edit_page is not None:
+            self._edit_page.write_performance_report()
+        super().closeEvent(event)
+
+    @property
+    def calibration_page(self):
+        """Calibration page, imported and built the first time it is used."""
+        if self._calibration_page is None:
+            from calibration_page import CalibrationPage
+            self._calibration_page = CalibrationPage(self)
+            self.stack.addWidget(self._calibration_page)
+        return self._calibration_page
+
+    @property
+    def edit_page(self):
+        """Image editing page, imported and built the first time it is used."""
+        if self._edit_page is None:
+            from image_editing_page import EditPage
+            self._edit_page = EditPage(self)
+            self.stack.addWidget(self._edit_page)
+        return self._edit_page
+
+    @property
+    def data_review_page(self):
+        """Data review page, imported and built the first time it is used."""
+        if self._data_review_page is None:
+            from data_review_page import DataReviewPage
+            self._data_review_page = DataReviewPage(self)
+            self.stack.addWidget(self._data_review_page)
+        return self._data_review_page
+
+    def resume_session(self):
+        """Select a session folder and continue annotating where the saved session stopped."""
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Session Folder")
+        if not folder_path:
+            return
+        ok, shard = self.edit_page.choose_shard(folder_path)
+        if ok and self.edit_page.restore_session(folder_path, shard):
+            self.stack.setCurrentWidget(self.edit_page)
+
 # Class: MainMenu
 # Description:
 # Represents the main menu page with buttons to start image processing, review data, or exit the program.
@@ -85,6 +130,11 @@ class MainMenu(QWidget):
         self.select_button.setStyleSheet("font-size: 20px")
         layout.addWidget(self.select_button)
 
+        # Button to resume a saved session (navigate to image editing page)
+        self.resume_button = QPushButton("Resume Session")
+        self.resume_button.setStyleSheet("font-size: 20px")
+        layout.addWidget(self.resume_button)
+
         # Button to review data (navigate to data review page)
         self.review_button = QPushButton("Review Data")
         self.review_button.setStyleSheet("font-size: 20px")
@@ -0,0 +1,197 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: manifest_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the manifest manager, which keeps a cached list of the images in a
+# session folder (file name, size, modification time, capture time and content hash) in the Results
+# folder. The manifest gives the images a deterministic order (natural or capture-time order) and is
+# updated incrementally, so only new or changed files are read when a folder is opened again.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import hashlib
+import json
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Class: ManifestManager
+# Description:
+# This class provides methods to build, update and order the manifest of a session folder.
+
+class ManifestManager:
+    MANIFEST_FILE_NAME = "Manifest.json"
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)  # Threads used to hash files
+
+    # Method: natural_sort_key
+    # Description:
+    # Build a sort key that orders numbers inside file names by value, so IMG_2 comes before IMG_10.
+    # Input: file_name - name of the file
+    # Output: sort key
+    @staticmethod
+    def natural_sort_key(file_name):
+        return [(0, int(part), "") if part.isdigit() else (1, 0, part.lower())
+                for part in re.split(r"(\d+)", file_name)]
+
+    # Method: load_manifest
+    # Description:
+    # Read the manifest from the Results folder. A missing or unreadable manifest is treated as empty.
+    # Input: results_folder_path - path to the Results folder
+    # Output: entries - dictionary of manifest entries keyed by file name
+    def load_manifest(self, results_folder_path):
+        manifest_path = os.path.join(results_folder_path, self.MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r") as file:
+                return json.load(file).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    # Method: save_manifest
+    # Description:
+    # Write the manifest to the Results folder, replacing the old file atomically.
+    # Input: results_folder_path - path to the Results folder
+    #        entries - dictionary of manifest entries keyed by file name
+    # Output: None
+    def save_manifest(self, results_folder_path, entries):
+        manifest_path = os.path.join(results_folder_path, self.MANIFEST_FILE_NAME)
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"version": 1, "files": entries}, file, indent=1)
+        os.replace(temp_path, manifest_path)
+
+    # Method: update_manifest
+    # Description:
+    # Scan the folder with os.scandir and update the manifest. Files whose size and modification time
+    # are unchanged keep their cached entry, new or changed files are hashed in a thread pool, and
+    # entries for deleted files are dropped. The manifest is only written if something changed.
+    # Input: folder_path - path to the folder containing images
+    #        results_folder_path - path to the Results folder
+    # Output: entries - dictionary of manifest entries keyed by file name
+    def update_manifest(self, folder_path, results_folder_path):
+        cached_entries = self.load_manifest(results_folder_path)
+        entries = {}
+        changed_files = []
+
+        with os.scandir(folder_path) as folder_entries:
+            for folder_entry in folder_entries:
+                if not folder_entry.name.lower().endswith(self.IMAGE_EXTENSIONS) or not folder_entry.is_file():
+                    continue
+                stat = folder_entry.stat()
+                cached = cached_entries.get(folder_entry.name)
+                if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+                    entries[folder_entry.name] = cached
+                else:
+                    entries[folder_entry.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                    changed_files.append(folder_entry.name)
+
+        # Hash and read the capture time of new or changed files in parallel
+        if changed_files:
+            paths = [os.path.join(folder_path, name) for name in changed_files]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for name, (content_hash, captured) in zip(changed_files, executor.map(self.read_file_details, paths)):
+                    entries[name]["hash"] = content_hash
+                    entries[name]["captured"] = captured
+
+        if changed_files or len(entries) != len(cached_entries):
+            self.save_manifest(results_folder_path, entries)
+        return entries
+
+    # Method: ordered_file_names
+    # Description:
+    # Order the files of a manifest. Capture-time order falls back to the modification time for files
+    # without a capture timestamp, and ties are broken by natural file name order.
+    # Input: entries - dictionary of manifest entries keyed by file name
+    #        order - "natural" or "capture" (default: "natural")
+    # Output: list of file names
+    def ordered_file_names(self, entries, order="natural"):
+        if order == "capture":
+            def capture_key(name):
+                entry = entries[name]
+                captured = entry.get("captured") or datetime.fromtimestamp(entry["mtime_ns"] / 1e9).isoformat()
+                return captured, self.natural_sort_key(name)
+            return sorted(entries, key=capture_key)
+        if order != "natural":
+            raise ValueError(f"Unknown file order: {order}")
+        return sorted(entries, key=self.natural_sort_key)
+
+    # Method: read_file_details
+    # Description:
+    # Compute the content hash of a file and read its capture time.
+    # Input: file_path - path to the image file
+    # Output: (content_hash, captured) - BLAKE2b hex digest and ISO capture time (or None)
+    def read_file_details(self, file_path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as file:
+            head = file.read(65536)
+            digest.update(head)
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest(), self.read_capture_time(head)
+
+    # Method: read_capture_time
+    # Description:
+    # Read the EXIF DateTimeOriginal (or DateTime) tag from the start of a JPEG file.
+    # Input: head - first bytes of the file
+    # Output: capture time as an ISO string, or None if the file has no EXIF timestamp
+    def read_capture_time(self, head):
+        if head[:2] != b"\xff\xd8":
+            return None
+        position = 2
+        try:
+            while position + 4 <= len(head) and head[position] == 0xFF:
+                marker = head[position + 1]
+                length = struct.unpack(">H", head[position + 2:position + 4])[0]
+                if marker == 0xE1 and head[position + 4:position + 10] == b"Exif\x00\x00":
+                    return self._read_exif_timestamp(head[position + 10:position + 2 + length])
+                if marker == 0xDA:  # Start of scan, no more metadata
+                    return None
+                position += 2 + length
+        except (struct.error, IndexError, ValueError):
+            return None
+        return None
+
+    # Method: _read_exif_timestamp
+    # Description:
+    # Find the capture time in the TIFF structure of an EXIF segment.
+    # Input: tiff - bytes of the TIFF structure
+    # Output: capture time as an ISO string, or None
+    def _read_exif_timestamp(self, tiff):
+        endian = "<" if tiff[:2] == b"II" else ">"
+
+        def read_ifd(offset):
+            count = struct.unpack(endian + "H", tiff[offset:offset + 2])[0]
+            tags = {}
+            for index in range(count):
+                entry = offset + 2 + index * 12
+                tag, value_type, value_count, value = struct.unpack(endian + "HHII", tiff[entry:entry + 12])
+                tags[tag] = (value_type, value_count, value)
+            return tags
+
+        def read_text(tag_value):
+            _, value_count, value_offset = tag_value
+            text = tiff[value_offset:value_offset + value_count].split(b"\x00")[0].decode("ascii")
+            return datetime.strptime(text.strip(), "%Y:%m:%d %H:%M:%S").isoformat()
+
+        ifd0 = read_ifd(struct.unpack(endian + "I", tiff[4:8])[0])
+        if 0x8769 in ifd0:  # Pointer to the Exif IFD
+            exif_ifd = read_ifd(ifd0[0x8769][2])
+            if 0x9003 in exif_ifd:  # DateTimeOriginal
+                return read_text(exif_ifd[0x9003])
+        if 0x0132 in ifd0:  # DateTime
+            return read_text(ifd0[0x0132])
+        return None
@@ -0,0 +1,265 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: plot_interface.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the plot interface, which draws the Z-Axis, Y-Axis and X-Axis values
+# against the image trial inside the data review page. New trials are added with blitting (only the lines
+# are redrawn over a cached background), and long series are reduced with min/max decimation so the
+# plots stay interactive with hundreds of thousands of trials. It also draws the landing positions of the
+# puck over the 9x9 grid, as a scatter or as a density heatmap for large datasets.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.widgets import LassoSelector
+from PyQt5.QtCore import pyqtSignal
+from landing_density_class import GRID_SQUARES, SQUARE_SIZE, GRID_HALF_SIZE
+
+# Name and color of the plot of each axis
+PLOT_AXES = [("Z-Axis", "tab:blue"), ("Y-Axis", "green"), ("X-Axis", "red")]
+
+# Function: minmax_decimate
+# Description:
+# Reduce a series to the minimum and maximum of each of a fixed number of buckets. Unlike taking every
+# n-th point, this keeps every spike of the series visible.
+# Input: x - array of x values
+#        y - array of y values
+#        bucket_count - number of buckets
+# Output: (x, y) - the decimated series, or the original series if it is short enough
+
+def minmax_decimate(x, y, bucket_count):
+    count = len(x)
+    if count <= 2 * bucket_count:
+        return x, y
+    bucket_size = count // bucket_count
+    used = bucket_size * bucket_count
+    buckets = y[:used].reshape(bucket_count, bucket_size)
+    offsets = np.arange(bucket_count) * bucket_size
+    indices = np.concatenate([buckets.argmin(axis=1) + offsets, buckets.argmax(axis=1) + offsets,
+                              np.arange(used, count)])
+    indices = np.unique(indices)  # Sorted, and a bucket whose min and max are the same point is kept once
+    return x[indices], y[indices]
+
+# Class: TrialPlotCanvas
+# Description:
+# This class is a Qt widget with one plot per axis. The lines are animated artists: a full redraw only
+# happens when the data no longer fits the axis limits, otherwise the cached background is restored and
+# the lines are drawn on top of it.
+
+class TrialPlotCanvas(FigureCanvasQTAgg):
+
+    # Constructor
+    # Creates the figure, the three plots and the empty trial buffers.
+    def __init__(self, parent=None, max_points=2000):
+        self.figure = Figure(figsize=(8, 6), tight_layout=True)
+        super().__init__(self.figure)
+        self.setParent(parent)
+
+        self.max_points = max_points  # Largest number of points drawn per line
+        self.trials = np.empty(0, dtype=np.float64)  # Buffer of trial numbers (grows by doubling)
+        self.values = np.empty((0, 3), dtype=np.float64)  # Buffer of (zaxis, yaxis, xaxis) per trial
+        self.count = 0  # Number of trials in the buffers
+        self.background = None  # Cached figure without the lines, used for blitting
+
+        self.plot_axes = self.figure.subplots(3, 1, sharex=True)
+        self.lines = []
+        for axes, (name, color) in zip(self.plot_axes, PLOT_AXES):
+            line, = axes.plot([], [], color=color, marker="o", markersize=3, label=name, animated=True)
+            axes.set_ylabel(name)
+            axes.grid(True)
+            self.lines.append(line)
+        self.plot_axes[0].set_title("Axis Values vs. Image Trial")
+        self.plot_axes[-1].set_xlabel("Image Trial")
+
+        self.mpl_connect("draw_event", self.on_draw)
+
+    # Method: on_draw
+    # Description:
+    # Cache the background after a full redraw and draw the lines over it.
+    # Input: event - matplotlib draw event
+    # Output: None
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        self.draw_lines()
+
+    # Method: draw_lines
+    # Description:
+    # Draw the animated lines on the canvas.
+    # Input: None
+    # Output: None
+    def draw_lines(self):
+        for axes, line in zip(self.plot_axes, self.lines):
+            axes.draw_artist(line)
+
+    # Method: set_series
+    # Description:
+    # Replace all plotted trials.
+    # Input: trials - sequence of trial numbers
+    #        values - sequence of (zaxis, yaxis, xaxis) per trial
+    # Output: None
+    def set_series(self, trials, values):
+        self.count = 0
+        self.append(trials, values, rescale=True)
+
+    # Method: append
+    # Description:
+    # Add new trials to the plots. Only the lines are redrawn unless the new trials fall outside the
+    # current axis limits.
+    # Input: trials - sequence of trial numbers
+    #        values - sequence of (zaxis, yaxis, xaxis) per trial
+    #        rescale - True to recompute the axis limits and redraw everything (default: False)
+    # Output: None
+    def append(self, trials, values, rescale=False):
+        trials = np.asarray(trials, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+        needed = self.count + len(trials)
+        if needed > len(self.trials):
+            capacity = max(needed, 2 * len(self.trials), 256)
+            self.trials = np.resize(self.trials, capacity)
+            self.values = np.resize(self.values, (capacity, 3))
+        self.trials[self.count:needed] = trials
+        self.values[self.count:needed] = values
+        self.count = needed
+
+        self.update_lines()
+        if rescale or self.background is None or not self.fits_limits(trials, values):
+            self.rescale()
+            self.draw_idle()
+        else:
+            self.restore_region(self.background)
+            self.draw_lines()
+            self.blit(self.figure.bbox)
+
+    # Method: update_lines
+    # Description:
+    # Set the (decimated) data of the lines. Markers are only drawn for short series.
+    # Input: None
+    # Output: None
+    def update_lines(self):
+        trials = self.trials[:self.count]
+        bucket_count = self.max_points // 2
+        for axis_index, line in enumerate(self.lines):
+            x, y = minmax_decimate(trials, self.values[:self.count, axis_index], bucket_count)
+            line.set_data(x, y)
+            line.set_marker("o" if self.count <= 500 else "")
+
+    # Method: fits_limits
+    # Description:
+    # Check if new trials fall inside the current axis limits.
+    # Input: trials - array of new trial numbers
+    #        values - array of new (zaxis, yaxis, xaxis) per trial
+    # Output: True if the new trials can be drawn without changing the limits
+    def fits_limits(self, trials, values):
+        if len(trials) == 0:
+            return True
+        x_low, x_high = self.plot_axes[0].get_xlim()
+        if trials.min() < x_low or trials.max() > x_high:
+            return False
+        for axis_index, axes in enumerate(self.plot_axes):
+            y_low, y_high = axes.get_ylim()
+            if values[:, axis_index].min() < y_low or values[:, axis_index].max() > y_high:
+                return False
+        return True
+
+    # Method: rescale
+    # Description:
+    # Set the axis limits to the data, with some room on the right and around the values so the next
+    # trials can usually be added with blitting.
+    # Input: None
+    # Output: None
+    def rescale(self):
+        if self.count == 0:
+            return
+        trials = self.trials[:self.count]
+        x_low, x_high = trials.min(), trials.max()
+        self.plot_axes[0].set_xlim(x_low - 1, x_high + max(10, 0.1 * (x_high - x_low)))
+        for axis_index, axes in enumerate(self.plot_axes):
+            column = self.values[:self.count, axis_index]
+            y_low, y_high = column.min(), column.max()
+            margin = max(1.0, 0.1 * (y_high - y_low))
+            axes.set_ylim(y_low - margin, y_high + margin)
+
+# Class: LandingPlotCanvas
+# Description:
+# This class is a Qt widget that draws the 9x9 grid (3 cm squares) with the target at its center, and the
+# landing positions of the puck either as a scatter or as a density image. Clicking or drawing a lasso
+# on the map emits the drawn path, and selected trials are highlighted.
+
+class LandingPlotCanvas(FigureCanvasQTAgg):
+    region_selected = pyqtSignal(object)  # Signal emitted with the (x, y) vertices of a click or lasso
+
+    # Constructor
+    # Creates the figure, the grid, an empty scatter and an empty density image.
+    def __init__(self, parent=None, extent=GRID_HALF_SIZE + 4.5):
+        self.figure = Figure(figsize=(6, 6), tight_layout=True)
+        super().__init__(self.figure)
+        self.setParent(parent)
+
+        self.axes = self.figure.add_subplot(1, 1, 1)
+        for square in range(GRID_SQUARES + 1):
+            position = -GRID_HALF_SIZE + square * SQUARE_SIZE
+            self.axes.axhline(position, color="gray", linewidth=0.8, zorder=1)
+            self.axes.axvline(position, color="gray", linewidth=0.8, zorder=1)
+        self.axes.plot([0], [0], marker="+", color="black", markersize=14, zorder=4)
+        self.axes.set_xlim(-extent, extent)
+        self.axes.set_ylim(-extent, extent)
+        self.axes.set_aspect("equal")
+        self.axes.set_xlabel("Y-Axis (cm)")
+        self.axes.set_ylabel("X-Axis (cm)")
+        self.axes.set_title("Landing Positions")
+
+        self.scatter = self.axes.scatter([], [], s=12, color="tab:blue", alpha=0.6, zorder=3)
+        self.density_image = self.axes.imshow(np.zeros((2, 2)), origin="lower", cmap="viridis",
+                                              extent=(-extent, extent, -extent, extent), zorder=2, visible=False)
+        self.selection_scatter = self.axes.scatter([], [], s=40, facecolors="none", edgecolors="orange",
+                                                   linewidths=1.5, zorder=5)
+        self.lasso = LassoSelector(self.axes, self.region_selected.emit)
+
+    # Method: show_positions
+    # Description:
+    # Draw the landing positions as a scatter.
+    # Input: horizontal - array of horizontal positions in cm (Y-Axis values)
+    #        vertical - array of vertical positions in cm (X-Axis values)
+    # Output: None
+    def show_positions(self, horizontal, vertical):
+        self.scatter.set_offsets(np.column_stack([horizontal, vertical]))
+        self.scatter.set_visible(True)
+        self.density_image.set_visible(False)
+        self.axes.set_title(f"Landing Positions ({len(horizontal)} trials)")
+        self.draw_idle()
+
+    # Method: show_density
+    # Description:
+    # Draw the landing positions as a density image.
+    # Input: density - array of shape (bins, bins) indexed [vertical bin, horizontal bin]
+    #        extent - (left, right, bottom, top) of the binned area in cm
+    #        trial_count - number of trials in the density
+    # Output: None
+    def show_density(self, density, extent, trial_count):
+        self.density_image.set_data(density)
+        self.density_image.set_extent(extent)
+        self.density_image.set_clim(0, max(float(density.max()), 1e-9))
+        self.density_image.set_visible(True)
+        self.scatter.set_visible(False)
+        self.axes.set_title(f"Landing Density ({trial_count} trials)")
+        self.draw_idle()
+
+    # Method: show_selection
+    # Description:
+    # Highlight the selected landing positions.
+    # Input: horizontal - array of horizontal positions in cm (Y-Axis values)
+    #        vertical - array of vertical positions in cm (X-Axis values)
+    # Output: None
+    def show_selection(self, horizontal, vertical):
+        self.selection_scatter.set_offsets(np.column_stack([horizontal, vertical]))
+        self.draw_idle()
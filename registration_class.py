@@ -0,0 +1,181 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: registration_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the registration manager, which estimates how far the camera moved
+# between the calibration image and every other image of a session. The translation is estimated by
+# FFT phase correlation on small grayscale copies of the images, and the images are processed in a
+# worker pool so the estimates are ready by the time the user reaches each image.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt
+
+# Class: RegistrationManager
+# Description:
+# This class provides methods to load downsampled grayscale images and estimate the translation
+# between two images with phase correlation. Shifts are returned as a fraction of the image width
+# and height so they can be applied to points in any scaled copy of the image.
+
+class RegistrationManager:
+    def __init__(self, max_size=256, max_workers=None):
+        self.max_size = max_size  # Longest side of the downsampled images in pixels
+        self.max_workers = max_workers or os.cpu_count() or 1  # Number of worker threads
+        self.executor = None  # Worker pool, created on first use
+        self.priority_executor = None  # Single worker for images needed before their turn in the pool
+        self.reference_path = None  # Path to the reference (calibration) image
+        self.reference_image = None  # Downsampled grayscale reference image
+        self.futures = {}  # Pending or finished shift estimates keyed by image path
+
+    # Method: load_grayscale
+    # Description:
+    # Load an image, downsample it so its longest side is max_size pixels and convert it to grayscale.
+    # Input: image_path - path to the image file
+    # Output: image - 2D float32 NumPy array
+    def load_grayscale(self, image_path):
+        image = QImage(image_path)
+        if image.isNull():
+            raise FileNotFoundError(f"Image could not be loaded: {image_path}")
+        image = image.scaled(
+            self.max_size, self.max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+        ).convertToFormat(QImage.Format_Grayscale8)
+
+        # Copy the pixels into a NumPy array, dropping the row padding Qt adds to each scan line
+        width, height, stride = image.width(), image.height(), image.bytesPerLine()
+        pointer = image.constBits()
+        pointer.setsize(height * stride)
+        pixels = np.frombuffer(pointer, dtype=np.uint8).reshape(height, stride)[:, :width]
+        return pixels.astype(np.float32)
+
+    # Method: estimate_shift
+    # Description:
+    # Estimate the translation of an image relative to a reference image using phase correlation.
+    # A Hann window is applied to suppress edge effects and the correlation peak is refined to
+    # sub-pixel precision with a parabolic fit.
+    # Input: reference - 2D array of the reference image
+    #        image - 2D array of the image to register
+    # Output: (dx, dy) - shift of the image as a fraction of the image width and height
+    def estimate_shift(self, reference, image):
+        # Crop both images to their common size
+        height = min(reference.shape[0], image.shape[0])
+        width = min(reference.shape[1], image.shape[1])
+        reference = reference[:height, :width]
+        image = image[:height, :width]
+
+        window = np.outer(np.hanning(height), np.hanning(width)).astype(np.float32)
+        reference_fft = np.fft.rfft2((reference - reference.mean()) * window)
+        image_fft = np.fft.rfft2((image - image.mean()) * window)
+
+        # Normalized cross-power spectrum, its inverse peaks at the translation
+        cross_power = np.conj(reference_fft) * image_fft
+        cross_power /= np.abs(cross_power) + 1e-12
+        correlation = np.fft.irfft2(cross_power, s=(height, width))
+
+        peak_y, peak_x = np.unravel_index(np.argmax(correlation), correlation.shape)
+        dy = peak_y + self._refine_peak(correlation[(peak_y - 1) % height, peak_x],
+                                        correlation[peak_y, peak_x],
+                                        correlation[(peak_y + 1) % height, peak_x])
+        dx = peak_x + self._refine_peak(correlation[peak_y, (peak_x - 1) % width],
+                                        correlation[peak_y, peak_x],
+                                        correlation[peak_y, (peak_x + 1) % width])
+
+        # Peaks past the middle correspond to negative shifts
+        if dy > height / 2:
+            dy -= height
+        if dx > width / 2:
+            dx -= width
+        return dx / width, dy / height
+
+    # Method: _refine_peak
+    # Description:
+    # Fit a parabola through three neighbouring correlation values and return the offset of its vertex.
+    # Input: left, center, right - correlation values around the peak
+    # Output: offset - sub-pixel offset in the range [-0.5, 0.5]
+    def _refine_peak(self, left, center, right):
+        denominator = left - 2 * center + right
+        if denominator == 0:
+            return 0.0
+        return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+
+    # Method: _register_image
+    # Description:
+    # Load an image and estimate its shift relative to the reference image (runs in the worker pool).
+    # Input: image_path - path to the image file
+    # Output: (dx, dy) - shift as a fraction of the image width and height
+    def _register_image(self, image_path):
+        if image_path == self.reference_path:
+            return 0.0, 0.0
+        return self.estimate_shift(self.reference_image, self.load_grayscale(image_path))
+
+    # Method: start
+    # Description:
+    # Set the reference image and queue shift estimates for the given images in the worker pool.
+    # Any estimates still pending for a previous session are cancelled.
+    # Input: reference_path - path to the calibration image
+    #        image_paths - paths of the images to register
+    # Output: None
+    def start(self, reference_path, image_paths):
+        self.cancel()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self.priority_executor = ThreadPoolExecutor(max_workers=1)
+        self.reference_path = reference_path
+        self.reference_image = self.load_grayscale(reference_path)
+        self.submit(image_paths)
+
+    # Method: submit
+    # Description:
+    # Queue shift estimates for images that have not been registered yet.
+    # Input: image_paths - paths of the images to register
+    # Output: None
+    def submit(self, image_paths):
+        if self.executor is None or self.reference_image is None:
+            return
+        for image_path in image_paths:
+            if image_path not in self.futures:
+                self.futures[image_path] = self.executor.submit(self._register_image, image_path)
+
+    # Method: get_shift
+    # Description:
+    # Return the shift of an image, waiting for its estimate if it is not finished yet. An estimate that
+    # is still queued (for example when the user jumps to a trial far ahead in the queue) is moved to the
+    # priority worker instead of waiting for the images queued before it, and an estimate that is already
+    # running is waited for, so an image is never registered twice or on the calling (GUI) thread.
+    # Images that could not be registered are treated as not shifted.
+    # Input: image_path - path to the image file
+    # Output: (dx, dy) - shift as a fraction of the image width and height
+    def get_shift(self, image_path):
+        if self.reference_image is None:
+            return 0.0, 0.0
+        future = self.futures.get(image_path)
+        if future is None or future.cancel():
+            future = self.priority_executor.submit(self._register_image, image_path)
+            self.futures[image_path] = future
+        try:
+            return future.result()
+        except Exception:
+            return 0.0, 0.0
+
+    # Method: cancel
+    # Description:
+    # Cancel pending shift estimates and forget the current reference image.
+    # Input: None
+    # Output: None
+    def cancel(self):
+        for future in self.futures.values():
+            future.cancel()
+        self.futures = {}
+        self.reference_path = None
+        self.reference_image = None
@@ -0,0 +1,128 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: reliability_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the reliability manager, which compares the results of two or more
+# raters who annotated the same trials. Trials are aligned by their key (trial index, or session and trial
+# index when whole studies are compared), and the agreement is measured with the intraclass correlation
+# (ICC), Bland-Altman limits of agreement and the mean absolute disagreement, computed for all trials and
+# axes at once with NumPy.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import numpy as np
+
+AXIS_NAMES = ["Z-Axis", "Y-Axis", "X-Axis"]
+
+# Class: ReliabilityManager
+# Description:
+# This class provides methods to align the results of several raters and compute agreement statistics.
+
+class ReliabilityManager:
+
+    # Method: align
+    # Description:
+    # Align the results of several raters on the trials that all of them annotated.
+    # Input: datasets - list (one per rater) of rows [key, zaxis, yaxis, xaxis], where key is the trial
+    #                   index or a (session, trial) tuple
+    # Output: (keys, values) - sorted common keys and an array of shape (raters, trials, 3)
+    def align(self, datasets):
+        if len(datasets) < 2:
+            raise ValueError("At least two results files are needed for a comparison.")
+        lookups = [{row[0]: row[1:4] for row in rows} for rows in datasets]
+        keys = sorted(set.intersection(*(set(lookup) for lookup in lookups)))
+        if len(keys) < 2:
+            raise ValueError("The results files have fewer than two trials in common.")
+        values = np.array([[lookup[key] for key in keys] for lookup in lookups], dtype=np.float64)
+        return keys, values
+
+    # Method: icc
+    # Description:
+    # Compute the two-way random effects, absolute agreement, single rater intraclass correlation ICC(2,1)
+    # of every axis at once.
+    # Input: values - array of shape (raters, trials, axes)
+    # Output: icc - array with one ICC per axis
+    def icc(self, values):
+        raters, trials = values.shape[0], values.shape[1]
+        grand_mean = values.mean(axis=(0, 1))
+        trial_means = values.mean(axis=0)
+        rater_means = values.mean(axis=1)
+
+        mean_square_trials = raters * ((trial_means - grand_mean) ** 2).sum(axis=0) / (trials - 1)
+        mean_square_raters = trials * ((rater_means - grand_mean) ** 2).sum(axis=0) / (raters - 1)
+        residuals = values - trial_means[None, :, :] - rater_means[:, None, :] + grand_mean
+        mean_square_error = (residuals ** 2).sum(axis=(0, 1)) / ((trials - 1) * (raters - 1))
+
+        denominator = (mean_square_trials + (raters - 1) * mean_square_error
+                       + raters * (mean_square_raters - mean_square_error) / trials)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(denominator != 0, (mean_square_trials - mean_square_error) / denominator, np.nan)
+
+    # Method: bland_altman
+    # Description:
+    # Compute the Bland-Altman bias and 95% limits of agreement between two raters for every axis.
+    # Input: first, second - arrays of shape (trials, axes)
+    # Output: (bias, lower, upper) - arrays with one value per axis
+    def bland_altman(self, first, second):
+        differences = first - second
+        bias = differences.mean(axis=0)
+        spread = 1.96 * differences.std(axis=0, ddof=1)
+        return bias, bias - spread, bias + spread
+
+    # Method: compare
+    # Description:
+    # Compare the results of several raters. The first rater is the reference for Bland-Altman limits.
+    # Input: datasets - list (one per rater) of rows [key, zaxis, yaxis, xaxis]
+    #        worst_count - number of most disagreeing trials to report (default: 10)
+    # Output: report - dictionary with keys, per-trial disagreement, ICC, mean absolute disagreement,
+    #         Bland-Altman limits and the keys of the worst trials
+    def compare(self, datasets, worst_count=10):
+        keys, values = self.align(datasets)
+
+        # Per-trial disagreement: largest difference between any two raters on each axis
+        disagreement = values.max(axis=0) - values.min(axis=0)
+
+        # Mean absolute difference over all rater pairs
+        first_index, second_index = np.triu_indices(values.shape[0], k=1)
+        mean_absolute = np.abs(values[first_index] - values[second_index]).mean(axis=(0, 1))
+
+        bland_altman = [self.bland_altman(values[0], values[rater]) for rater in range(1, values.shape[0])]
+
+        # Rank trials by their largest disagreement over the three axes
+        order = np.argsort(-disagreement.max(axis=1), kind="stable")[:worst_count]
+
+        return {
+            "keys": keys,
+            "disagreement": disagreement,
+            "icc": self.icc(values),
+            "mean_absolute_disagreement": mean_absolute,
+            "bland_altman": bland_altman,
+            "worst": [keys[index] for index in order],
+        }
+
+    # Method: format_report
+    # Description:
+    # Build a text summary of a comparison report.
+    # Input: report - dictionary returned by compare
+    #        rater_names - names of the compared files
+    # Output: summary text
+    def format_report(self, report, rater_names):
+        lines = [f"Trials compared: {len(report['keys'])}", f"Raters: {', '.join(rater_names)}", ""]
+        for axis_index, axis_name in enumerate(AXIS_NAMES):
+            lines.append(f"{axis_name}")
+            lines.append(f"  ICC(2,1): {report['icc'][axis_index]:.3f}")
+            lines.append(f"  Mean Absolute Disagreement: {report['mean_absolute_disagreement'][axis_index]:.2f}")
+            for rater_index, (bias, lower, upper) in enumerate(report["bland_altman"], start=1):
+                lines.append(f"  Bland-Altman vs {rater_names[rater_index]}: bias {bias[axis_index]:.2f}, "
+                             f"limits [{lower[axis_index]:.2f}, {upper[axis_index]:.2f}]")
+        lines.append("")
+        lines.append("Most disagreeing trials: " + ", ".join(str(key) for key in report["worst"]))
+        return "\n".join(lines)
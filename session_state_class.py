@@ -0,0 +1,73 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: session_state_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the session state manager, which checkpoints the annotation state of a
+# session (calibration, center point and current image) in the Results folder after every trial, so a
+# session can be resumed after the program was closed without calibrating again.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import json
+import os
+from datetime import datetime
+
+# Class: SessionStateManager
+# Description:
+# This class provides methods to save and load the session state file of a session folder.
+
+class SessionStateManager:
+    STATE_FILE_NAME = "Session_State.json"
+
+    # Method: state_file_path
+    # Description:
+    # Get the path of the session state file in a Results folder. Each shard of a split session
+    # has its own state file so annotators working on the same folder do not overwrite each other.
+    # Input: results_folder_path - path to the Results folder
+    #        shard_name - name of the shard, or None for the whole session (default: None)
+    # Output: path to the session state file
+    def state_file_path(self, results_folder_path, shard_name=None):
+        if shard_name:
+            base_name, extension = os.path.splitext(self.STATE_FILE_NAME)
+            return os.path.join(results_folder_path, f"{base_name}_{shard_name}{extension}")
+        return os.path.join(results_folder_path, self.STATE_FILE_NAME)
+
+    # Method: save_state
+    # Description:
+    # Write the session state, replacing the old file atomically so a crash never leaves it half written.
+    # Input: results_folder_path - path to the Results folder
+    #        state - dictionary with the session state
+    #        shard_name - name of the shard, or None for the whole session (default: None)
+    # Output: None
+    def save_state(self, results_folder_path, state, shard_name=None):
+        state = dict(state, updated=datetime.now().isoformat(timespec="seconds"))
+        file_path = self.state_file_path(results_folder_path, shard_name)
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file, indent=2)
+        os.replace(temp_path, file_path)
+
+    # Method: load_state
+    # Description:
+    # Read the session state of a session folder.
+    # Input: folder_path - path to the session folder
+    #        shard_name - name of the shard, or None for the whole session (default: None)
+    #        results_folder_name - name of the Results folder (default: "Results")
+    # Output: state - dictionary with the session state, or None if there is no readable state
+    def load_state(self, folder_path, shard_name=None, results_folder_name="Results"):
+        file_path = self.state_file_path(os.path.join(folder_path, results_folder_name), shard_name)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
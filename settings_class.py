@@ -0,0 +1,81 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: settings_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the settings manager, which stores user preferences that apply to every
+# session (such as fast annotation mode) in the application data folder.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import json
+import os
+from file_manger_class import FileManager
+
+# Default values of all settings
+DEFAULT_SETTINGS = {
+    "fast_mode": False,      # Advance to the next image without the normal delay
+    "fast_mode_delay": 0,    # Delay in milliseconds before advancing in fast mode
+    "normal_delay": 2000,    # Delay in milliseconds before advancing in normal mode
+    "trials_per_block": 10,  # Number of consecutive trials in a block of a session
+    "instrumentation": False,  # Record stage timings and write a performance report for each session
+    "image_cache_mb": 64,    # Memory in MB for the decoded images kept ahead by the image editing page
+    "review_data_mb": 256,   # Memory in MB above which the data review page releases its data when it is left
+    "bootstrap_replicates": 10000,  # Bootstrap replicates of the confidence intervals of the data review page
+}
+
+# Class: SettingsManager
+# Description:
+# This class provides methods to read and change the application settings. Every change is saved
+# to disk immediately.
+
+class SettingsManager:
+    def __init__(self, settings_file_path=None):
+        if settings_file_path is None:
+            settings_file_path = os.path.join(FileManager().create_app_data_folder(), "settings.json")
+        self.settings_file_path = settings_file_path  # Path to the JSON file holding the settings
+        self.settings = dict(DEFAULT_SETTINGS)
+        if os.path.exists(settings_file_path):
+            try:
+                with open(settings_file_path, "r") as file:
+                    self.settings.update(json.load(file))
+            except (OSError, ValueError):
+                pass
+
+    # Method: get
+    # Description:
+    # Get the value of a setting.
+    # Input: key - name of the setting
+    # Output: value of the setting
+    def get(self, key):
+        return self.settings[key]
+
+    # Method: set
+    # Description:
+    # Change a setting and save all settings to disk.
+    # Input: key - name of the setting
+    #        value - new value
+    # Output: None
+    def set(self, key, value):
+        self.settings[key] = value
+        temp_path = self.settings_file_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.settings, file, indent=2)
+        os.replace(temp_path, self.settings_file_path)
+
+    # Method: advance_delay
+    # Description:
+    # Get the delay before the next image (or page) is shown after a result is recorded.
+    # Input: None
+    # Output: delay in milliseconds
+    def advance_delay(self):
+        if self.settings["fast_mode"]:
+            return max(0, int(self.settings["fast_mode_delay"]))
+        return max(0, int(self.settings["normal_delay"]))
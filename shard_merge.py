@@ -0,0 +1,239 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: shard_merge.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the shard manager, which splits the trials of a session folder into ranges (shards)
+# so several annotators can work on the same session at once, and merges their partial results files
+# back into one Results_File.txt. The merge reports missing trials (gaps), trials annotated in more than
+# one shard (overlaps) and overlapping trials whose values disagree (conflicts).
+#
+# Usage:
+# python shard_merge.py split FOLDER --shards N [--calibration IMAGE]
+# python shard_merge.py merge FOLDER [--tolerance CM]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import json
+import os
+import sys
+from file_manger_class import FileManager
+from manifest_class import ManifestManager
+from session_state_class import SessionStateManager
+
+# Class: ShardManager
+# Description:
+# This class provides methods to split a session into shards and to merge the shard results.
+
+class ShardManager:
+    SHARDS_FILE_NAME = "Shards.json"
+    RESULTS_FOLDER_NAME = "Results"
+    RESULTS_FILE_NAME = "Results_File.txt"
+    CLICKS_FILE_NAME = "Clicks_File.csv"
+
+    def __init__(self):
+        self.file_manager = FileManager()
+        self.manifest_manager = ManifestManager()
+        self.session_state_manager = SessionStateManager()
+
+    # Method: shards_file_path
+    # Description:
+    # Get the path of the shards file of a session folder.
+    # Input: folder_path - path to the session folder
+    # Output: path to the shards file
+    def shards_file_path(self, folder_path):
+        return os.path.join(folder_path, self.RESULTS_FOLDER_NAME, self.SHARDS_FILE_NAME)
+
+    # Method: split
+    # Description:
+    # Split the trials of a session folder into contiguous, nearly equal ranges and save them.
+    # One image of the folder is the calibration image, so trials are numbered from 1 to the number of
+    # images minus one, as on the image editing page. The calibration image is the given one, else the one
+    # of the saved session state, else the first image in natural order. It must be an image of the folder,
+    # and it is saved with the shards so every annotator can check they calibrate on the same image.
+    # Input: folder_path - path to the session folder
+    #        shard_count - number of shards
+    #        calibration_image - file name of the calibration image (default: None)
+    # Output: shards - list of shard dictionaries (name, start, end, results_file, clicks_file)
+    def split(self, folder_path, shard_count, calibration_image=None):
+        if shard_count < 1:
+            raise ValueError("Shard count must be at least 1.")
+        results_folder_path = self.file_manager.create_folder(folder_path, folder_name=self.RESULTS_FOLDER_NAME)
+        entries = self.manifest_manager.update_manifest(folder_path, results_folder_path)
+        if calibration_image is None:
+            state = self.session_state_manager.load_state(folder_path, results_folder_name=self.RESULTS_FOLDER_NAME)
+            calibration_image = state.get("calibration_image") if state else None
+        if calibration_image is None and entries:
+            calibration_image = self.manifest_manager.ordered_file_names(entries)[0]
+        if calibration_image not in entries:
+            raise ValueError(f"Calibration image not found in the session folder: {calibration_image}")
+        trial_count = len(entries) - 1
+        if trial_count < shard_count:
+            raise ValueError(f"Cannot split {trial_count} trials into {shard_count} shards.")
+
+        shards = []
+        for shard_index in range(shard_count):
+            start = 1 + shard_index * trial_count // shard_count
+            end = (shard_index + 1) * trial_count // shard_count
+            name = f"shard_{shard_index + 1}"
+            shards.append({
+                "name": name,
+                "start": start,
+                "end": end,
+                "results_file": f"Results_File_{name}.txt",
+                "clicks_file": f"Clicks_File_{name}.csv",
+            })
+
+        with open(self.shards_file_path(folder_path), "w") as file:
+            json.dump({"trial_count": trial_count, "calibration_image": calibration_image, "shards": shards},
+                      file, indent=2)
+        return shards
+
+    # Method: load_split
+    # Description:
+    # Read the shards file of a session folder.
+    # Input: folder_path - path to the session folder
+    # Output: dictionary with trial_count, calibration_image and shards, or None if the session is not split
+    def load_split(self, folder_path):
+        file_path = self.shards_file_path(folder_path)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "r") as file:
+            return json.load(file)
+
+    # Method: load_shards
+    # Description:
+    # Read the shards of a session folder.
+    # Input: folder_path - path to the session folder
+    # Output: (trial_count, shards), or (0, []) if the session is not split
+    def load_shards(self, folder_path):
+        split_data = self.load_split(folder_path)
+        if split_data is None:
+            return 0, []
+        return split_data["trial_count"], split_data["shards"]
+
+    # Method: load_calibration_image
+    # Description:
+    # Read the calibration image the trials of a split session are numbered from.
+    # Input: folder_path - path to the session folder
+    # Output: file name of the calibration image, or None if the session is not split or was split without it
+    def load_calibration_image(self, folder_path):
+        split_data = self.load_split(folder_path)
+        return split_data.get("calibration_image") if split_data else None
+
+    # Method: merge
+    # Description:
+    # Merge the shard results files into one results file (and the shard clicks files into one clicks file).
+    # When a trial appears in several shards, the shard whose range contains the trial wins.
+    # Input: folder_path - path to the session folder
+    #        tolerance - largest difference (in cm) between overlapping values that is not a conflict (default: 0.01)
+    # Output: report - dictionary with merged trial count, gaps, overlaps, conflicts and missing shard files
+    def merge(self, folder_path, tolerance=0.01):
+        trial_count, shards = self.load_shards(folder_path)
+        if not shards:
+            raise FileNotFoundError(f"No shards found: {self.shards_file_path(folder_path)}")
+        results_folder_path = os.path.join(folder_path, self.RESULTS_FOLDER_NAME)
+
+        rows_by_trial = {}  # trial -> list of (shard, values)
+        clicks_by_trial = {}  # trial -> list of (shard, click)
+        missing_files = []
+        for shard in shards:
+            results_file_path = os.path.join(results_folder_path, shard["results_file"])
+            if not os.path.exists(results_file_path):
+                missing_files.append(shard["results_file"])
+                continue
+            for row in self.file_manager.read_axis_data(results_file_path):
+                rows_by_trial.setdefault(row[0], []).append((shard, tuple(row[1:])))
+            clicks_file_path = os.path.join(results_folder_path, shard["clicks_file"])
+            if os.path.exists(clicks_file_path):
+                for click in self.file_manager.read_click_data(clicks_file_path):
+                    clicks_by_trial.setdefault(click["trial"], []).append((shard, click))
+
+        merged_rows = []
+        overlaps = []
+        conflicts = []
+        for trial in sorted(rows_by_trial):
+            entries = rows_by_trial[trial]
+            owner = next((entry for entry in entries if entry[0]["start"] <= trial <= entry[0]["end"]), entries[0])
+            if len(entries) > 1:
+                shard_names = [entry[0]["name"] for entry in entries]
+                overlaps.append({"trial": trial, "shards": shard_names})
+                if any(abs(a - b) > tolerance for entry in entries for a, b in zip(entry[1], owner[1])):
+                    conflicts.append({"trial": trial, "shards": shard_names,
+                                      "values": [list(entry[1]) for entry in entries]})
+            merged_rows.append((trial,) + owner[1])
+
+        gaps = [trial for trial in range(1, trial_count + 1) if trial not in rows_by_trial]
+
+        self.file_manager.write_axis_data(os.path.join(results_folder_path, self.RESULTS_FILE_NAME), merged_rows)
+        if clicks_by_trial:
+            click_rows = []
+            for trial in sorted(clicks_by_trial):
+                entries = clicks_by_trial[trial]
+                click = next((entry[1] for entry in entries if entry[0]["start"] <= trial <= entry[0]["end"]),
+                             entries[0][1])
+                click_rows.append((trial, click["image"], click["center_point"], click["puck_point"]))
+            self.file_manager.write_click_data(os.path.join(results_folder_path, self.CLICKS_FILE_NAME), click_rows)
+
+        return {
+            "merged": len(merged_rows),
+            "trial_count": trial_count,
+            "gaps": gaps,
+            "overlaps": overlaps,
+            "conflicts": conflicts,
+            "missing_files": missing_files,
+        }
+
+# Function: main
+# Description:
+# Parse the command line arguments and split or merge a session folder.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code - 1 if the merge found gaps or conflicts, 0 otherwise
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split a session between annotators and merge their results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = commands.add_parser("split", help="Split the trials of a session folder into shards")
+    split_parser.add_argument("folder", help="Session folder")
+    split_parser.add_argument("--shards", type=int, required=True, help="Number of shards")
+    split_parser.add_argument("--calibration", default=None,
+                              help="File name of the calibration image (default: the calibration image of the "
+                                   "saved session, else the first image in natural order)")
+
+    merge_parser = commands.add_parser("merge", help="Merge the shard results into Results_File.txt")
+    merge_parser.add_argument("folder", help="Session folder")
+    merge_parser.add_argument("--tolerance", type=float, default=0.01,
+                              help="Largest difference between overlapping values that is not a conflict")
+    args = parser.parse_args(argv)
+
+    shard_manager = ShardManager()
+    if args.command == "split":
+        for shard in shard_manager.split(args.folder, args.shards, args.calibration):
+            print(f"{shard['name']}: trials {shard['start']}-{shard['end']}")
+        print(f"Calibration image: {shard_manager.load_calibration_image(args.folder)}")
+        return 0
+
+    report = shard_manager.merge(args.folder, args.tolerance)
+    print(f"Merged {report['merged']} of {report['trial_count']} trials")
+    for file_name in report["missing_files"]:
+        print(f"Missing shard results file: {file_name}")
+    if report["gaps"]:
+        print(f"Missing trials: {', '.join(str(trial) for trial in report['gaps'])}")
+    for overlap in report["overlaps"]:
+        print(f"Trial {overlap['trial']} annotated in {', '.join(overlap['shards'])}")
+    for conflict in report["conflicts"]:
+        print(f"Conflict in trial {conflict['trial']}: {conflict['values']}")
+    return 1 if report["gaps"] or report["conflicts"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: spatial_index_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the spatial index of the landing map, a uniform grid over the landing
+# positions. The points are sorted by grid cell, so the points of a row of cells are one contiguous slice,
+# and clicking near a point or drawing a lasso only looks at the points of the cells it touches.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import numpy as np
+
+# Class: SpatialIndex
+# Description:
+# This class provides methods to build a grid index over 2D points and to find the nearest point to a
+# click or the points inside a lasso polygon.
+
+class SpatialIndex:
+    def __init__(self, x, y, points_per_cell=4):
+        self.x = np.asarray(x, dtype=np.float64)  # x coordinates of the points
+        self.y = np.asarray(y, dtype=np.float64)  # y coordinates of the points
+        count = len(self.x)
+        if count == 0:
+            self.x_min = self.y_min = 0.0
+            self.cell_size = 1.0
+            self.columns = self.rows = 1
+            self.order = np.empty(0, dtype=np.int64)
+            self.cell_starts = np.zeros(2, dtype=np.int64)
+            return
+
+        # Size the cells so each one holds about points_per_cell points on average
+        self.x_min, self.y_min = self.x.min(), self.y.min()
+        width = max(self.x.max() - self.x_min, 1e-9)
+        height = max(self.y.max() - self.y_min, 1e-9)
+        self.cell_size = max(np.sqrt(width * height * points_per_cell / count), 1e-9)
+        self.columns = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+
+        cells = self.cell_of(self.x, self.y)
+        self.order = np.argsort(cells, kind="stable")  # Point indices sorted by cell
+        # cell_starts[c] is the position in order of the first point of cell c
+        self.cell_starts = np.searchsorted(cells[self.order], np.arange(self.columns * self.rows + 1))
+
+    # Method: cell_of
+    # Description:
+    # Get the cell of points, clamped to the grid.
+    # Input: x, y - arrays of coordinates
+    # Output: array of cell numbers (row * columns + column)
+    def cell_of(self, x, y):
+        columns = np.clip(((x - self.x_min) // self.cell_size).astype(np.int64), 0, self.columns - 1)
+        rows = np.clip(((y - self.y_min) // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return rows * self.columns + columns
+
+    # Method: query_box
+    # Description:
+    # Get the points in the cells that overlap a rectangle (a superset of the points inside it).
+    # Input: x_low, y_low, x_high, y_high - corners of the rectangle
+    # Output: array of point indices
+    def query_box(self, x_low, y_low, x_high, y_high):
+        first_column = max(int((x_low - self.x_min) // self.cell_size), 0)
+        last_column = min(int((x_high - self.x_min) // self.cell_size), self.columns - 1)
+        first_row = max(int((y_low - self.y_min) // self.cell_size), 0)
+        last_row = min(int((y_high - self.y_min) // self.cell_size), self.rows - 1)
+        if first_column > last_column or first_row > last_row:
+            return np.empty(0, dtype=np.int64)
+        # The cells of one row of the rectangle are consecutive, so their points are one slice of order
+        slices = [self.order[self.cell_starts[row * self.columns + first_column]:
+                             self.cell_starts[row * self.columns + last_column + 1]]
+                  for row in range(first_row, last_row + 1)]
+        return np.concatenate(slices)
+
+    # Method: nearest
+    # Description:
+    # Find the point nearest to a position within a radius.
+    # Input: x, y - position
+    #        radius - largest distance to the point
+    # Output: index of the nearest point, or None if no point is within the radius
+    def nearest(self, x, y, radius):
+        candidates = self.query_box(x - radius, y - radius, x + radius, y + radius)
+        if len(candidates) == 0:
+            return None
+        distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        best = int(np.argmin(distances))
+        return int(candidates[best]) if distances[best] <= radius else None
+
+    # Method: query_polygon
+    # Description:
+    # Find the points inside a polygon (even-odd rule), testing only the points near its bounding box.
+    # Input: vertices - sequence of (x, y) vertices of the polygon
+    # Output: sorted array of point indices
+    def query_polygon(self, vertices):
+        vertices = np.asarray(vertices, dtype=np.float64)
+        if len(vertices) < 3:
+            return np.empty(0, dtype=np.int64)
+        (x_low, y_low), (x_high, y_high) = vertices.min(axis=0), vertices.max(axis=0)
+        candidates = self.query_box(x_low, y_low, x_high, y_high)
+        px, py = self.x[candidates][:, None], self.y[candidates][:, None]
+
+        # Count the crossings of a ray going right from every point with every edge
+        x1, y1 = vertices[:, 0], vertices[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        spans = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        inside = (spans & (px < crossing_x)).sum(axis=1) % 2 == 1
+        return np.sort(candidates[inside])
@@ -0,0 +1,225 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: statistics_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the statistics manager, which computes the descriptive statistics of
+# the Z-Axis, Y-Axis and X-Axis columns shown on the data review page, and bootstrap confidence intervals
+# of the error measures of every participant and block: mean radial error (the mean Z-Axis value),
+# variable error (VE, the standard deviation of the Y-Axis and of the X-Axis values) and bivariate
+# variable error (BVE, the root mean squared distance of the landing positions from their centroid).
+#
+# The bootstrap draws all replicates of a group as one matrix of random trial indexes, so a replicate
+# is a row of the matrix and every measure is computed for all replicates at once. The groups are
+# spread over a pool of worker processes; each group has its own random stream spawned from the seed,
+# so the intervals do not depend on the number of workers.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from instrumentation_class import monitor
+
+BOOTSTRAP_MEASURES = ["Mean Radial Error", "VE (Y-Axis)", "VE (X-Axis)", "BVE"]  # Measures of the bootstrap
+BATCH_ELEMENTS = 1 << 22  # Largest number of resampled trials held at once per group (replicates x trials)
+POOL_THRESHOLD = 1 << 24  # Smallest number of resampled trials for which worker processes are started
+
+# Function: error_measures
+# Description:
+# Compute the error measures of resampled trials, one row per replicate.
+# Input: radial, horizontal, vertical - arrays of shape (replicates, trials) with the Z-Axis, Y-Axis
+#        and X-Axis values
+# Output: array of shape (replicates, 4) with the measures in the order of BOOTSTRAP_MEASURES
+def error_measures(radial, horizontal, vertical):
+    trials = radial.shape[1]
+    horizontal_mean = horizontal.mean(axis=1)
+    vertical_mean = vertical.mean(axis=1)
+    # Population variances from the sums of squares, without building the centered matrices
+    horizontal_variance = np.einsum("ij,ij->i", horizontal, horizontal) / trials - horizontal_mean ** 2
+    vertical_variance = np.einsum("ij,ij->i", vertical, vertical) / trials - vertical_mean ** 2
+    horizontal_variance = np.maximum(horizontal_variance, 0.0)
+    vertical_variance = np.maximum(vertical_variance, 0.0)
+    return np.column_stack([
+        radial.mean(axis=1),
+        np.sqrt(horizontal_variance),
+        np.sqrt(vertical_variance),
+        np.sqrt(horizontal_variance + vertical_variance),
+    ])
+
+# Function: bootstrap_group
+# Description:
+# Compute the error measures of one group and their percentile bootstrap confidence intervals.
+# The replicates are drawn in batches so at most BATCH_ELEMENTS resampled trials are held at once.
+# Input: task - (radial, horizontal, vertical, replicates, confidence, seed_sequence), with the values
+#        of the trials of the group as 1D arrays
+# Output: (estimates, lower, upper) - arrays with one value per measure
+def bootstrap_group(task):
+    radial, horizontal, vertical, replicates, confidence, seed_sequence = task
+    trials = len(radial)
+    generator = np.random.default_rng(seed_sequence)
+    estimates = error_measures(radial[None, :], horizontal[None, :], vertical[None, :])[0]
+
+    samples = np.empty((replicates, len(BOOTSTRAP_MEASURES)))
+    batch = max(1, BATCH_ELEMENTS // trials)
+    for start in range(0, replicates, batch):
+        stop = min(start + batch, replicates)
+        indexes = generator.integers(0, trials, size=(stop - start, trials), dtype=np.int32)
+        samples[start:stop] = error_measures(radial[indexes], horizontal[indexes], vertical[indexes])
+
+    tail = 100 * (1 - confidence) / 2
+    lower, upper = np.percentile(samples, [tail, 100 - tail], axis=0)
+    return estimates, lower, upper
+
+# Function: bootstrap_groups
+# Description:
+# Run bootstrap_group for several groups, one chunk of groups per task (called in a worker process).
+# Input: tasks - list of tasks of bootstrap_group
+# Output: list of results of bootstrap_group
+def bootstrap_groups(tasks):
+    return [bootstrap_group(task) for task in tasks]
+
+# Class: StatisticsManager
+# Description:
+# This class provides methods to compute and format the statistics of trial data.
+
+class StatisticsManager:
+
+    # Method: summarize
+    # Description:
+    # Compute the mean, median, mode, spread and variability measures of every axis column.
+    # Input: data - pandas DataFrame with an "Image Trial" column followed by the axis columns
+    # Output: stats_summary - text with the statistics of every column
+    def summarize(self, data):
+        stats_summary = "Statistics:\n"
+
+        for column in data.columns[1:]:
+            column_data = data[column]
+
+            # Basic numerical measures
+            # Mean, median, and mode
+            mean_value = column_data.mean()
+            median_value = column_data.median()
+            modes = column_data.mode()
+            mode_value = modes.iloc[0] if not modes.empty else "No mode"
+
+            # Spread and variability measures
+            # Standard deviation, variance, range, and interquartile range
+            std_dev = column_data.std()
+            variance = column_data.var()
+            data_range = column_data.max() - column_data.min()
+            iqr = column_data.quantile(0.75) - column_data.quantile(0.25)
+
+            # Additional measure: max difference percentage
+            # Calculate the maximum difference percentage from the mean
+            absolute_difference = (column_data - mean_value).abs()
+            max_difference = absolute_difference.max()
+            max_difference_percentage = (max_difference / mean_value) * 100 if mean_value != 0 else 0
+
+            # Append statistics for this column to the summary
+            # Format the statistics with two decimal places
+            stats_summary += (
+                f"Column: {column}\n"
+                f"  Mean (Average): {mean_value:.2f}\n"
+                f"  Median (Midpoint): {median_value:.2f}\n"
+                f"  Mode (Most Frequent): {mode_value}\n"
+                f"  Standard Deviation (Spread): {std_dev:.2f}\n"
+                f"  Variance: {variance:.2f}\n"
+                f"  Range (Max - Min): {data_range:.2f}\n"
+                f"  Interquartile Range (IQR): {iqr:.2f}\n"
+                f"  Max Difference (%): {max_difference_percentage:.2f}%\n"
+                "\n"
+            )
+
+        return stats_summary
+
+    # Method: bootstrap
+    # Description:
+    # Compute the error measures of every participant and of every block of a participant, with
+    # percentile bootstrap confidence intervals.
+    # Input: radial, horizontal, vertical - Z-Axis, Y-Axis and X-Axis values of the trials
+    #        participants - participant of every trial as an index in participant_names
+    #        blocks - block number of every trial
+    #        participant_names - names of the participants
+    #        replicates - number of bootstrap replicates (default: 10000)
+    #        confidence - confidence level of the intervals (default: 0.95)
+    #        seed - seed of the random streams (default: 0)
+    #        workers - number of worker processes, or None for one per CPU (default: None)
+    # Output: list of dictionaries with participant, block (None for the whole participant), trials,
+    #         and measures - dictionary measure name -> (estimate, lower, upper)
+    @monitor.timed("review_bootstrap")
+    def bootstrap(self, radial, horizontal, vertical, participants, blocks, participant_names, replicates=10000,
+                  confidence=0.95, seed=0, workers=None):
+        radial = np.asarray(radial, dtype=np.float64)
+        horizontal = np.asarray(horizontal, dtype=np.float64)
+        vertical = np.asarray(vertical, dtype=np.float64)
+        blocks = np.asarray(blocks, dtype=np.int64)
+        if len(radial) == 0:
+            return []
+        codes = np.asarray(participants, dtype=np.int64)
+
+        # Sort the trials by participant and block so every group is a contiguous slice
+        order = np.lexsort((blocks, codes))
+        radial, horizontal, vertical = radial[order], horizontal[order], vertical[order]
+        codes, blocks = codes[order], blocks[order]
+        new_participant = np.r_[True, codes[1:] != codes[:-1]]
+        new_block = new_participant | np.r_[True, blocks[1:] != blocks[:-1]]
+
+        groups = []  # (participant, block, start, stop)
+        for starts, by_block in ((np.flatnonzero(new_participant), False), (np.flatnonzero(new_block), True)):
+            stops = np.r_[starts[1:], len(codes)]
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                groups.append((str(participant_names[codes[start]]), int(blocks[start]) if by_block else None,
+                               start, stop))
+        groups.sort(key=lambda group: (group[0], -1 if group[1] is None else group[1]))
+
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(groups))
+        tasks = [(radial[start:stop], horizontal[start:stop], vertical[start:stop], replicates, confidence, seed_sequence)
+                 for (_, _, start, stop), seed_sequence in zip(groups, seed_sequences)]
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or replicates * 2 * len(codes) < POOL_THRESHOLD:
+            outcomes = bootstrap_groups(tasks)
+        else:
+            # Chunks of groups keep the number of tasks (and their overhead) small; spawned workers do not
+            # inherit the threads of the Qt application
+            chunk_size = max(1, len(tasks) // (4 * workers))
+            chunks = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                outcomes = [outcome for chunk in executor.map(bootstrap_groups, chunks) for outcome in chunk]
+
+        results = []
+        for (participant, block, start, stop), (estimates, lower, upper) in zip(groups, outcomes):
+            results.append({
+                "participant": participant,
+                "block": block,
+                "trials": stop - start,
+                "measures": {name: (float(estimates[index]), float(lower[index]), float(upper[index]))
+                             for index, name in enumerate(BOOTSTRAP_MEASURES)},
+            })
+        return results
+
+    # Method: format_bootstrap
+    # Description:
+    # Build a text table of bootstrap results.
+    # Input: results - list returned by bootstrap
+    #        confidence - confidence level of the intervals (default: 0.95)
+    # Output: text with one line per participant and block
+    def format_bootstrap(self, results, confidence=0.95):
+        header = f"{'Participant':<20}{'Block':>6}{'Trials':>8}" + "".join(
+            f"{name:>28}" for name in BOOTSTRAP_MEASURES)
+        lines = [f"Estimates with {confidence:.0%} bootstrap confidence intervals", header]
+        for result in results:
+            block = "All" if result["block"] is None else str(result["block"])
+            cells = "".join(f"{f'{estimate:.2f} [{lower:.2f}, {upper:.2f}]':>28}"
+                            for estimate, lower, upper in result["measures"].values())
+            lines.append(f"{result['participant'][:19]:<20}{block:>6}{result['trials']:>8}{cells}")
+        return "\n".join(lines)
@@ -0,0 +1,231 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: synthetic_images.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the synthetic session generator. It renders images of the 9x9 grid (3 cm squares) with
+# the 2 cm puck at known positions, seen through a camera with configurable perspective, uneven lighting,
+# sensor noise and drift between images, so calibration, annotation and throughput can be tested without
+# participant data. The first image has no puck and is the calibration image, as in a real session.
+#
+# Every image is rendered with NumPy for all pixels at once and written by a small PNG writer (zlib only),
+# on a pool of worker processes. The known positions are written in FileManager's formats:
+# Ground_Truth/Results_File.txt holds the axis values in cm for the calibration axis 0 / vertical axis 3,
+# and Ground_Truth/Clicks_File.csv holds the pixel positions of the center and the puck in every image.
+#
+# Usage:
+# python synthetic_images.py OUTPUT_FOLDER [--count N] [--width W] [--height H] [--pixels-per-cm P]
+#                            [--perspective P] [--lighting L] [--noise N] [--drift D] [--workers N] [--seed S]
+#
+############################################################################################
+
+# Import necessary libraries
+
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from file_manger_class import FileManager
+
+GRID_HALF_SIZE = 13.5  # Distance from the target to the edge of the 9x9 grid in cm
+SQUARE_SIZE = 3.0  # Size of a grid square in cm
+PUCK_RADIUS = 1.0  # Radius of the puck in cm
+LINE_WIDTH = 0.2  # Width of the grid lines in cm
+GROUND_TRUTH_FOLDER_NAME = "Ground_Truth"
+BOARD_COLOR = np.array([214, 190, 150], dtype=np.float32)  # Light wood
+LINE_COLOR = np.array([40, 40, 40], dtype=np.float32)
+TARGET_COLOR = np.array([30, 90, 200], dtype=np.float32)
+PUCK_COLOR = np.array([200, 30, 30], dtype=np.float32)
+FLOOR_COLOR = np.array([90, 90, 95], dtype=np.float32)
+
+# Function: write_png
+# Description:
+# Write an RGB image as a PNG file using only zlib (no imaging library).
+# Input: file_path - path of the PNG file
+#        pixels - uint8 array of shape (height, width, 3)
+#        compression - zlib compression level (default: 3)
+# Output: None
+
+def write_png(file_path, pixels, compression=3):
+    height, width, _ = pixels.shape
+    # Every row starts with its filter type (0: none)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 3)
+
+    def chunk(chunk_type, data):
+        return (struct.pack(">I", len(data)) + chunk_type + data
+                + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+    with open(file_path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), compression)))
+        file.write(chunk(b"IEND", b""))
+
+# Function: board_to_image
+# Description:
+# Build the homography that maps board coordinates (cm, origin at the target, v pointing down the image)
+# to image pixels.
+# Input: width, height - image size; pixels_per_cm - scale at the target
+#        perspective - keystone strength in 1/cm (0 for a camera looking straight down)
+#        shift_x, shift_y - camera drift in pixels; rotation - camera drift in degrees
+# Output: 3x3 homography matrix
+def board_to_image(width, height, pixels_per_cm, perspective, shift_x, shift_y, rotation):
+    angle = math.radians(rotation)
+    cos_angle, sin_angle = math.cos(angle), math.sin(angle)
+    translation = np.array([[1, 0, width / 2 + shift_x], [0, 1, height / 2 + shift_y], [0, 0, 1]])
+    rotation_scale = np.array([[cos_angle * pixels_per_cm, -sin_angle * pixels_per_cm, 0],
+                               [sin_angle * pixels_per_cm, cos_angle * pixels_per_cm, 0], [0, 0, 1]])
+    keystone = np.array([[1, 0, 0], [0, 1, 0], [0, perspective, 1]])  # The scale changes along v (camera tilt)
+    return translation @ rotation_scale @ keystone
+
+# Function: project
+# Description:
+# Map a board point to image pixels.
+# Input: homography - 3x3 matrix; u, v - board point in cm
+# Output: (x, y) in pixels
+def project(homography, u, v):
+    x, y, w = homography @ np.array([u, v, 1.0])
+    return x / w, y / w
+
+# Function: render_image
+# Description:
+# Render one image and write it as a PNG file.
+# Input: task - dictionary with file_path, width, height, homography, puck (u, v) or None, lighting,
+#        noise and seed
+# Output: file_path
+def render_image(task):
+    width, height = task["width"], task["height"]
+    generator = np.random.default_rng(task["seed"])
+
+    # Board coordinates of every pixel through the inverse homography
+    inverse = np.linalg.inv(task["homography"]).astype(np.float32)
+    xx = np.arange(width, dtype=np.float32)[None, :]
+    yy = np.arange(height, dtype=np.float32)[:, None]
+    w = inverse[2, 0] * xx + inverse[2, 1] * yy + inverse[2, 2]
+    u = (inverse[0, 0] * xx + inverse[0, 1] * yy + inverse[0, 2]) / w
+    v = (inverse[1, 0] * xx + inverse[1, 1] * yy + inverse[1, 2]) / w
+
+    image = np.empty((height, width, 3), dtype=np.float32)
+    image[:] = FLOOR_COLOR
+    board = (np.abs(u) <= GRID_HALF_SIZE + 3) & (np.abs(v) <= GRID_HALF_SIZE + 3)
+    image[board] = BOARD_COLOR
+
+    # Grid lines at -13.5, -10.5, ..., 13.5 cm and the target square in the middle
+    inside_grid = (np.abs(u) <= GRID_HALF_SIZE + LINE_WIDTH / 2) & (np.abs(v) <= GRID_HALF_SIZE + LINE_WIDTH / 2)
+    line_u = np.abs((u + GRID_HALF_SIZE) - SQUARE_SIZE * np.round((u + GRID_HALF_SIZE) / SQUARE_SIZE)) < LINE_WIDTH / 2
+    line_v = np.abs((v + GRID_HALF_SIZE) - SQUARE_SIZE * np.round((v + GRID_HALF_SIZE) / SQUARE_SIZE)) < LINE_WIDTH / 2
+    image[(np.abs(u) < SQUARE_SIZE / 2) & (np.abs(v) < SQUARE_SIZE / 2)] = TARGET_COLOR
+    image[inside_grid & (line_u | line_v)] = LINE_COLOR
+
+    if task["puck"] is not None:
+        puck_u, puck_v = task["puck"]
+        image[(u - puck_u) ** 2 + (v - puck_v) ** 2 <= PUCK_RADIUS ** 2] = PUCK_COLOR
+
+    # Uneven lighting: a gradient across the image and a vignette towards the corners
+    lighting = task["lighting"]
+    nx = xx / width - 0.5
+    ny = yy / height - 0.5
+    gain = 1 + lighting * (nx * task["light_direction"][0] + ny * task["light_direction"][1]) \
+        - lighting * (nx ** 2 + ny ** 2)
+    image *= gain[:, :, None]
+    if task["noise"] > 0:
+        image += generator.normal(0, task["noise"], image.shape).astype(np.float32)
+
+    write_png(task["file_path"], np.clip(image, 0, 255).astype(np.uint8))
+    return task["file_path"]
+
+# Function: generate_session
+# Description:
+# Generate a session folder and its ground truth.
+# Input: folder_path - output folder; count - number of trial images (plus one calibration image)
+#        width, height, pixels_per_cm, perspective, lighting, noise - image settings
+#        drift - standard deviation of the camera drift between images in pixels (the rotation drifts by
+#                drift / 10 degrees)
+#        workers - number of worker processes (None: one per CPU); seed - seed of all random values
+# Output: list of ground truth rows (image_index, zaxis, yaxis, xaxis)
+def generate_session(folder_path, count, width=1600, height=1200, pixels_per_cm=30.0, perspective=0.004,
+                     lighting=0.3, noise=4.0, drift=0.5, workers=None, seed=0):
+    os.makedirs(folder_path, exist_ok=True)
+    generator = np.random.default_rng(seed)
+
+    # Puck positions (cm) around the target, and the camera drift as a random walk from the calibration image
+    pucks = np.clip(generator.normal(0, 5, (count, 2)), -GRID_HALF_SIZE - 2, GRID_HALF_SIZE + 2)
+    shifts = np.vstack([np.zeros((1, 2)), np.cumsum(generator.normal(0, drift, (count, 2)), axis=0)])
+    rotations = np.concatenate([[0.0], np.cumsum(generator.normal(0, drift / 10, count))])
+    light_direction = generator.normal(0, 1, 2)
+    light_direction /= np.linalg.norm(light_direction)
+
+    digits = max(4, len(str(count)))
+    tasks = []
+    clicks = []
+    for index in range(count + 1):
+        homography = board_to_image(width, height, pixels_per_cm, perspective, shifts[index, 0], shifts[index, 1],
+                                    rotations[index])
+        puck = tuple(pucks[index - 1]) if index > 0 else None
+        file_name = f"image_{index:0{digits}d}.png"
+        tasks.append({
+            "file_path": os.path.join(folder_path, file_name), "width": width, "height": height,
+            "homography": homography, "puck": puck, "lighting": lighting, "noise": noise,
+            "light_direction": tuple(light_direction), "seed": seed * 1000003 + index,
+        })
+        if puck is not None:
+            clicks.append((index, file_name, project(homography, 0, 0), project(homography, *puck)))
+
+    chunk_size = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(render_image, tasks, chunksize=chunk_size):
+            pass
+
+    # Ground truth in the results format, for the calibration axis 0 and vertical axis 3
+    # (x along the image x direction, y against the image y direction)
+    xaxis = pucks[:, 0]
+    yaxis = -pucks[:, 1]
+    zaxis = np.hypot(xaxis, yaxis)
+    rows = list(zip(range(1, count + 1), zaxis.tolist(), yaxis.tolist(), xaxis.tolist()))
+    file_manager = FileManager()
+    truth_folder_path = file_manager.create_folder(folder_path, folder_name=GROUND_TRUTH_FOLDER_NAME)
+    file_manager.write_axis_data(os.path.join(truth_folder_path, "Results_File.txt"), rows)
+    file_manager.write_click_data(os.path.join(truth_folder_path, "Clicks_File.csv"), clicks)
+    return rows
+
+# Function: main
+# Description:
+# Parse the command line arguments and generate a synthetic session.
+# Input: argv - command line arguments (default: sys.argv[1:])
+# Output: exit code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic shuffleboard images with ground truth.")
+    parser.add_argument("folder", help="Output folder")
+    parser.add_argument("--count", type=int, default=100, help="Number of trial images")
+    parser.add_argument("--width", type=int, default=1600, help="Image width in pixels")
+    parser.add_argument("--height", type=int, default=1200, help="Image height in pixels")
+    parser.add_argument("--pixels-per-cm", type=float, default=30.0, help="Scale at the target")
+    parser.add_argument("--perspective", type=float, default=0.004, help="Keystone strength in 1/cm")
+    parser.add_argument("--lighting", type=float, default=0.3, help="Strength of the uneven lighting")
+    parser.add_argument("--noise", type=float, default=4.0, help="Standard deviation of the sensor noise")
+    parser.add_argument("--drift", type=float, default=0.5, help="Camera drift between images in pixels")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random values")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = generate_session(args.folder, args.count, args.width, args.height, args.pixels_per_cm, args.perspective,
+                            args.lighting, args.noise, args.drift, args.workers, args.seed)
+    print(f"Generated {len(rows) + 1} images in {time.perf_counter() - start:.1f} s: {args.folder}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
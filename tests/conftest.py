@@ -0,0 +1,81 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: conftest.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the shared setup of the tests. The modules of the application live at the top of the
+# repository, so the repository folder is put on the import path before the tests import them.
+# The page tests share one Qt application.
+#
+# Usage:
+# python -m pytest tests
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import sys
+import pytest
+
+REPOSITORY_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPOSITORY_FOLDER not in sys.path:
+    sys.path.insert(0, REPOSITORY_FOLDER)
+
+
+# Function: qapp
+# Description:
+# Get the Qt application of the page tests, on the offscreen platform so no window is opened.
+# The tests that use it are skipped when PyQt5 is not installed.
+# Input: None
+# Output: QApplication
+@pytest.fixture(scope="session")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+# Function: synthetic_session
+# Description:
+# Generate a small synthetic session (calibration image and 6 trials) with synthetic_images.py.
+# Input: tmp_path - temporary folder of the test
+# Output: path of the session folder
+@pytest.fixture
+def synthetic_session(tmp_path):
+    pytest.importorskip("numpy")
+    from synthetic_images import generate_session
+
+    folder_path = str(tmp_path / "session")
+    generate_session(folder_path, 6, width=480, height=360, pixels_per_cm=12.0, workers=1)
+    return folder_path
+
+
+# Function: edit_page
+# Description:
+# Get the image editing page of a main window whose settings and profiles are kept in the temporary folder.
+# Message boxes are recorded in edit_page.messages instead of waiting for the user.
+# Input: qapp, tmp_path, monkeypatch - pytest fixtures
+# Output: EditPage
+@pytest.fixture
+def edit_page(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path / "home"))
+    import image_editing_page
+    from main_page import MainWindow
+
+    messages = []
+    for name in ("warning", "information"):
+        monkeypatch.setattr(image_editing_page.QMessageBox, name,
+                            staticmethod(lambda parent, title, text, *args: messages.append((title, text))))
+    window = MainWindow()
+    page = window.edit_page
+    page.messages = messages
+    yield page
+    page.registration_manager.cancel()
+    page.stop_live_mode()
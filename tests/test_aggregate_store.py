@@ -0,0 +1,112 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_aggregate_store.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the aggregate store: finding the sessions below a root folder, building
+# the memory-mapped records and reading the trials of a participant or a session back.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aggregate_store_class import AggregateStore
+from file_manger_class import FileManager
+
+# Trials of every session as (participant, session, number of trials)
+SESSIONS = [("P01", "day_1", 25), ("P01", "day_2", 12), ("P02", "day_1", 7)]
+
+
+def write_session(root_path, participant, session, trial_count):
+    results_folder_path = root_path / participant / session / "Results"
+    results_folder_path.mkdir(parents=True)
+    rows = [(trial, trial / 10, -trial / 10, 0.0) for trial in range(1, trial_count + 1)]
+    FileManager().write_axis_data(str(results_folder_path / "Results_File.txt"), rows)
+
+
+@pytest.fixture
+def store(tmp_path):
+    root_path = tmp_path / "root"
+    for participant, session, trial_count in SESSIONS:
+        write_session(root_path, participant, session, trial_count)
+    sessions = AggregateStore.find_sessions(str(root_path))
+    return AggregateStore.build(sessions, str(tmp_path / "aggregate"), chunk_size=10)
+
+
+def test_find_sessions(tmp_path):
+    for participant, session, trial_count in SESSIONS:
+        write_session(tmp_path, participant, session, trial_count)
+    (tmp_path / "P03" / "empty").mkdir(parents=True)  # No results file
+    sessions = AggregateStore.find_sessions(str(tmp_path))
+    assert [(participant, session) for participant, session, _ in sessions] == [
+        ("P01", "P01/day_1"), ("P01", "P01/day_2"), ("P02", "P02/day_1")]
+
+
+def test_build_keeps_every_trial(store):
+    assert len(store) == 44
+    assert store.participants == ["P01", "P02"]
+    assert [(session["start"], session["stop"]) for session in store.sessions] == [(0, 25), (25, 37), (37, 44)]
+    assert store.records["trial"][:3].tolist() == [1, 2, 3]
+    assert store.records["zaxis"][24] == pytest.approx(2.5)
+
+
+def test_select_and_view(store):
+    assert store.select() == (0, 44)
+    assert store.select("P01") == (0, 37)
+    assert store.select(session="P02/day_1") == (37, 44)
+    assert store.view("P02")["trial"].tolist() == list(range(1, 8))
+    with pytest.raises(KeyError):
+        store.select("P09")
+    with pytest.raises(KeyError):
+        store.select(session="P01/day_9")
+
+
+def test_participant_codes_and_sessions(store):
+    assert store.participant_codes(30, 40).tolist() == [0] * 7 + [1] * 3
+    assert store.session_at(0)["name"] == "P01/day_1"
+    assert store.session_at(25)["name"] == "P01/day_2"
+    assert store.session_at(43)["name"] == "P02/day_1"
+
+
+def test_number_blocks_keeps_sessions_apart(store):
+    trials = store.records["trial"]
+    blocks = (trials - 1) // 10 + 1  # Blocks of 10 trials within every session
+    numbered = store.number_blocks(0, len(store), blocks)
+    # P01 has blocks 1 to 3 on day 1 and 4 to 5 on day 2; P02 starts again at 1
+    assert numbered[:25].tolist() == [1] * 10 + [2] * 10 + [3] * 5
+    assert numbered[25:37].tolist() == [4] * 10 + [5] * 2
+    assert numbered[37:].tolist() == [1] * 7
+    # A range starting in a later session numbers from its first session
+    assert store.number_blocks(25, 44, blocks[25:44]).tolist() == [1] * 10 + [2] * 2 + [1] * 7
+
+
+def test_iter_rows(store):
+    chunks = list(store.iter_rows(20, 30, chunk_size=4))
+    assert [rows_read for _, rows_read in chunks] == [4, 8, 10]
+    rows = [row for chunk, _ in chunks for row in chunk]
+    assert rows[5][:3] == (1, 0.1, -0.1)
+    assert [row[0] for row in rows] == [21, 22, 23, 24, 25, 1, 2, 3, 4, 5]
+
+
+def test_to_dataframe(store):
+    pytest.importorskip("pandas")
+    data = store.to_dataframe(session="P01/day_2")
+    assert list(data.columns) == ["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"]
+    assert len(data) == 12
+    assert data["Y-Axis"].iloc[-1] == pytest.approx(-1.2)
+
+
+def test_empty_aggregate(tmp_path):
+    store = AggregateStore.build([], str(tmp_path / "aggregate"))
+    assert len(store) == 0
+    assert store.select() == (0, 0)
+    assert len(store.number_blocks(0, 0, [])) == 0
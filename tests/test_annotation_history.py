@@ -0,0 +1,154 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_annotation_history.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the annotation commands and their undo history. The commands run on a
+# stand-in for the image editing page that only has what they use: the file manager, the results and
+# clicks files and the trial store.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from annotation_history_class import (
+    AnnotationCommand, AnnotationHistory, CommitTrialCommand, FlagTrialCommand, SetCenterCommand, SkipTrialCommand
+)
+from file_manger_class import FileManager
+from trial_store_class import TrialStore, FLAG_FLAGGED, FLAG_SAVED, FLAG_SKIPPED
+
+# Class: Page
+# Description:
+# Stand-in for the image editing page with the attributes the commands change.
+
+class Page:
+    def __init__(self, folder_path):
+        self.file_manager = FileManager()
+        self.result_file_path = str(folder_path / "Results_File.txt")
+        self.click_file_path = str(folder_path / "Clicks_File.csv")
+        self.trial_store = TrialStore()
+        self.center_point = None
+
+
+@pytest.fixture
+def page(tmp_path):
+    return Page(tmp_path)
+
+
+def commit(trial, zaxis, previous_values=None, previous_click=None):
+    return CommitTrialCommand(trial, (zaxis, 0.5, -0.5), (f"image_{trial}.jpg", (1.0, 2.0), (3.0, 4.0)),
+                              previous_values, previous_click)
+
+
+def saved_trials(page):
+    return [row[0] for row in page.file_manager.read_axis_data(page.result_file_path)]
+
+
+def test_commit_writes_files_and_store(page):
+    history = AnnotationHistory()
+    history.execute(commit(1, 2.0), page)
+    assert saved_trials(page) == [1]
+    assert page.file_manager.read_click_data(page.click_file_path)[0]["puck_point"] == (3.0, 4.0)
+    assert page.trial_store.get_values(1) == (2.0, 0.5, -0.5)
+    assert page.trial_store.get_click(1) == ((1.0, 2.0), (3.0, 4.0))
+
+
+def test_undo_commit_removes_new_trial(page):
+    history = AnnotationHistory()
+    history.execute(commit(1, 2.0), page)
+    history.undo(page)
+    assert saved_trials(page) == []
+    assert page.trial_store.get_values(1) is None
+    assert page.trial_store.get_click(1) is None
+    assert not page.trial_store.has_flag(1, FLAG_SAVED)
+
+
+def test_undo_commit_restores_previous_result(page):
+    history = AnnotationHistory()
+    history.execute(commit(1, 2.0), page)
+    history.execute(commit(1, 9.0, (2.0, 0.5, -0.5), ("image_1.jpg", (1.0, 2.0), (3.0, 4.0))), page)
+    assert page.trial_store.get_values(1) == (9.0, 0.5, -0.5)
+    history.undo(page)
+    assert page.file_manager.read_axis_data(page.result_file_path) == [[1, 2.0, 0.5, -0.5]]
+    assert page.trial_store.get_values(1) == (2.0, 0.5, -0.5)
+
+
+def test_commit_of_skipped_trial_unskips_and_undo_skips_again(page):
+    history = AnnotationHistory()
+    history.execute(SkipTrialCommand(3), page)
+    history.execute(commit(3, 2.0), page)
+    assert not page.trial_store.has_flag(3, FLAG_SKIPPED)
+
+    history.undo(page)
+    assert page.trial_store.has_flag(3, FLAG_SKIPPED)
+    assert page.trial_store.get_values(3) is None
+
+    history.redo(page)
+    assert not page.trial_store.has_flag(3, FLAG_SKIPPED)
+    assert page.trial_store.get_values(3) == (2.0, 0.5, -0.5)
+
+    # Undoing the commit and then the skip leaves the trial as it was at the start
+    history.undo(page)
+    history.undo(page)
+    assert not page.trial_store.has_flag(3, FLAG_SKIPPED)
+    assert saved_trials(page) == []
+
+
+def test_undo_commit_of_unskipped_trial_does_not_skip(page):
+    history = AnnotationHistory()
+    history.execute(commit(2, 2.0), page)
+    history.undo(page)
+    assert not page.trial_store.has_flag(2, FLAG_SKIPPED)
+
+
+def test_skip_and_flag_undo(page):
+    history = AnnotationHistory()
+    history.execute(SkipTrialCommand(4), page)
+    history.execute(FlagTrialCommand(4), page)
+    assert page.trial_store.has_flag(4, FLAG_SKIPPED)
+    assert page.trial_store.has_flag(4, FLAG_FLAGGED)
+    history.undo(page)
+    assert not page.trial_store.has_flag(4, FLAG_FLAGGED)
+    history.undo(page)
+    assert not page.trial_store.has_flag(4, FLAG_SKIPPED)
+
+
+def test_set_center_undo(page):
+    history = AnnotationHistory()
+    history.execute(SetCenterCommand(1, (5.0, 6.0), None), page)
+    assert page.center_point == (5.0, 6.0)
+    history.undo(page)
+    assert page.center_point is None
+
+
+def test_new_command_clears_redo(page):
+    history = AnnotationHistory()
+    history.execute(SkipTrialCommand(1), page)
+    history.undo(page)
+    assert len(history.redo_stack) == 1
+    history.execute(SkipTrialCommand(2), page)
+    assert history.redo_stack == []
+    assert history.redo(page) is None
+
+
+def test_history_is_unlimited(page):
+    history = AnnotationHistory()
+    for trial in range(1, 1201):
+        history.execute(SkipTrialCommand(trial), page)
+    while history.undo(page) is not None:
+        pass
+    assert page.trial_store.trials_with(FLAG_SKIPPED).tolist() == []
+
+
+def test_command_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        AnnotationCommand(1)
@@ -0,0 +1,167 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_data_review_page.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the data review page on the offscreen Qt platform. The results file is
+# loaded with read_and_display_data, as the image editing page does when the user goes to the data review.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("PyQt5")
+
+import data_review_page
+from data_review_page import DataReviewPage
+from file_manger_class import FileManager
+
+
+@pytest.fixture
+def results_file(tmp_path):
+    results_folder_path = tmp_path / "P01" / "Results"
+    results_folder_path.mkdir(parents=True)
+    file_path = str(results_folder_path / "Results_File.txt")
+    FileManager().write_axis_data(file_path, [(trial, trial / 10, 0.5, -0.5) for trial in range(1, 11)])
+    return file_path
+
+
+@pytest.fixture
+def page(qapp):
+    page = DataReviewPage()
+    yield page
+    page.export_executor.shutdown(wait=True)
+    page.statistics_executor.shutdown(wait=True)
+
+
+def test_load_sets_results_file(page, results_file):
+    page.read_and_display_data(results_file)
+    assert page.file_path == results_file
+    assert page.data_table.rowCount() == 10
+
+
+def test_export_after_load_from_edit_page(page, results_file, tmp_path, monkeypatch):
+    page.read_and_display_data(results_file)
+    save_path = str(tmp_path / "export.csv")
+    monkeypatch.setattr(data_review_page.QFileDialog, "getSaveFileName",
+                        staticmethod(lambda *args, **kwargs: (save_path, "CSV Files (*.csv)")))
+    page.export_data()
+    assert page.export_future is not None
+    page.export_future.result(timeout=30)
+    page.check_export()
+    assert os.path.exists(save_path)
+    assert page.data_label.text().startswith("Exported 10 rows")
+
+
+def test_landing_map_after_load_from_edit_page(page, results_file):
+    pytest.importorskip("matplotlib")
+    page.show()
+    page.read_and_display_data(results_file)
+    page.show_landing_map()
+    assert page.landing_canvas.isVisible()
+    assert [page.participant_filter.itemText(index) for index in range(page.participant_filter.count())] == [
+        "All participants", "P01"]
+    assert len(page.landing_rows) == 10
+
+
+def test_landing_groups_without_results_file(page):
+    assert page.landing_groups() is None
+    page.show_landing_map()
+    assert page.data_label.text() == "Load a results file to show the landing map."
+
+
+def test_confidence_intervals_after_load_from_edit_page(page, results_file):
+    page.read_and_display_data(results_file)
+    page.show_confidence_intervals()
+    assert page.bootstrap_future is not None
+    results = page.bootstrap_future.result(timeout=120)
+    assert [(result["participant"], result["block"]) for result in results] == [("P01", None), ("P01", 1)]
+    page.bootstrap_timer.stop()  # The dialog of the intervals is not opened in the test
+
+
+def test_confidence_intervals_without_results_file(page):
+    page.show_confidence_intervals()
+    assert page.bootstrap_future is None
+    assert page.data_label.text() == "Load a results file to compute confidence intervals."
+
+
+def test_refresh_plots_reads_appended_rows(page, results_file):
+    page.read_and_display_data(results_file)
+    file_manager = FileManager()
+    file_manager.append_axis_data(results_file, 11, 1.1, 0.5, -0.5)
+    file_manager.append_axis_data(results_file, 12, 1.2, 0.5, -0.5)
+    page.refresh_plots()
+    assert page.data["Image Trial"].tolist() == list(range(1, 13))
+    assert page.data_table.rowCount() == 12
+    assert page.data_table.item(11, 0).text() == "12"
+
+
+# Class: EditPageStub
+# Description:
+# Stand-in for the image editing page that records the trials opened from the data review.
+
+class EditPageStub:
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.shown = []
+
+    def show_trial(self, index, text):
+        self.shown.append(index)
+
+
+# Class: WindowStub
+# Description:
+# Stand-in for the main window with the image editing page and the page stack.
+
+class WindowStub:
+    def __init__(self, folder_path):
+        self.edit_page = EditPageStub(folder_path)
+        self.current = None
+        self.stack = self
+
+    def setCurrentWidget(self, widget):
+        self.current = widget
+
+
+def test_open_trial_after_load_from_edit_page(page, results_file):
+    window = WindowStub(os.path.dirname(os.path.dirname(results_file)))
+    page.parent = window
+    page.read_and_display_data(results_file)
+    page.open_trial(2, 0)
+    assert window.edit_page.shown == [3]
+    assert window.current is window.edit_page
+
+
+def test_open_trial_without_results_file(page, tmp_path):
+    page.parent = WindowStub(str(tmp_path))
+    page.open_trial(0, 0)
+    assert page.parent.edit_page.shown == []
+    assert page.data_label.text() == "Load a results file to open the image of a trial."
+
+
+def test_released_data_is_read_again_when_shown(page, results_file):
+    page.read_and_display_data(results_file)
+    page.data_budget = 0
+    page.show()
+    page.hide()
+    assert page.data_released and page.data is None
+    page.show()
+    assert not page.data_released
+    assert len(page.data) == 10
+
+
+def test_show_without_results_file_after_release(page):
+    page.data_released = True
+    page.show()
+    assert page.data is None
+    assert not page.data_released
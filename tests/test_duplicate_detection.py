@@ -0,0 +1,69 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_duplicate_detection.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the duplicate detector on a session generated by synthetic_images.py,
+# where the camera stays in place and only the puck moves between trials.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import shutil
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PyQt5")
+
+from duplicate_detection_class import DuplicateDetector
+from manifest_class import ManifestManager
+
+
+def trial_names(entries):
+    # The first image is the calibration image
+    return ManifestManager().ordered_file_names(entries)[1:]
+
+
+def test_distinct_trials_are_not_flagged(qapp, synthetic_session, tmp_path):
+    entries = ManifestManager().update_manifest(synthetic_session, str(tmp_path))
+    detector = DuplicateDetector()
+    file_names = trial_names(entries)
+    entries = detector.update_differences(synthetic_session, str(tmp_path), file_names, entries)
+    assert detector.find_consecutive_duplicates(file_names, entries) == []
+    # The puck moves by a few cm between trials, far above the threshold
+    assert min(entries[name]["difference"]["value"] for name in file_names[1:]) > 2 * detector.threshold
+
+
+def test_repeated_image_is_flagged(qapp, synthetic_session, tmp_path):
+    # A double-fired trial: the same image saved twice, the second copy sorting right after the first
+    shutil.copy(os.path.join(synthetic_session, "image_0003.png"), os.path.join(synthetic_session, "image_0003b.png"))
+    entries = ManifestManager().update_manifest(synthetic_session, str(tmp_path))
+    detector = DuplicateDetector()
+    file_names = trial_names(entries)
+    entries = detector.update_differences(synthetic_session, str(tmp_path), file_names, entries)
+    assert [file_names[index] for index in detector.find_consecutive_duplicates(file_names, entries)] == [
+        "image_0003b.png"]
+
+
+def test_differences_are_cached(qapp, synthetic_session, tmp_path, monkeypatch):
+    manifest_manager = ManifestManager()
+    entries = manifest_manager.update_manifest(synthetic_session, str(tmp_path))
+    detector = DuplicateDetector()
+    file_names = trial_names(entries)
+    detector.update_differences(synthetic_session, str(tmp_path), file_names, entries)
+
+    # The saved manifest is used as it is for the same order, and only the pairs that changed are compared
+    entries = manifest_manager.load_manifest(str(tmp_path))
+    loaded = []
+    monkeypatch.setattr(detector, "load_thumbnail", lambda path: loaded.append(os.path.basename(path)))
+    detector.update_differences(synthetic_session, str(tmp_path), file_names, entries)
+    assert loaded == []
+    detector.update_differences(synthetic_session, str(tmp_path), file_names[:2] + file_names[3:], entries)
+    assert sorted(loaded) == [file_names[1], file_names[3]]
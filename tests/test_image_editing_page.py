@@ -0,0 +1,60 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_image_editing_page.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the image editing page on the offscreen Qt platform, with a session
+# generated by synthetic_images.py.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PyQt5")
+
+from trial_store_class import FLAG_SKIPPED
+
+
+def start_session(edit_page, folder_path, center_point=None):
+    calibration_name = sorted(name for name in os.listdir(folder_path) if name.endswith(".png"))[0]
+    calibration_path = os.path.join(folder_path, calibration_name)
+    edit_page.set_data(0.05, folder_path, calibration_path, 0, 3, center_point=center_point)
+
+
+def test_next_image_before_center_is_clicked(edit_page, synthetic_session):
+    start_session(edit_page, synthetic_session)
+    assert edit_page.center_point is None
+    edit_page.go_to_next_image()
+    assert edit_page.image_index == 2
+    assert edit_page.track_clicks == 2  # The center is still asked for
+    assert edit_page.direction_label.text().startswith("Please click on the center")
+
+
+def test_skip_before_center_is_clicked(edit_page, synthetic_session):
+    start_session(edit_page, synthetic_session)
+    edit_page.skip_trial()
+    assert edit_page.image_index == 2
+    assert edit_page.trial_store.has_flag(1, FLAG_SKIPPED)
+    edit_page.undo_action()
+    assert not edit_page.trial_store.has_flag(1, FLAG_SKIPPED)
+
+
+def test_new_session_forgets_the_center(edit_page, synthetic_session):
+    start_session(edit_page, synthetic_session, center_point=(240, 180))
+    assert edit_page.center_point == (240, 180)
+    edit_page.clicked_points = [(240, 180)]
+    start_session(edit_page, synthetic_session)
+    assert edit_page.center_point is None
+    assert edit_page.clicked_points == []
+    assert edit_page.track_clicks == 2
+    assert not edit_page.center_button.isEnabled()
+    assert edit_page.direction_label.text() == "Please click on the center"
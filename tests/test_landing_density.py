@@ -0,0 +1,48 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_landing_density.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the landing map bins: the (participant, block) groups, the counts of
+# every bin and the cache of binned data sources.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from landing_density_class import LandingDensityManager
+
+
+def test_bin_positions_groups_and_counts():
+    manager = LandingDensityManager(bin_size=1.0)
+    participants = np.array([1, 0, 0, 1, 0])
+    blocks = np.array([2, 1, 1, 2, 3])
+    horizontal = np.array([0.2, 0.2, 0.7, 0.4, 1000.0])  # The last position is outside the binned area
+    vertical = np.zeros(5)
+    groups, counts = manager.bin_positions(horizontal, vertical, participants, blocks)
+    assert groups == [(0, 1), (0, 3), (1, 2)]
+    assert counts.shape == (3, manager.bin_count, manager.bin_count)
+    assert counts.sum(axis=(1, 2)).tolist() == [2, 0, 2]
+    row = column = int(np.floor(manager.extent / manager.bin_size))
+    assert counts[0, row, column] == 2
+
+
+def test_get_bins_uses_cache():
+    manager = LandingDensityManager(cache_limit=2)
+    horizontal = vertical = np.zeros(3)
+    participants, blocks = np.zeros(3), np.ones(3)
+    first = manager.get_bins("a", horizontal, vertical, participants, blocks)
+    # A cached source is not binned again, even with other positions
+    assert manager.get_bins("a", horizontal + 5, vertical, participants, blocks) is first
+    manager.get_bins("b", horizontal, vertical, participants, blocks)
+    manager.get_bins("c", horizontal, vertical, participants, blocks)
+    assert list(manager.cache) == ["b", "c"]
@@ -0,0 +1,83 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_registration.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the registration manager on a session generated by synthetic_images.py:
+# shifts asked for before their estimate is finished are waited for, and every image is registered once
+# and never on the calling thread.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import threading
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PyQt5")
+
+from registration_class import RegistrationManager
+
+
+@pytest.fixture
+def manager(qapp):
+    manager = RegistrationManager(max_workers=1)
+    yield manager
+    manager.cancel()
+
+
+# Function: record_registrations
+# Description:
+# Record the image and the thread of every registration of the manager, optionally holding the first one
+# until the gate is opened.
+# Input: manager - RegistrationManager; gate - threading.Event or None
+# Output: list of (image_path, thread) tuples, filled as images are registered
+def record_registrations(manager, gate=None):
+    calls = []
+    register_image = manager._register_image
+
+    def recording_register_image(image_path):
+        calls.append((image_path, threading.current_thread()))
+        if gate is not None and len(calls) == 1:
+            gate.wait(10)
+        return register_image(image_path)
+
+    manager._register_image = recording_register_image
+    return calls
+
+
+def image_paths(folder_path):
+    return [os.path.join(folder_path, name) for name in sorted(os.listdir(folder_path)) if name.endswith(".png")]
+
+
+def test_queued_shift_is_registered_on_a_worker(manager, synthetic_session):
+    paths = image_paths(synthetic_session)
+    calls = record_registrations(manager)
+    manager.start(paths[0], paths[1:])
+    shifts = [manager.get_shift(path) for path in reversed(paths[1:])]  # Jump to the last trial first
+    assert all(abs(shift_x) < 0.05 and abs(shift_y) < 0.05 for shift_x, shift_y in shifts)
+    assert sorted(path for path, _ in calls) == paths[1:]  # Every image is registered once
+    assert threading.main_thread() not in [thread for _, thread in calls]
+
+
+def test_running_shift_is_waited_for(manager, synthetic_session):
+    paths = image_paths(synthetic_session)
+    gate = threading.Event()
+    calls = record_registrations(manager, gate)
+    manager.start(paths[0], paths[1:3])
+    threading.Timer(0.2, gate.set).start()  # The first image is still being registered when its shift is asked for
+    manager.get_shift(paths[1])
+    manager.get_shift(paths[2])
+    assert sorted(path for path, _ in calls) == paths[1:3]
+    assert threading.main_thread() not in [thread for _, thread in calls]
+
+
+def test_shift_without_reference(manager, synthetic_session):
+    assert manager.get_shift(image_paths(synthetic_session)[1]) == (0.0, 0.0)
@@ -0,0 +1,82 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_reliability.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the inter-rater reliability statistics: aligning the results of the
+# raters, the ICC(2,1) against the published example of Shrout and Fleiss (1979) and the Bland-Altman limits.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from reliability_class import ReliabilityManager
+
+# Ratings of 6 targets by 4 judges from Shrout and Fleiss (1979), whose ICC(2,1) is 0.29
+SHROUT_FLEISS_RATINGS = [
+    [9, 2, 5, 8],
+    [6, 1, 3, 2],
+    [8, 4, 6, 8],
+    [7, 1, 2, 6],
+    [10, 5, 6, 9],
+    [6, 2, 4, 7],
+]
+
+
+def test_icc_of_published_example():
+    ratings = np.array(SHROUT_FLEISS_RATINGS, dtype=np.float64).T  # (raters, trials)
+    values = np.stack([ratings, ratings, ratings], axis=2)  # The same ratings on the three axes
+    assert ReliabilityManager().icc(values).tolist() == pytest.approx([0.29, 0.29, 0.29], abs=0.005)
+
+
+def test_icc_of_identical_raters_is_one():
+    trial_values = np.arange(30, dtype=np.float64).reshape(10, 3)
+    values = np.stack([trial_values, trial_values])
+    assert ReliabilityManager().icc(values).tolist() == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_icc_without_variation_is_nan():
+    values = np.ones((2, 5, 3))
+    assert np.isnan(ReliabilityManager().icc(values)).all()
+
+
+def test_align_keeps_common_trials():
+    first = [[1, 1.0, 1.0, 1.0], [2, 2.0, 2.0, 2.0], [3, 3.0, 3.0, 3.0]]
+    second = [[3, 3.5, 3.0, 3.0], [2, 2.5, 2.0, 2.0], [4, 4.0, 4.0, 4.0]]
+    keys, values = ReliabilityManager().align([first, second])
+    assert keys == [2, 3]
+    assert values.shape == (2, 2, 3)
+    assert values[1, :, 0].tolist() == [2.5, 3.5]
+
+
+def test_align_needs_two_raters_and_trials():
+    manager = ReliabilityManager()
+    with pytest.raises(ValueError):
+        manager.align([[[1, 1.0, 1.0, 1.0]]])
+    with pytest.raises(ValueError):
+        manager.align([[[1, 1.0, 1.0, 1.0]], [[1, 1.0, 1.0, 1.0], [2, 2.0, 2.0, 2.0]]])
+
+
+def test_bland_altman_of_constant_offset():
+    first = np.arange(12, dtype=np.float64).reshape(4, 3)
+    bias, lower, upper = ReliabilityManager().bland_altman(first, first - 0.5)
+    assert bias.tolist() == pytest.approx([0.5, 0.5, 0.5])
+    assert lower.tolist() == pytest.approx([0.5, 0.5, 0.5])
+    assert upper.tolist() == pytest.approx([0.5, 0.5, 0.5])
+
+
+def test_compare_ranks_worst_trials():
+    first = [[trial, float(trial), 0.0, 0.0] for trial in range(1, 6)]
+    second = [[trial, float(trial) + (2.0 if trial == 4 else 0.1), 0.0, 0.0] for trial in range(1, 6)]
+    report = ReliabilityManager().compare([first, second], worst_count=2)
+    assert report["worst"][0] == 4
+    assert report["disagreement"][3, 0] == pytest.approx(2.0)
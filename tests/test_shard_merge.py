@@ -0,0 +1,157 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_shard_merge.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of splitting a session into shards and merging the shard results: the
+# shard ranges cover every trial once, and the merge reports gaps, overlaps, conflicts and missing files.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import os
+import pytest
+
+from file_manger_class import FileManager
+from session_state_class import SessionStateManager
+from shard_merge import ShardManager
+
+
+def make_session(folder_path, trial_count):
+    # The first image (in natural order) is the calibration image, the others are trials 1 to trial_count
+    for index in range(trial_count + 1):
+        (folder_path / f"IMG_{index}.jpg").write_bytes(b"image %d" % index)
+    return str(folder_path)
+
+
+def write_shard(folder_path, shard, rows):
+    results_file_path = os.path.join(folder_path, ShardManager.RESULTS_FOLDER_NAME, shard["results_file"])
+    FileManager().write_axis_data(results_file_path, rows)
+
+
+def test_split_covers_every_trial(tmp_path):
+    folder_path = make_session(tmp_path, 10)
+    manager = ShardManager()
+    shards = manager.split(folder_path, 3)
+    assert [(shard["start"], shard["end"]) for shard in shards] == [(1, 3), (4, 6), (7, 10)]
+    assert [shard["name"] for shard in shards] == ["shard_1", "shard_2", "shard_3"]
+    assert manager.load_shards(folder_path) == (10, shards)
+
+
+def test_split_saves_the_calibration_image(tmp_path):
+    folder_path = make_session(tmp_path, 10)
+    manager = ShardManager()
+    manager.split(folder_path, 2)
+    assert manager.load_calibration_image(folder_path) == "IMG_0.jpg"  # Natural order, not IMG_10.jpg
+    manager.split(folder_path, 2, calibration_image="IMG_5.jpg")
+    assert manager.load_calibration_image(folder_path) == "IMG_5.jpg"
+    assert manager.load_calibration_image(str(tmp_path / "unsplit")) is None
+
+
+def test_split_uses_the_calibration_image_of_the_session(tmp_path):
+    folder_path = make_session(tmp_path, 4)
+    manager = ShardManager()
+    results_folder_path = os.path.join(folder_path, ShardManager.RESULTS_FOLDER_NAME)
+    os.makedirs(results_folder_path)
+    SessionStateManager().save_state(results_folder_path, {"calibration_image": "IMG_3.jpg"})
+    manager.split(folder_path, 2)
+    assert manager.load_calibration_image(folder_path) == "IMG_3.jpg"
+
+
+def test_split_checks_the_calibration_image(tmp_path):
+    folder_path = make_session(tmp_path, 4)
+    with pytest.raises(ValueError):
+        ShardManager().split(folder_path, 2, calibration_image="IMG_9.jpg")
+
+
+def test_split_needs_enough_trials(tmp_path):
+    folder_path = make_session(tmp_path, 2)
+    manager = ShardManager()
+    with pytest.raises(ValueError):
+        manager.split(folder_path, 0)
+    with pytest.raises(ValueError):
+        manager.split(folder_path, 3)
+
+
+def test_load_shards_of_unsplit_session(tmp_path):
+    assert ShardManager().load_shards(str(tmp_path)) == (0, [])
+
+
+def test_merge_joins_shards_in_trial_order(tmp_path):
+    folder_path = make_session(tmp_path, 4)
+    manager = ShardManager()
+    first, second = manager.split(folder_path, 2)
+    write_shard(folder_path, second, [(3, 3.0, 0.3, -0.3), (4, 4.0, 0.4, -0.4)])
+    write_shard(folder_path, first, [(1, 1.0, 0.1, -0.1), (2, 2.0, 0.2, -0.2)])
+
+    report = manager.merge(folder_path)
+    assert report["merged"] == 4
+    assert report["gaps"] == report["overlaps"] == report["conflicts"] == report["missing_files"] == []
+    merged = FileManager().read_axis_data(os.path.join(folder_path, "Results", "Results_File.txt"))
+    assert [row[0] for row in merged] == [1, 2, 3, 4]
+    assert merged[2] == [3, 3.0, 0.3, -0.3]
+
+
+def test_merge_reports_gaps_overlaps_and_conflicts(tmp_path):
+    folder_path = make_session(tmp_path, 6)
+    manager = ShardManager()
+    first, second, third = manager.split(folder_path, 3)
+    # Trial 3 was annotated in both the first and the second shard; the second shard owns it
+    write_shard(folder_path, first, [(1, 1.0, 0.0, 0.0), (3, 9.0, 0.0, 0.0)])
+    write_shard(folder_path, second, [(3, 3.0, 0.0, 0.0), (4, 4.0, 0.0, 0.0)])
+
+    report = manager.merge(folder_path)
+    assert report["gaps"] == [2, 5, 6]
+    assert report["missing_files"] == [third["results_file"]]
+    assert report["overlaps"] == [{"trial": 3, "shards": ["shard_1", "shard_2"]}]
+    assert [conflict["trial"] for conflict in report["conflicts"]] == [3]
+    merged = FileManager().read_axis_data(os.path.join(folder_path, "Results", "Results_File.txt"))
+    assert merged == [[1, 1.0, 0.0, 0.0], [3, 3.0, 0.0, 0.0], [4, 4.0, 0.0, 0.0]]
+
+
+def test_merge_within_tolerance_is_not_a_conflict(tmp_path):
+    folder_path = make_session(tmp_path, 4)
+    manager = ShardManager()
+    first, second = manager.split(folder_path, 2)
+    write_shard(folder_path, first, [(1, 1.0, 0.0, 0.0), (2, 2.0, 0.0, 0.0), (3, 3.01, 0.0, 0.0)])
+    write_shard(folder_path, second, [(3, 3.0, 0.0, 0.0), (4, 4.0, 0.0, 0.0)])
+    report = manager.merge(folder_path, tolerance=0.02)
+    assert len(report["overlaps"]) == 1
+    assert report["conflicts"] == []
+
+
+def test_merge_writes_the_clicks_file_once(tmp_path, monkeypatch):
+    folder_path = make_session(tmp_path, 4)
+    manager = ShardManager()
+    first, second = manager.split(folder_path, 2)
+    results_folder_path = os.path.join(folder_path, ShardManager.RESULTS_FOLDER_NAME)
+    file_manager = FileManager()
+    write_shard(folder_path, first, [(1, 1.0, 0.0, 0.0), (2, 2.0, 0.0, 0.0)])
+    write_shard(folder_path, second, [(3, 3.0, 0.0, 0.0), (4, 4.0, 0.0, 0.0)])
+    file_manager.write_click_data(os.path.join(results_folder_path, second["clicks_file"]),
+                                  [(3, "IMG_3.jpg", (1, 1), (3, 3)), (4, "IMG_4.jpg", (1, 1), (4, 4))])
+    file_manager.write_click_data(os.path.join(results_folder_path, first["clicks_file"]),
+                                  [(1, "IMG_1.jpg", None, (1, 1)), (2, "IMG_2.jpg", (1, 1), (2, 2))])
+
+    writes = []
+    write_click_data = manager.file_manager.write_click_data
+    monkeypatch.setattr(manager.file_manager, "write_click_data",
+                        lambda file_path, rows: writes.append(file_path) or write_click_data(file_path, rows))
+    manager.merge(folder_path)
+    clicks_file_path = os.path.join(results_folder_path, "Clicks_File.csv")
+    assert writes == [clicks_file_path]
+    clicks = file_manager.read_click_data(clicks_file_path)
+    assert [click["trial"] for click in clicks] == [1, 2, 3, 4]
+    assert clicks[0]["center_point"] is None
+    assert clicks[3]["puck_point"] == (4.0, 4.0)
+
+
+def test_merge_without_shards(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ShardManager().merge(str(tmp_path))
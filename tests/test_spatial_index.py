@@ -0,0 +1,79 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_spatial_index.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the grid index of the landing map, checked against a brute force search
+# over every point.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spatial_index_class import SpatialIndex
+
+
+@pytest.fixture
+def points():
+    generator = np.random.default_rng(0)
+    return generator.normal(0.0, 5.0, 2000), generator.normal(0.0, 5.0, 2000)
+
+
+def test_nearest_matches_brute_force(points):
+    x, y = points
+    index = SpatialIndex(x, y)
+    for click_x, click_y in [(0.0, 0.0), (3.3, -2.1), (-9.0, 7.5), (12.0, 12.0)]:
+        distances = np.hypot(x - click_x, y - click_y)
+        expected = int(np.argmin(distances)) if distances.min() <= 1.0 else None
+        assert index.nearest(click_x, click_y, 1.0) == expected
+
+
+def test_nearest_outside_radius():
+    index = SpatialIndex([0.0, 10.0], [0.0, 10.0])
+    assert index.nearest(5.0, 5.0, 1.0) is None
+    assert index.nearest(9.5, 9.5, 1.0) == 1
+
+
+def test_query_box_is_superset(points):
+    x, y = points
+    found = set(SpatialIndex(x, y).query_box(-2.0, -1.0, 3.0, 4.0).tolist())
+    inside = np.flatnonzero((x >= -2.0) & (x <= 3.0) & (y >= -1.0) & (y <= 4.0))
+    assert set(inside.tolist()) <= found
+
+
+def test_query_polygon_matches_brute_force(points):
+    x, y = points
+    triangle = [(-6.0, -4.0), (7.0, -3.0), (0.5, 8.0)]
+    (x1, y1), (x2, y2), (x3, y3) = triangle
+    # Same side of every edge as the opposite vertex
+    def side(ax, ay, bx, by, px, py):
+        return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+    inside = ((side(x1, y1, x2, y2, x, y) > 0) & (side(x2, y2, x3, y3, x, y) > 0)
+              & (side(x3, y3, x1, y1, x, y) > 0))
+    assert SpatialIndex(x, y).query_polygon(triangle).tolist() == np.flatnonzero(inside).tolist()
+
+
+def test_query_polygon_needs_three_vertices(points):
+    x, y = points
+    assert len(SpatialIndex(x, y).query_polygon([(0.0, 0.0), (1.0, 1.0)])) == 0
+
+
+def test_empty_index():
+    index = SpatialIndex([], [])
+    assert index.nearest(0.0, 0.0, 10.0) is None
+    assert len(index.query_polygon([(-1.0, -1.0), (1.0, -1.0), (0.0, 1.0)])) == 0
+
+
+def test_coincident_points():
+    index = SpatialIndex([1.0, 1.0, 1.0], [2.0, 2.0, 2.0])
+    assert index.nearest(1.0, 2.0, 0.1) in (0, 1, 2)
+    assert index.query_polygon([(0.0, 0.0), (2.0, 0.0), (2.0, 3.0), (0.0, 3.0)]).tolist() == [0, 1, 2]
@@ -0,0 +1,32 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_startup_budget.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the test of the startup budget of benchmarks/startup_budget.py: the main menu is shown
+# within the budget and the heavy libraries of the other pages are not imported at startup.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import statistics
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from benchmarks.startup_budget import DEFAULT_BUDGET, measure_startup
+
+
+def test_startup_within_budget(tmp_path, monkeypatch):
+    # The settings and profiles of the started application are kept in the temporary folder
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    results = [measure_startup() for _ in range(3)]
+    assert [result["imported"] for result in results] == [[], [], []]
+    assert statistics.median(result["seconds"] for result in results) <= DEFAULT_BUDGET
@@ -0,0 +1,93 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_statistics.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the error measures and the bootstrap confidence intervals: the groups
+# of participants and blocks, the estimates and the repeatability of the random streams.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from statistics_class import BOOTSTRAP_MEASURES, StatisticsManager, error_measures
+
+
+def trials(count, seed=0):
+    generator = np.random.default_rng(seed)
+    horizontal = generator.normal(0.0, 2.0, count)
+    vertical = generator.normal(1.0, 3.0, count)
+    return np.hypot(horizontal, vertical), horizontal, vertical
+
+
+def test_error_measures():
+    radial = np.array([[1.0, 3.0]])
+    horizontal = np.array([[-1.0, 1.0]])
+    vertical = np.array([[2.0, 2.0]])
+    measures = error_measures(radial, horizontal, vertical)[0]
+    assert measures.tolist() == pytest.approx([2.0, 1.0, 0.0, 1.0])
+
+
+def test_bootstrap_groups():
+    radial, horizontal, vertical = trials(60)
+    participants = np.repeat([1, 0], 30)  # Codes are not in name order
+    blocks = np.tile(np.repeat([1, 2, 3], 10), 2)
+    results = StatisticsManager().bootstrap(radial, horizontal, vertical, participants, blocks, ["Bea", "Al"],
+                                            replicates=200, workers=1)
+
+    assert [(result["participant"], result["block"]) for result in results] == [
+        ("Al", None), ("Al", 1), ("Al", 2), ("Al", 3), ("Bea", None), ("Bea", 1), ("Bea", 2), ("Bea", 3)]
+    assert [result["trials"] for result in results] == [30, 10, 10, 10, 30, 10, 10, 10]
+
+    # The estimates are the measures of the trials of the group, inside their interval
+    group = (participants == 1) & (blocks == 2)
+    expected = error_measures(radial[None, group], horizontal[None, group], vertical[None, group])[0]
+    for index, name in enumerate(BOOTSTRAP_MEASURES):
+        estimate, lower, upper = results[2]["measures"][name]
+        assert estimate == pytest.approx(expected[index])
+        assert lower <= estimate <= upper
+
+
+def test_bootstrap_is_repeatable():
+    radial, horizontal, vertical = trials(40, seed=1)
+    participants = np.zeros(40, dtype=np.int32)
+    blocks = np.repeat([1, 2], 20)
+    manager = StatisticsManager()
+    first = manager.bootstrap(radial, horizontal, vertical, participants, blocks, ["P"], replicates=100, workers=1)
+    second = manager.bootstrap(radial, horizontal, vertical, participants, blocks, ["P"], replicates=100, workers=1)
+    other_seed = manager.bootstrap(radial, horizontal, vertical, participants, blocks, ["P"], replicates=100,
+                                   seed=1, workers=1)
+    assert first == second
+    assert first != other_seed
+
+
+def test_bootstrap_of_constant_trials():
+    values = np.full(10, 2.0)
+    results = StatisticsManager().bootstrap(values, values, values, np.zeros(10), np.ones(10), ["P"],
+                                            replicates=50, workers=1)
+    estimate, lower, upper = results[0]["measures"]["Mean Radial Error"]
+    assert estimate == lower == upper == pytest.approx(2.0)
+    assert results[0]["measures"]["BVE"][0] == pytest.approx(0.0)
+
+
+def test_bootstrap_without_trials():
+    empty = np.empty(0)
+    assert StatisticsManager().bootstrap(empty, empty, empty, empty, empty, [], replicates=10) == []
+
+
+def test_format_bootstrap_lists_every_group():
+    radial, horizontal, vertical = trials(20)
+    manager = StatisticsManager()
+    results = manager.bootstrap(radial, horizontal, vertical, np.zeros(20), np.repeat([1, 2], 10), ["P01"],
+                                replicates=50, workers=1)
+    text = manager.format_bootstrap(results)
+    assert text.count("P01") == 3
@@ -0,0 +1,115 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: test_trial_store.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the tests of the trial store: the records stay sorted by trial however they are
+# added, a repeated trial keeps its last values, and the flags and clicked points of a trial are kept
+# with it when the records are reordered or the array grows.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from trial_store_class import TrialStore, FLAG_SAVED, FLAG_SKIPPED, FLAG_FLAGGED
+
+
+def test_load_results_sorts_trials():
+    store = TrialStore()
+    store.load_results([[3, 3.0, 0.3, -0.3], [1, 1.0, 0.1, -0.1], [2, 2.0, 0.2, -0.2]])
+    assert store.records["trial"].tolist() == [1, 2, 3]
+    assert store.get_values(1) == (1.0, 0.1, -0.1)
+    assert store.get_values(3) == (3.0, 0.3, -0.3)
+
+
+def test_repeated_trial_keeps_last_row():
+    store = TrialStore()
+    store.load_results([[1, 1.0, 0.0, 0.0], [2, 2.0, 0.0, 0.0], [1, 5.0, 0.5, 0.5]])
+    assert len(store) == 2
+    assert store.get_values(1) == (5.0, 0.5, 0.5)
+
+    # Loading the trial again replaces it instead of adding a record
+    store.load_results([[1, 7.0, 0.7, 0.7]])
+    assert len(store) == 2
+    assert store.get_values(1) == (7.0, 0.7, 0.7)
+
+
+def test_insert_before_last_trial_keeps_records_aligned():
+    store = TrialStore()
+    store.set_values(5, (5.0, 0.5, 0.5))
+    store.set_flag(5, FLAG_FLAGGED)
+    store.set_click(5, (10.0, 20.0), (30.0, 40.0))
+    store.set_values(2, (2.0, 0.2, 0.2))
+    assert store.records["trial"].tolist() == [2, 5]
+    assert store.get_values(5) == (5.0, 0.5, 0.5)
+    assert store.has_flag(5, FLAG_FLAGGED)
+    assert not store.has_flag(2, FLAG_FLAGGED)
+    assert store.get_click(5) == ((10.0, 20.0), (30.0, 40.0))
+    assert store.get_click(2) is None
+
+
+def test_growth_keeps_order():
+    store = TrialStore(capacity=2)
+    for trial in range(100, 0, -1):
+        store.set_values(trial, (float(trial), 0.0, 0.0))
+    assert len(store) == 100
+    assert store.records["trial"].tolist() == list(range(1, 101))
+    assert store.get_values(42) == (42.0, 0.0, 0.0)
+
+
+def test_remove_values_clears_saved_flag():
+    store = TrialStore()
+    store.load_results([[1, 1.0, 0.0, 0.0], [2, 2.0, 0.0, 0.0]])
+    store.set_values(1, None)
+    assert store.get_values(1) is None
+    assert store.trials_with(FLAG_SAVED).tolist() == [2]
+    assert len(store) == 2
+
+
+def test_flags_are_independent():
+    store = TrialStore()
+    store.set_flag([1, 2, 3], FLAG_SKIPPED)
+    store.set_flag(2, FLAG_FLAGGED)
+    store.set_flag(2, FLAG_SKIPPED, False)
+    assert store.trials_with(FLAG_SKIPPED).tolist() == [1, 3]
+    assert store.trials_with(FLAG_FLAGGED).tolist() == [2]
+    assert not store.has_flag(4, FLAG_SKIPPED)
+    # Flagging does not make a trial count as saved
+    assert store.trials_with(FLAG_SAVED).tolist() == []
+
+
+def test_click_without_center_point():
+    store = TrialStore()
+    store.set_click(1, None, (3.0, 4.0))
+    assert store.get_click(1) == (None, (3.0, 4.0))
+    store.set_click(1, None, None)
+    assert store.get_click(1) is None
+
+
+def test_clear_removes_trials():
+    store = TrialStore(capacity=4)
+    store.load_results([[trial, 0.0, 0.0, 0.0] for trial in range(1, 20)])
+    store.clear()
+    assert len(store) == 0
+    assert len(store.array) == 4
+    assert store.get_values(1) is None
+
+
+def test_to_dataframe_has_saved_trials_only():
+    pytest.importorskip("pandas")
+    store = TrialStore()
+    store.load_results([[2, 2.0, 0.2, -0.2], [1, 1.0, 0.1, -0.1]])
+    store.set_flag(3, FLAG_SKIPPED)
+    data = store.to_dataframe()
+    assert list(data.columns) == ["Image Trial", "Z-Axis", "Y-Axis", "X-Axis"]
+    assert data["Image Trial"].tolist() == [1, 2]
+    assert data["Z-Axis"].tolist() == [1.0, 2.0]
@@ -0,0 +1,264 @@
+############################################################################################
+# Project Name: Motor Skill Acquisition Error Management System (San Francisco State University Project 2024)
+#
+# Filename: trial_store_class.py
+#
+# Authors: Milton Tinoco, Ethan Weldon, Joshua Samson, Michael Cabrera
+#
+# Last Update: 12/08/2024
+#
+# File Description:
+# This file contains the code for the trial store, the in-memory table of the trials of a session shared by
+# the image editing page and the data review page. Every trial is one record of a NumPy structured array
+# (trial index, clicked center and puck points, axis values and flags), about 65 bytes per trial, so a
+# million trials take about 65 MB. The records are kept sorted by trial index, and the array grows by
+# doubling its capacity, so appending trials one at a time or in large batches costs amortized constant
+# time per trial. The columns convert to a pandas DataFrame without copying them.
+#
+############################################################################################
+
+# Import necessary libraries
+
+import numpy as np
+
+# Record of one trial. Missing values (no result or no clicked center point) are NaN.
+TRIAL_DTYPE = np.dtype([
+    ("trial", np.int64),      # Index of the image trial
+    ("center_x", np.float64),  # Clicked center point on the image
+    ("center_y", np.float64),
+    ("puck_x", np.float64),    # Clicked puck point on the image
+    ("puck_y", np.float64),
+    ("zaxis", np.float64),     # Axis values of the trial
+    ("yaxis", np.float64),
+    ("xaxis", np.float64),
+    ("flags", np.uint8),       # FLAG_* bits of the trial
+])
+FLOAT_FIELDS = [name for name in TRIAL_DTYPE.names if TRIAL_DTYPE[name].kind == "f"]
+
+FLAG_SAVED = 1    # The trial has a result
+FLAG_SKIPPED = 2  # The user skipped the trial
+FLAG_FLAGGED = 4  # The user flagged the trial for later review
+
+# Column names of the fields in the DataFrame, matching the columns of the data review page
+COLUMN_NAMES = {"trial": "Image Trial", "zaxis": "Z-Axis", "yaxis": "Y-Axis", "xaxis": "X-Axis"}
+RESULT_FIELDS = ["trial", "zaxis", "yaxis", "xaxis"]  # Fields of a results file row
+
+# Class: TrialStore
+# Description:
+# This class provides methods to add, update and look up trials by index and to get their columns.
+
+class TrialStore:
+    def __init__(self, capacity=1024):
+        self.initial_capacity = capacity  # Capacity the store starts with and goes back to when cleared
+        self.array = np.empty(capacity, dtype=TRIAL_DTYPE)  # Records; only the first size records are used
+        self.size = 0  # Number of trials in the store
+
+    def __len__(self):
+        return self.size
+
+    # Method: records
+    # Description:
+    # Get the records of all trials, sorted by trial index. The result is a view: it changes with the store
+    # until the store grows, so it should not be kept across updates.
+    # Input: None
+    # Output: structured array of the records
+    @property
+    def records(self):
+        return self.array[:self.size]
+
+    # Method: clear
+    # Description:
+    # Remove all trials and release the memory of the records.
+    # Input: None
+    # Output: None
+    def clear(self):
+        self.array = np.empty(self.initial_capacity, dtype=TRIAL_DTYPE)
+        self.size = 0
+
+    # Method: reserve
+    # Description:
+    # Make room for at least capacity records, at least doubling the capacity so growth is amortized.
+    # Input: capacity - number of records needed
+    # Output: None
+    def reserve(self, capacity):
+        if capacity <= len(self.array):
+            return
+        array = np.empty(max(capacity, 2 * len(self.array)), dtype=TRIAL_DTYPE)
+        array[:self.size] = self.array[:self.size]
+        self.array = array
+
+    # Method: find
+    # Description:
+    # Find the records of trials.
+    # Input: trials - array of trial indexes
+    # Output: (rows, found) - position of every trial in the records and whether the trial is in the store
+    def find(self, trials):
+        trials = np.asarray(trials, dtype=np.int64)
+        stored = self.array["trial"][:self.size]
+        rows = np.searchsorted(stored, trials)
+        found = np.zeros(len(trials), dtype=bool)
+        if self.size:
+            found = stored[np.minimum(rows, self.size - 1)] == trials
+        return rows, found
+
+    # Method: rows_for
+    # Description:
+    # Find the records of trials, adding empty records for the trials not in the store yet.
+    # New trials after the last stored trial are appended in place; others are merged in trial order.
+    # Input: trials - array of trial indexes
+    # Output: position of every trial in the records
+    def rows_for(self, trials):
+        trials = np.asarray(trials, dtype=np.int64)
+        rows, found = self.find(trials)
+        if found.all():
+            return rows
+        new_trials = np.unique(trials[~found])
+        start, stop = self.size, self.size + len(new_trials)
+        self.reserve(stop)
+        self.array["trial"][start:stop] = new_trials
+        for name in FLOAT_FIELDS:
+            self.array[name][start:stop] = np.nan
+        self.array["flags"][start:stop] = 0
+        if start and new_trials[0] < self.array["trial"][start - 1]:
+            order = np.argsort(self.array["trial"][:stop], kind="stable")
+            self.array[:stop] = self.array[:stop][order]
+        self.size = stop
+        return np.searchsorted(self.array["trial"][:self.size], trials)
+
+    # Method: load_results
+    # Description:
+    # Add or replace the results of many trials at once (e.g. the rows of a results file).
+    # When a trial appears more than once, the last row is kept.
+    # Input: rows - list of [image_index, zaxis, yaxis, xaxis] rows
+    # Output: None
+    def load_results(self, rows):
+        if len(rows) == 0:
+            return
+        values = np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+        positions = self.rows_for(values[:, 0])
+        # Assigning in file order leaves the last row of a repeated trial
+        for column, name in enumerate(RESULT_FIELDS[1:], start=1):
+            self.array[name][positions] = values[:, column]
+        self.array["flags"][positions] |= FLAG_SAVED
+
+    # Method: load_clicks
+    # Description:
+    # Add or replace the clicked points of many trials at once (e.g. the rows of a clicks file).
+    # Input: clicks - list of dictionaries with trial, center_point and puck_point
+    # Output: None
+    def load_clicks(self, clicks):
+        if not clicks:
+            return
+        positions = self.rows_for([click["trial"] for click in clicks])
+        points = np.array([(click["center_point"] or (np.nan, np.nan)) + tuple(click["puck_point"])
+                           for click in clicks], dtype=np.float64)
+        for column, name in enumerate(["center_x", "center_y", "puck_x", "puck_y"]):
+            self.array[name][positions] = points[:, column]
+
+    # Method: set_values
+    # Description:
+    # Save or remove the axis values of a trial.
+    # Input: trial - index of the trial
+    #        values - (zaxis, yaxis, xaxis), or None to remove the result
+    # Output: None
+    def set_values(self, trial, values):
+        row = self.rows_for([trial])[0]
+        record = self.array[row:row + 1]
+        if values is None:
+            record["zaxis"] = record["yaxis"] = record["xaxis"] = np.nan
+            record["flags"] &= ~np.uint8(FLAG_SAVED)
+        else:
+            record["zaxis"], record["yaxis"], record["xaxis"] = values
+            record["flags"] |= FLAG_SAVED
+
+    # Method: set_click
+    # Description:
+    # Save or remove the clicked points of a trial.
+    # Input: trial - index of the trial
+    #        center_point - (x, y) of the center point, or None
+    #        puck_point - (x, y) of the puck, or None
+    # Output: None
+    def set_click(self, trial, center_point, puck_point):
+        row = self.rows_for([trial])[0]
+        record = self.array[row:row + 1]
+        record["center_x"], record["center_y"] = center_point if center_point is not None else (np.nan, np.nan)
+        record["puck_x"], record["puck_y"] = puck_point if puck_point is not None else (np.nan, np.nan)
+
+    # Method: get_values
+    # Description:
+    # Get the axis values of a trial.
+    # Input: trial - index of the trial
+    # Output: (zaxis, yaxis, xaxis), or None if the trial has no result
+    def get_values(self, trial):
+        rows, found = self.find([trial])
+        if not found[0]:
+            return None
+        record = self.array[rows[0]]
+        if not record["flags"] & FLAG_SAVED:
+            return None
+        return float(record["zaxis"]), float(record["yaxis"]), float(record["xaxis"])
+
+    # Method: get_click
+    # Description:
+    # Get the clicked points of a trial.
+    # Input: trial - index of the trial
+    # Output: (center_point, puck_point), where center_point may be None, or None if no points were saved
+    def get_click(self, trial):
+        rows, found = self.find([trial])
+        if not found[0]:
+            return None
+        record = self.array[rows[0]]
+        if np.isnan(record["puck_x"]):
+            return None
+        center_point = None
+        if not np.isnan(record["center_x"]):
+            center_point = (float(record["center_x"]), float(record["center_y"]))
+        return center_point, (float(record["puck_x"]), float(record["puck_y"]))
+
+    # Method: set_flag
+    # Description:
+    # Set or clear a flag of trials.
+    # Input: trials - trial index or list of trial indexes
+    #        flag - FLAG_SKIPPED or FLAG_FLAGGED
+    #        value - True to set the flag, False to clear it (default: True)
+    # Output: None
+    def set_flag(self, trials, flag, value=True):
+        positions = self.rows_for(np.atleast_1d(trials))
+        if value:
+            self.array["flags"][positions] |= flag
+        else:
+            self.array["flags"][positions] &= ~np.uint8(flag)
+
+    # Method: has_flag
+    # Description:
+    # Check a flag of a trial.
+    # Input: trial - index of the trial
+    #        flag - FLAG_SAVED, FLAG_SKIPPED or FLAG_FLAGGED
+    # Output: True if the trial has the flag
+    def has_flag(self, trial, flag):
+        rows, found = self.find([trial])
+        return bool(found[0] and self.array["flags"][rows[0]] & flag)
+
+    # Method: trials_with
+    # Description:
+    # Get the trials that have a flag.
+    # Input: flag - FLAG_SAVED, FLAG_SKIPPED or FLAG_FLAGGED
+    # Output: array of trial indexes in increasing order
+    def trials_with(self, flag):
+        records = self.records
+        return records["trial"][(records["flags"] & flag) != 0]
+
+    # Method: to_dataframe
+    # Description:
+    # Get fields of the trials with a result as a pandas DataFrame. When every trial has a result the
+    # columns are views of the records (no copy); the DataFrame then changes with the store until it grows.
+    # Input: fields - fields to include (default: trial and axis values, named like the data review table)
+    # Output: DataFrame with one row per trial with a result
+    def to_dataframe(self, fields=RESULT_FIELDS):
+        import pandas as pd
+
+        records = self.records
+        saved = (records["flags"] & FLAG_SAVED) != 0
+        if not saved.all():
+            records = records[saved]
+        return pd.DataFrame({COLUMN_NAMES.get(name, name): records[name] for name in fields}, copy=False)